@@ -14,16 +14,40 @@ __author__ = 'Arkaprabha Bera, Rupam Nandi, Soham Dutta, Akanksh Kumar Shaw'
 
 # Import main components to make them available at package level
 from .models import Teacher, Student, Course, Room, TimeSlot, StudentGroup
+from .models import (CompactTeacher, CompactStudent, CompactCourse, CompactRoom, CompactTimeSlot,
+                     CompactStudentGroup, StudentTable, RegistrationTable)
 from .genetic_algorithms import GeneticAlgorithm
 from .simulated_annealing import SimulatedAnnealing
 from .constraint_programming import ConstraintProgramming
 from .hybrid_algorithm import HybridAlgorithm
+from .problem_model import ProblemModel
+from .time_slot_index import TimeSlotIndex
+from .teacher_availability import TeacherAvailability
+from .course_domains import CourseDomains
+from .conflict_graph import CourseConflictGraph
+from .occupancy import Occupancy
+from .incremental_cost import IncrementalCost
+from .fitness import FitnessEvaluator
+from .fitness_cache import FitnessCache
+from .parallel_evaluation import ParallelEvaluator
+from .shared_buffers import SharedPopulationBuffer
+from .island_model import IslandModel
+from .repair import RepairOperator
+from .construction import ConstructiveInitializer
+from .diversity import GenomeHasher
+from .termination import TerminationCriteria
 #from .utils import load_json_data, save_timetable, visualize_timetable
 
 
 __all__ = [
     'Teacher', 'Student', 'Course', 'Room', 'TimeSlot', 'StudentGroup',
+    'CompactTeacher', 'CompactStudent', 'CompactCourse', 'CompactRoom', 'CompactTimeSlot',
+    'CompactStudentGroup', 'StudentTable', 'RegistrationTable',
     'GeneticAlgorithm', 'SimulatedAnnealing', 'ConstraintProgramming', 'HybridAlgorithm',
+    'ProblemModel', 'TimeSlotIndex', 'TeacherAvailability', 'CourseDomains',
+    'CourseConflictGraph', 'Occupancy', 'IncrementalCost', 'FitnessEvaluator', 'FitnessCache',
+    'ParallelEvaluator', 'SharedPopulationBuffer', 'IslandModel', 'RepairOperator',
+    'ConstructiveInitializer', 'GenomeHasher', 'TerminationCriteria',
     'load_json_data', 'save_timetable', 'visualize_timetable',
 ]
 
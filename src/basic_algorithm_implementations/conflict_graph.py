@@ -0,0 +1,131 @@
+"""
+Sparse course-course conflict graph.
+
+Two courses conflict when they share a student group or at least one student,
+counting both group membership and individual registrations. Edges are stored
+in CSR form, weighted by the number of shared students, so the GA fitness, the
+SA cost, CP propagation and the reports can query a course's conflicts in
+O(degree) and count clashes of a whole timetable in O(edges).
+"""
+
+from typing import Dict, Any, Tuple
+import numpy as np
+from .models import StudentTable
+
+
+class CourseConflictGraph:
+    """
+    Attributes:
+        indptr, neighbors, weights: symmetric CSR adjacency (weights = shared students)
+        edges: (E, 2) array of conflicting course pairs with u < v
+        edge_weights: shared students per edge
+        degree: number of conflicting courses per course
+    """
+
+    def __init__(self, model, students: Dict[str, Any]):
+        n_courses = model.n_courses
+        n_students = model.n_students
+
+        # Student x course incidence from group membership ...
+        counts = np.diff(model.course_students_indptr)
+        inc_course = [np.repeat(np.arange(n_courses, dtype=np.int64), counts)]
+        inc_student = [model.course_students.astype(np.int64)]
+
+        # ... and from individual registrations (courses missing from the input are ignored)
+        if isinstance(students, StudentTable):
+            reg = students.registrations
+            known = np.array([model.course_index.get(c, -1) for c in reg.course_ids], dtype=np.int64)
+            reg_course = known[reg.course] if len(reg.course) else np.zeros(0, dtype=np.int64)
+            reg_student = np.array([model.student_index[s] for s in students.ids], dtype=np.int64)[reg.student]
+            keep = reg_course >= 0
+            inc_course.append(reg_course[keep])
+            inc_student.append(reg_student[keep])
+        else:
+            reg_course, reg_student = [], []
+            for student_id, student in students.items():
+                for course_id in student.registered_courses:
+                    if course_id in model.course_index:
+                        reg_course.append(model.course_index[course_id])
+                        reg_student.append(model.student_index[student_id])
+            inc_course.append(np.array(reg_course, dtype=np.int64))
+            inc_student.append(np.array(reg_student, dtype=np.int64))
+
+        inc = np.unique(np.concatenate(inc_student) * max(n_courses, 1) + np.concatenate(inc_course))
+        inc_student_all = inc // max(n_courses, 1)
+        inc_course_all = inc % max(n_courses, 1)
+
+        # Course pairs per student, accumulated as u * n_courses + v keys (u < v)
+        pair_keys = [self._pair_keys(inc_student_all, inc_course_all, n_courses)]
+
+        # Courses sharing a group conflict even if the group lists no students
+        group_course = np.repeat(np.arange(model.n_groups, dtype=np.int64), np.diff(model.group_courses_indptr))
+        course_group = np.repeat(np.arange(n_courses, dtype=np.int64), np.diff(model.course_groups_indptr))
+        membership = np.unique(np.concatenate([
+            model.group_courses.astype(np.int64) * max(model.n_groups, 1) + group_course,
+            course_group * max(model.n_groups, 1) + model.course_groups
+        ]))
+        group_keys = self._pair_keys(membership % max(model.n_groups, 1), membership // max(model.n_groups, 1), n_courses)
+
+        shared_keys, shared_counts = np.unique(np.concatenate(pair_keys), return_counts=True)
+        all_keys = np.union1d(shared_keys, group_keys)
+        weights = np.zeros(len(all_keys), dtype=np.int64)
+        weights[np.searchsorted(all_keys, shared_keys)] = shared_counts
+
+        self.n_courses = n_courses
+        self.edges = np.stack([all_keys // max(n_courses, 1), all_keys % max(n_courses, 1)], axis=1).astype(np.int32)
+        self.edge_weights = weights.astype(np.int32)
+
+        # Symmetric CSR adjacency
+        src = np.concatenate([self.edges[:, 0], self.edges[:, 1]])
+        dst = np.concatenate([self.edges[:, 1], self.edges[:, 0]])
+        w = np.concatenate([self.edge_weights, self.edge_weights])
+        order = np.lexsort((dst, src))
+        self.neighbors = dst[order].astype(np.int32)
+        self.weights = w[order].astype(np.int32)
+        self.degree = np.bincount(src, minlength=n_courses).astype(np.int32)
+        self.indptr = np.zeros(n_courses + 1, dtype=np.int64)
+        np.cumsum(self.degree, out=self.indptr[1:])
+
+    @staticmethod
+    def _pair_keys(owner: np.ndarray, course: np.ndarray, n_courses: int) -> np.ndarray:
+        """All u * n_courses + v keys (u < v) for courses sharing an owner (student or group)."""
+        if len(owner) == 0:
+            return np.zeros(0, dtype=np.int64)
+        order = np.lexsort((course, owner))
+        owner, course = owner[order], course[order]
+        starts = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+        sizes = np.diff(np.r_[starts, len(owner)])
+        keys = []
+        for size in np.unique(sizes[sizes > 1]):
+            # Every owner with `size` courses contributes the same triangle of position pairs
+            block_starts = starts[sizes == size]
+            i, j = np.triu_indices(size, k=1)
+            u = course[block_starts[:, None] + i[None, :]]
+            v = course[block_starts[:, None] + j[None, :]]
+            keys.append((u * n_courses + v).ravel())
+        return np.concatenate(keys) if keys else np.zeros(0, dtype=np.int64)
+
+    def neighbors_of(self, course_idx: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Conflicting courses of a course and the number of students each shares with it."""
+        start, end = self.indptr[course_idx], self.indptr[course_idx + 1]
+        return self.neighbors[start:end], self.weights[start:end]
+
+    def clashing_edges(self, course_slots: np.ndarray, overlaps: np.ndarray) -> np.ndarray:
+        """
+        Boolean mask over `edges` of conflicting pairs scheduled in overlapping slots.
+        `course_slots` holds each course's slot index, or a negative value when unassigned.
+        """
+        u_slots = course_slots[self.edges[:, 0]]
+        v_slots = course_slots[self.edges[:, 1]]
+        assigned = (u_slots >= 0) & (v_slots >= 0)
+        return assigned & overlaps[u_slots, v_slots]
+
+    def count_clashes(self, course_slots: np.ndarray, overlaps: np.ndarray) -> int:
+        """Number of conflicting course pairs scheduled in overlapping slots."""
+        return int(self.clashing_edges(course_slots, overlaps).sum())
+
+    def clashes_of(self, course_idx: int, slot_idx: int, course_slots: np.ndarray, overlaps: np.ndarray) -> int:
+        """Conflicting neighbours of a course that would clash with it in `slot_idx` (O(degree))."""
+        neighbors, _ = self.neighbors_of(course_idx)
+        slots = course_slots[neighbors]
+        return int((overlaps[slot_idx, slots] & (slots >= 0)).sum())
@@ -6,9 +6,12 @@ Based on Section 6 of the research paper.
 from typing import Dict, Any, List, Tuple
 from tqdm import tqdm
 import random
+from .problem_model import ProblemModel
+from .occupancy import Occupancy
 
 class ConstraintProgramming:
-    def __init__(self, data: Dict[str, Any], params: Dict[str, Any] = None):
+    def __init__(self, data: Dict[str, Any], params: Dict[str, Any] = None,
+                 model: ProblemModel = None):
         self.data = data
         self.params = params or {
             'max_iterations': 1000,
@@ -24,82 +27,53 @@ class ConstraintProgramming:
         self.hard_constraints = data['hard_constraints']
         self.soft_constraints = data['soft_constraints']
         
+        # Integer-indexed view of the data, shared with other solvers when provided
+        self.model = model or ProblemModel(data)
+        
         # Initialize solution
         self.current_solution = {}
     
-    def _check_constraints(self, solution: Dict[str, Any], course_id: str,
-                           teacher_id: str, room_id: str, time_slot_id: str) -> bool:
-        """
-        Check if assigning a course to a teacher, room, and time slot violates any hard constraints.
-        """
-        # Check teacher availability for this time slot
-        for existing_course_id, assignment in solution.items():
-            if assignment['teacher_id'] == teacher_id and assignment['time_slot_id'] == time_slot_id:
-                return False  # Teacher already assigned at this time slot
-        
-        # Check room availability for this time slot
-        for existing_course_id, assignment in solution.items():
-            if assignment['room_id'] == room_id and assignment['time_slot_id'] == time_slot_id:
-                return False  # Room already assigned at this time slot
-        
-        # Check student group availability for this time slot
-        course = self.courses.get(course_id)
-        if course:
-            for group_id in course.student_groups:
-                for existing_course_id, assignment in solution.items():
-                    existing_course = self.courses.get(existing_course_id)
-                    if existing_course and group_id in existing_course.student_groups and assignment['time_slot_id'] == time_slot_id:
-                        return False  # Student group already has a class at this time slot
-        
-        return True  # No constraints violated
-    
     def _backtracking_search(self) -> Dict[str, Any]:
         """
         Use backtracking search to find a valid assignment.
         This is a simplified version of the full CP approach described in Section 6.
         """
-        solution = {}
-        unassigned_courses = list(self.courses.keys())
+        occupancy = Occupancy(self.model)
+        unassigned_courses = list(range(self.model.n_courses))
         
-        # Sort courses by the number of constraints (courses with more constraints first)
-        unassigned_courses.sort(key=lambda c: len(self.courses[c].eligible_teachers) * 
-                                            len(self.courses[c].preferred_rooms))
+        # Sort courses by the size of their feasible domain (most constrained first)
+        domain_size = self.model.domains.domain_size
+        unassigned_courses.sort(key=lambda c: domain_size[c])
         
-        return self._backtrack(solution, unassigned_courses)
+        if self._backtrack(occupancy, unassigned_courses):
+            return self.model.decode(occupancy.assignment)
+        return None
     
-    def _backtrack(self, solution: Dict[str, Any], unassigned_courses: List[str]) -> Dict[str, Any]:
+    def _backtrack(self, occupancy: Occupancy, unassigned_courses: List[int]) -> bool:
         """
         Recursive backtracking algorithm for constraint satisfaction.
         """
         if not unassigned_courses:
-            return solution  # All courses assigned
+            return True  # All courses assigned
         
         # Select the next course to assign
-        course_id = unassigned_courses[0]
-        course = self.courses[course_id]
+        course_idx = unassigned_courses[0]
+        candidates = self.model.domains.candidates[course_idx]
         
-        # Try all possible teacher, room, time slot combinations
-        for teacher_id in course.eligible_teachers:
-            for room_id in course.preferred_rooms:
-                for time_slot_id in self.time_slots:
-                    # Check if this assignment satisfies all constraints
-                    if self._check_constraints(solution, course_id, teacher_id, room_id, time_slot_id):
-                        # Assign the course
-                        solution[course_id] = {
-                            'teacher_id': teacher_id,
-                            'room_id': room_id,
-                            'time_slot_id': time_slot_id
-                        }
-                        
-                        # Recursively assign the next course
-                        result = self._backtrack(solution, unassigned_courses[1:])
-                        if result:
-                            return result
-                        
-                        # If we get here, the assignment didn't work, so undo it
-                        del solution[course_id]
+        # Only candidates that are free now can succeed; undoing deeper assignments restores this state
+        free = occupancy.free_candidates(course_idx, candidates)
+        for teacher_idx, room_idx, slot_idx in candidates[free].tolist():
+            # Assign the course
+            occupancy.assign(course_idx, teacher_idx, room_idx, slot_idx)
+            
+            # Recursively assign the next course
+            if self._backtrack(occupancy, unassigned_courses[1:]):
+                return True
+            
+            # If we get here, the assignment didn't work, so undo it
+            occupancy.unassign(course_idx)
         
-        return None  # No valid assignment found
+        return False  # No valid assignment found
     
     def _iterative_forward_checking(self) -> Dict[str, Any]:
         """
@@ -116,33 +90,25 @@ class ConstraintProgramming:
         pbar = tqdm(total=max_iterations, desc="Running Constraint Programming")
         
         for iteration in range(max_iterations):
-            solution = {}
+            occupancy = Occupancy(self.model)
             unassigned = []
             
             # Try to assign each course
-            for course_id, course in self.courses.items():
-                # Create a list of all possible assignments
-                assignments = []
-                for teacher_id in course.eligible_teachers:
-                    for room_id in course.preferred_rooms:
-                        for time_slot_id in self.time_slots:
-                            if self._check_constraints(solution, course_id, teacher_id, room_id, time_slot_id):
-                                assignments.append((teacher_id, room_id, time_slot_id))
+            for course_idx in range(self.model.n_courses):
+                # All valid assignments from the course's feasible domain
+                candidates = self.model.domains.candidates[course_idx]
+                assignments = candidates[occupancy.free_candidates(course_idx, candidates)]
                 
-                if assignments:
+                if len(assignments):
                     # Pick a random valid assignment
-                    teacher_id, room_id, time_slot_id = random.choice(assignments)
-                    solution[course_id] = {
-                        'teacher_id': teacher_id,
-                        'room_id': room_id,
-                        'time_slot_id': time_slot_id
-                    }
+                    teacher_idx, room_idx, slot_idx = assignments[random.randrange(len(assignments))].tolist()
+                    occupancy.assign(course_idx, teacher_idx, room_idx, slot_idx)
                 else:
-                    unassigned.append(course_id)
+                    unassigned.append(course_idx)
             
             # Update best solution if this one is better
             if len(unassigned) < best_unassigned:
-                best_solution = solution.copy()
+                best_solution = self.model.decode(occupancy.assignment)
                 best_unassigned = len(unassigned)
                 
                 pbar.set_description(f"Iteration {iteration}: Unassigned = {best_unassigned}")
@@ -0,0 +1,93 @@
+"""
+Constructive (hardest-first) initialization of timetables.
+
+Courses are placed one at a time in DSATUR order: the course whose
+conflicting neighbours already block the most distinct slots goes first,
+then the one with the smallest domain, then the highest conflict degree,
+with random tie-breaking so repeated builds differ. Each course takes a
+random free (teacher, room, slot) from its domain, falling back to one that
+only has a free teacher and room, then to any candidate.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from .problem_model import ProblemModel
+from .occupancy import Occupancy
+
+# Per-process constructor, built by the pool initializer
+_worker_constructor = None
+
+
+def _init_worker(model: ProblemModel) -> None:
+    global _worker_constructor
+    _worker_constructor = ConstructiveInitializer(model)
+
+
+def _build_with_seed(seed: int) -> np.ndarray:
+    return _worker_constructor.build(np.random.default_rng(seed))
+
+
+class ConstructiveInitializer:
+    """Builds low-conflict encoded (n_courses, 3) timetables hardest course first."""
+
+    def __init__(self, model: ProblemModel):
+        self.model = model
+        self.domains = model.domains
+        self._overlap_lists = model.timeslot_index.overlap_lists
+
+    def build(self, rng: np.random.Generator) -> np.ndarray:
+        """One timetable; courses without any candidate stay UNASSIGNED."""
+        model = self.model
+        n_courses = model.n_courses
+        occupancy = Occupancy(model)
+
+        # Slots each course can no longer use without a student clash, and how many
+        blocked_slots = np.zeros((n_courses, model.n_slots), dtype=np.int32)
+        saturation = np.zeros(n_courses, dtype=np.int64)
+        unplaced = np.flatnonzero(self.domains.domain_size > 0)
+        tie_break = rng.random(n_courses)
+
+        while len(unplaced):
+            # Highest saturation, then smallest domain, then highest degree, then random
+            order = np.lexsort((tie_break[unplaced], -model.conflicts.degree[unplaced],
+                                self.domains.domain_size[unplaced], -saturation[unplaced]))
+            course_idx = int(unplaced[order[0]])
+            unplaced = np.delete(unplaced, order[0])
+
+            candidates = self.domains.candidates[course_idx]
+            free = np.flatnonzero(occupancy.free_candidates(course_idx, candidates))
+            if not len(free):
+                free = np.flatnonzero(occupancy.free_candidates(course_idx, candidates, students=False))
+            choice = free[rng.integers(len(free))] if len(free) else rng.integers(len(candidates))
+            teacher_idx, room_idx, slot_idx = candidates[choice].tolist()
+            occupancy.assign(course_idx, teacher_idx, room_idx, slot_idx)
+
+            # Raise the saturation of conflicting courses for slots that just became blocked
+            neighbors, _ = model.conflicts.neighbors_of(course_idx)
+            if len(neighbors):
+                overlapping = self._overlap_lists[slot_idx]
+                block = blocked_slots[np.ix_(neighbors, overlapping)]
+                saturation[neighbors] += (block == 0).sum(axis=1)
+                blocked_slots[np.ix_(neighbors, overlapping)] = block + 1
+
+        return occupancy.assignment.copy()
+
+    def build_population(self, size: int, rng: np.random.Generator, workers: int = 1) -> np.ndarray:
+        """
+        `size` timetables as a (size, n_courses, 3) array, built on `workers`
+        processes (the model is sent once per worker) or in-process.
+        Falls back to in-process construction if a pool cannot be used.
+        """
+        if size <= 0:
+            return np.empty((0, self.model.n_courses, 3), dtype=np.int32)
+        seeds = rng.integers(0, 2 ** 63 - 1, size=size).tolist()
+        if workers is None or workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(self.model,)) as pool:
+                    chunksize = max(1, size // (4 * (workers or 1)))
+                    return np.stack(list(pool.map(_build_with_seed, seeds, chunksize=chunksize)))
+            except (OSError, BrokenProcessPool, NotImplementedError):
+                pass
+        return np.stack([self.build(np.random.default_rng(seed)) for seed in seeds])
@@ -0,0 +1,113 @@
+"""
+Per-course feasible domains (teacher x room x slot).
+
+Built once per input from the ProblemModel. Each course's rooms are pruned
+by room existence, lab requirement, capacity against the course's enrolment
+and required facilities; time slots are limited to those the teacher is
+available for. All solvers sample and enumerate from these arrays instead of
+the raw eligible_teachers x preferred_rooms x time_slots product.
+"""
+
+from typing import Dict, Any, List, Tuple
+import numpy as np
+
+
+class CourseDomains:
+    """
+    Pruned candidate arrays for every course.
+
+    When a filter would leave a course without any room it is skipped for that
+    course (and recorded in `relaxed`), so every course that had candidates
+    before pruning still has some afterwards.
+    """
+
+    def __init__(self, model, courses: Dict[str, Any]):
+        self.model = model
+        n_courses = model.n_courses
+
+        self.teachers: List[np.ndarray] = []
+        self.rooms: List[np.ndarray] = []
+        self.relaxed: Dict[str, List[str]] = {}
+        self.enrolment = np.array([len(model.students_of_course(c)) for c in range(n_courses)], dtype=np.int32)
+
+        for c, course in enumerate(courses.values()):
+            # Only teachers that exist in the input, unless none of them do
+            teachers = model.eligible_teachers(c)
+            defined = teachers[teachers < model.n_defined_teachers]
+            self.teachers.append(np.unique(defined) if len(defined) else np.unique(teachers))
+
+            required = frozenset(getattr(course, 'required_facilities', ()) or ())
+            rooms = np.unique(model.preferred_rooms(c))
+            filters = [
+                ('undefined_room', lambda r: r < model.n_defined_rooms),
+                ('lab', lambda r: model.room_is_lab[r] if model.course_requires_lab[c] else np.ones(len(r), dtype=bool)),
+                ('capacity', lambda r: model.room_capacity[r] >= self.enrolment[c]),
+                ('facilities', lambda r: np.array([required <= model.room_facilities[x] for x in r], dtype=bool)),
+            ]
+            for name, keep in filters:
+                kept = rooms[keep(rooms)] if len(rooms) else rooms
+                if len(kept):
+                    rooms = kept
+                elif len(rooms):
+                    self.relaxed.setdefault(model.course_ids[c], []).append(name)
+            self.rooms.append(rooms.astype(np.int32))
+
+        # String-ID views for the dict-based solvers
+        self.teacher_ids = [[model.teacher_ids[t] for t in teachers] for teachers in self.teachers]
+        self.room_ids = [[model.room_ids[r] for r in rooms] for rooms in self.rooms]
+
+        # Feasible (teacher, room, slot) triples per course, in teacher -> room -> slot order
+        self.candidates: List[np.ndarray] = []
+        for c in range(n_courses):
+            blocks = []
+            for t in self.teachers[c]:
+                slots = model.teacher_slots[t]
+                block = np.empty((len(self.rooms[c]) * len(slots), 3), dtype=np.int32)
+                block[:, 0] = t
+                block[:, 1] = np.repeat(self.rooms[c], len(slots))
+                block[:, 2] = np.tile(slots, len(self.rooms[c]))
+                blocks.append(block)
+            self.candidates.append(np.concatenate(blocks) if blocks else np.zeros((0, 3), dtype=np.int32))
+
+        self.domain_size = np.array([len(c) for c in self.candidates], dtype=np.int64)
+
+        # Padded (rows, max_len) tables so values for many genes can be drawn in one call
+        self.teacher_table, self.teacher_count = self._pad(self.teachers)
+        self.room_table, self.room_count = self._pad(self.rooms)
+        self.slot_table, self.slot_count = self._pad(model.teacher_slots)
+        self.complete = (self.teacher_count > 0) & (self.room_count > 0)
+
+    @staticmethod
+    def _pad(rows: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        counts = np.array([len(row) for row in rows], dtype=np.int64)
+        table = np.zeros((len(rows), max(1, counts.max(initial=0))), dtype=np.int32)
+        for i, row in enumerate(rows):
+            table[i, :len(row)] = row
+        return table, counts
+
+    def draw_teachers(self, courses: np.ndarray, u: np.ndarray) -> np.ndarray:
+        """Map uniform [0, 1) draws to a teacher from each course's domain."""
+        return self.teacher_table[courses, (u * self.teacher_count[courses]).astype(np.int64)]
+
+    def draw_rooms(self, courses: np.ndarray, u: np.ndarray) -> np.ndarray:
+        """Map uniform [0, 1) draws to a room from each course's domain."""
+        return self.room_table[courses, (u * self.room_count[courses]).astype(np.int64)]
+
+    def draw_slots(self, teachers: np.ndarray, u: np.ndarray) -> np.ndarray:
+        """Map uniform [0, 1) draws to a slot each teacher is available for."""
+        return self.slot_table[teachers, (u * self.slot_count[teachers]).astype(np.int64)]
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """
+        Draw `size` random assignments as a (size, n_courses, 3) array.
+        Courses without any teacher or room are left UNASSIGNED (-1).
+        """
+        n_courses = self.model.n_courses
+        courses = np.broadcast_to(np.arange(n_courses), (size, n_courses))
+        u = rng.random((3, size, n_courses))
+        population = np.empty((size, n_courses, 3), dtype=np.int32)
+        population[:, :, 0] = self.draw_teachers(courses, u[0])
+        population[:, :, 1] = self.draw_rooms(courses, u[1])
+        population[:, :, 2] = self.draw_slots(population[:, :, 0], u[2])
+        population[:, ~self.complete] = -1
+        return population
@@ -0,0 +1,134 @@
+"""
+Vectorized fitness evaluation for whole populations.
+
+The evaluator takes a (population, n_courses, 3) array of encoded timetables
+and scores every individual in one pass: teacher and room clashes from
+combined (individual, resource, slot) keys, student clashes over the course
+conflict graph, unavailability from the teacher slot masks and mentor loads
+from the precomputed per-course group sizes. Teacher time preferences are a
+soft term, looked up from the per-(teacher, slot) preference misses.
+"""
+
+from typing import Dict
+import numpy as np
+from .problem_model import ProblemModel, TEACHER, ROOM, SLOT
+
+
+class FitnessEvaluator:
+    """
+    Batch version of the GA fitness.
+
+    fitness = -(100 * (teacher + room + student clashes + unavailable slots)
+                + 50 * sum over mentors of |mentor load - 4|
+                + 10 * preference misses)
+    """
+
+    def __init__(self, model: ProblemModel):
+        self.model = model
+        self.n_slots = model.n_slots
+        self._overlaps = model.timeslot_index.overlaps
+        self._overlap_upper = model.timeslot_index._overlap_upper
+        self._has_partial_overlaps = len(model.timeslot_index.overlap_pairs) > 0
+        self._edges = model.conflicts.edges
+        self._forbidden = model.availability.forbidden_matrix
+        self._preference_misses = model.availability.preference_misses
+        self._mentor_load = model.course_mentor_load.astype(np.float64)
+        self._overlaps_int = self._overlaps.astype(np.int64)
+
+    def _resource_clashes(self, population: np.ndarray, assigned: np.ndarray, column: int, n_resources: int) -> np.ndarray:
+        """Clashes per individual for one resource column, counted as in TimeSlotIndex.count_clashes."""
+        n_individuals = len(population)
+        per_individual = n_resources * self.n_slots
+        owner = np.broadcast_to(np.arange(n_individuals, dtype=np.int64)[:, None], assigned.shape)[assigned]
+        keys = owner * per_individual + population[:, :, column][assigned].astype(np.int64) * self.n_slots + population[:, :, SLOT][assigned]
+
+        # Every extra booking of the same (resource, slot) is one clash
+        unique_keys = np.unique(keys)
+        clashes = assigned.sum(axis=1) - np.bincount(unique_keys // per_individual, minlength=n_individuals)
+
+        # Plus each pair of bookings in distinct slots that overlap in time
+        if self._has_partial_overlaps and len(keys):
+            occupied = np.bincount(keys, minlength=n_individuals * per_individual)
+            occupied = occupied.reshape(n_individuals, n_resources, self.n_slots)
+            clashes = clashes + (occupied * (occupied @ self._overlap_upper.T)).sum(axis=(1, 2))
+        return clashes.astype(np.int64)
+
+    def penalties(self, population: np.ndarray) -> Dict[str, np.ndarray]:
+        """Raw violation counts per individual."""
+        model = self.model
+        assigned = population[:, :, TEACHER] >= 0
+        teachers = np.where(assigned, population[:, :, TEACHER], 0)
+        slots = population[:, :, SLOT]
+
+        # Courses sharing students scheduled at overlapping times
+        u_slots = slots[:, self._edges[:, 0]]
+        v_slots = slots[:, self._edges[:, 1]]
+        student_clashes = ((u_slots >= 0) & (v_slots >= 0) & self._overlaps[u_slots, v_slots]).sum(axis=1)
+
+        # Teachers scheduled in slots they marked as unavailable
+        unavailable = (self._forbidden[teachers, np.where(assigned, slots, 0)] & assigned).sum(axis=1)
+
+        # Sessions outside the teacher's preferred windows or days
+        preference_misses = (self._preference_misses[teachers, np.where(assigned, slots, 0)] * assigned).sum(axis=1)
+
+        # Students per mentor, from the group sizes of every course each teacher is assigned
+        owner = np.arange(len(population), dtype=np.int64)[:, None] * model.n_teachers + teachers
+        loads = np.bincount(owner[assigned], weights=np.broadcast_to(self._mentor_load, assigned.shape)[assigned],
+                            minlength=len(population) * model.n_teachers).reshape(len(population), model.n_teachers)
+        mentor_deviation = np.abs(loads[:, model.mentor_indices] - 4).sum(axis=1).astype(np.int64)
+
+        return {
+            'teacher_overlap': self._resource_clashes(population, assigned, TEACHER, model.n_teachers),
+            'room_overlap': self._resource_clashes(population, assigned, ROOM, model.n_rooms),
+            'student_group_overlap': student_clashes.astype(np.int64),
+            'teacher_unavailability': unavailable.astype(np.int64),
+            'mentor_group_size': mentor_deviation,
+            'teacher_preference': preference_misses.astype(np.int64)
+        }
+
+    def _resource_conflicts(self, population: np.ndarray, assigned: np.ndarray, column: int, n_resources: int) -> np.ndarray:
+        """(population, n_courses) mask of courses sharing their resource with an overlapping booking."""
+        n_individuals, n_courses = assigned.shape
+        resources = np.where(assigned, population[:, :, column], 0).astype(np.int64)
+        slots = np.where(assigned, population[:, :, SLOT], 0).astype(np.int64)
+        owner = np.arange(n_individuals, dtype=np.int64)[:, None]
+        keys = (owner * n_resources + resources) * self.n_slots + slots
+
+        occupied = np.bincount(keys[assigned], minlength=n_individuals * n_resources * self.n_slots)
+        occupied = occupied.reshape(n_individuals, n_resources, self.n_slots)
+        # Bookings of the same resource in any slot overlapping each slot (the course itself included)
+        blocking = occupied @ self._overlaps_int if self._has_partial_overlaps else occupied
+        return assigned & (blocking.reshape(-1)[keys] > 1)
+
+    def conflicted_courses(self, population: np.ndarray, students: bool = True) -> np.ndarray:
+        """
+        (population, n_courses) bool mask of the courses involved in a hard violation:
+        a teacher, room or (unless students=False) student clash, or a slot the teacher
+        marked as unavailable.
+        """
+        model = self.model
+        n_individuals, n_courses = population.shape[:2]
+        assigned = population[:, :, TEACHER] >= 0
+        slots = population[:, :, SLOT]
+
+        conflicted = self._resource_conflicts(population, assigned, TEACHER, model.n_teachers)
+        conflicted |= self._resource_conflicts(population, assigned, ROOM, model.n_rooms)
+        conflicted |= assigned & self._forbidden[np.where(assigned, population[:, :, TEACHER], 0), np.where(assigned, slots, 0)]
+        if not students:
+            return conflicted
+
+        # Both ends of every clashing conflict-graph edge
+        u_slots = slots[:, self._edges[:, 0]]
+        v_slots = slots[:, self._edges[:, 1]]
+        clashing = (u_slots >= 0) & (v_slots >= 0) & self._overlaps[u_slots, v_slots]
+        owner, edge = np.nonzero(clashing)
+        flat = conflicted.reshape(-1)
+        flat[owner * n_courses + self._edges[edge, 0]] = True
+        flat[owner * n_courses + self._edges[edge, 1]] = True
+        return conflicted
+
+    def evaluate(self, population: np.ndarray) -> np.ndarray:
+        """Fitness (higher is better, 0 is perfect) of every individual."""
+        p = self.penalties(population)
+        return -(100 * (p['teacher_overlap'] + p['room_overlap'] + p['student_group_overlap'] +
+                        p['teacher_unavailability']) + 50 * p['mentor_group_size'] + 10 * p['teacher_preference'])
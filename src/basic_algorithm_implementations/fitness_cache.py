@@ -0,0 +1,97 @@
+"""
+Bounded LRU cache for fitness and cost values.
+
+Entries are keyed by a namespace ('fitness', 'sa_cost', ...) plus a 16-byte
+BLAKE2 digest of the encoded (n_courses, 3) assignment, so elites copied
+unchanged, children equal to a parent and re-scored tournament members are
+looked up instead of re-evaluated. One cache can be shared by the GA, SA and
+hybrid solvers.
+"""
+
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Any, Callable, Dict, Tuple
+import numpy as np
+
+
+class FitnessCache:
+    """LRU map from (namespace, assignment digest) to a score, with hit/miss counters."""
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self._entries: 'OrderedDict[Tuple[str, bytes], Any]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(encoded: np.ndarray) -> bytes:
+        """Compact digest of an encoded assignment."""
+        return blake2b(np.ascontiguousarray(encoded, dtype=np.int32).tobytes(), digest_size=16).digest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[str, bytes], default: Any = None) -> Any:
+        """Look up a key, counting the hit or miss and marking it most recently used."""
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        self.misses += 1
+        return default
+
+    def put(self, key: Tuple[str, bytes], value: Any) -> None:
+        """Store a value, evicting the least recently used entries beyond capacity."""
+        if self.capacity <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def get_or_compute(self, namespace: str, encoded: np.ndarray, compute: Callable[[np.ndarray], Any]) -> Any:
+        """Cached `compute(encoded)`."""
+        key = (namespace, self.digest(encoded))
+        value = self.get(key)
+        if value is None:
+            value = compute(encoded)
+            self.put(key, value)
+        return value
+
+    def evaluate_batch(self, namespace: str, population: np.ndarray,
+                       compute: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+        """
+        Cached scores for a (population, n_courses, 3) array. Only the distinct
+        individuals missing from the cache are passed to `compute`, as one batch.
+        """
+        keys = [(namespace, self.digest(individual)) for individual in population]
+        values = np.empty(len(population), dtype=np.int64)
+        pending: Dict[Tuple[str, bytes], list] = {}
+        for i, key in enumerate(keys):
+            if key in pending:
+                # Duplicate of an individual already being evaluated in this batch
+                self.hits += 1
+                pending[key].append(i)
+                continue
+            value = self.get(key)
+            if value is None:
+                pending[key] = [i]
+            else:
+                values[i] = value
+
+        if pending:
+            first = [rows[0] for rows in pending.values()]
+            for key, rows, value in zip(pending, pending.values(), compute(population[first]).tolist()):
+                values[rows] = value
+                self.put(key, value)
+        return values
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters reported in the solvers' run_stats."""
+        return {'size': len(self), 'capacity': self.capacity, 'hits': self.hits,
+                'misses': self.misses, 'hit_rate': self.hit_rate}
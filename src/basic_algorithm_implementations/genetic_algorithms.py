@@ -1,10 +1,25 @@
 # src/genetic_algorithm.py
+import heapq
 import random
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Callable
 import numpy as np
+from .problem_model import ProblemModel, TEACHER, ROOM, SLOT, UNASSIGNED
+from .fitness import FitnessEvaluator
+from .parallel_evaluation import ParallelEvaluator
+from .fitness_cache import FitnessCache
+from .selection import select_parents, draw_contestants
+from .island_model import IslandModel
+from .repair import RepairOperator
+from .construction import ConstructiveInitializer
+from .diversity import GenomeHasher, duplicate_mask, diversity_metrics
+from .termination import TerminationCriteria
+
+REPLACEMENT_STRATEGIES = ('generational', 'worst', 'tournament')
+DUPLICATE_POLICIES = ('keep', 'reject', 'remutate')
 
 class GeneticAlgorithm:
-    def __init__(self, data: Dict[str, Any], params: Dict[str, Any] = None):
+    def __init__(self, data: Dict[str, Any], params: Dict[str, Any] = None,
+                 model: ProblemModel = None, cache: FitnessCache = None):
         self.data = data
         self.params = params or {
             'population_size': 300,
@@ -23,32 +38,113 @@ class GeneticAlgorithm:
         self.time_slots = data['time_slots']
         self.student_groups = data['student_groups']
         
+        # Integer-indexed view of the data, shared with other solvers when provided
+        self.model = model or ProblemModel(data)
+        
+        # Population fitness is evaluated in-process, or on a persistent pool of `workers` processes
+        # that read batches from shared memory (or receive them pickled with shared_memory=False)
+        workers = self.params.get('workers', 1)
+        if workers == 1:
+            self.evaluator = FitnessEvaluator(self.model)
+        else:
+            self.evaluator = ParallelEvaluator(self.model, workers, self.params.get('chunk_size', 32),
+                                               self.params.get('shared_memory', True))
+        
+        # Optional repair of offspring: conflicting courses move to the nearest free placement
+        self.repairer = RepairOperator(self.model, self.evaluator) if self.params.get('repair') else None
+        
+        # Fitness memo keyed by assignment digest, shared with other solvers when provided
+        self.cache = cache if cache is not None else FitnessCache(self.params.get('fitness_cache_size', 10000))
+        
+        # 'dict' keeps one course_id -> assignment dict per individual. 'array' stores the
+        # whole population as one (population, courses, 3) int array of (teacher, room, slot)
+        # indices, with a second preallocated buffer that offspring are written into.
+        self.representation = self.params.get('representation', 'dict')
+        
+        # 'generational' rebuilds the population every generation. 'worst' and 'tournament' run
+        # a steady-state GA on the array representation: a few children per step, each replacing
+        # the worst individual or the loser of a reverse tournament.
+        self.replacement = self.params.get('population_replacement_strategy', 'generational')
+        if self.replacement not in REPLACEMENT_STRATEGIES:
+            raise ValueError(f"Unknown population replacement strategy: {self.replacement}")
+        if self.replacement != 'generational':
+            self.representation = 'array'
+        
+        # Offspring identical to an individual already in the population ('keep' allows them):
+        # 'reject' discards them, 'remutate' redraws one gene up to remutate_attempts times first.
+        # A generational GA refills rejected slots with random individuals.
+        self.duplicate_policy = self.params.get('duplicate_policy', 'keep')
+        if self.duplicate_policy not in DUPLICATE_POLICIES:
+            raise ValueError(f"Unknown duplicate policy: {self.duplicate_policy}")
+        self.hasher = GenomeHasher(self.model.n_courses)
+        
+        # Per-generation unique ratio and sampled mean Hamming distance of the population
+        self.diversity_history: List[Dict[str, float]] = []
+        
+        # Stop on the generation limit, time_budget, target_fitness or max_stall_generations;
+        # after run(), termination_reason says which and run_stats summarizes the run and the cache
+        self.termination = TerminationCriteria(self.params)
+        self.termination_reason = None
+        self.run_stats: Dict[str, Any] = {}
+        
+        # Array operators draw from rng, dict-mode operators from random; both follow the seed
+        self.rng = np.random.default_rng(self.params.get('seed'))
+        self.random = random.Random(self.params.get('seed'))
+        self._offspring = None
+        
         # Initialize population
+        self.best_assignment = None
         self.population = self._initialize_population()
         self.best_solution = None
         self.best_fitness = float('-inf')
     
     def _initialize_population(self) -> List[Dict[str, Any]]:
         """Initialize a random population of timetables."""
+        if self.representation == 'array':
+            return self._initialize_population_array()
+        
         population = []
-        for _ in range(self.params['population_size']):
+        for _ in range(self.params['population_size'] - self._n_constructed()):
             timetable = self._generate_random_timetable()
             population.append(timetable)
+        population.extend(self.model.decode(t) for t in self._construct(self._n_constructed()))
+        return population
+    
+    def _initialize_population_array(self) -> np.ndarray:
+        """Initialize a random (population, courses, 3) population and its offspring buffer."""
+        population = self.model.domains.sample(self.rng, self.params['population_size'])
+        n_constructed = self._n_constructed()
+        if n_constructed:
+            population[-n_constructed:] = self._construct(n_constructed)
+        self._offspring = np.empty_like(population)
+        self.best_assignment = np.full(population.shape[1:], UNASSIGNED, dtype=population.dtype)
+        self._fitness = None  # steady-state fitness vector, built on first use
         return population
     
+    def _n_constructed(self) -> int:
+        """How many initial individuals the constructive initializer builds."""
+        if self.params.get('initialization', 'random') != 'constructive':
+            return 0
+        fraction = self.params.get('constructive_fraction', 1.0)
+        return min(self.params['population_size'], int(round(fraction * self.params['population_size'])))
+    
+    def _construct(self, size: int) -> np.ndarray:
+        """Build `size` timetables hardest course first, on a separate pool of `workers` processes."""
+        return ConstructiveInitializer(self.model).build_population(size, self.rng, self.params.get('workers', 1))
+    
     def _generate_random_timetable(self) -> Dict[str, Any]:
         """Generate a random timetable."""
         timetable = {}
         
-        # For each course, randomly assign a teacher, room, and time slot
-        for course_id, course in self.courses.items():
-            eligible_teachers = course.eligible_teachers
-            teacher_id = random.choice(eligible_teachers)
+        # For each course, randomly assign a teacher, room, and time slot from its pruned domain
+        domains = self.model.domains
+        for course_idx, course_id in enumerate(self.model.course_ids):
+            teacher_id = self.random.choice(domains.teacher_ids[course_idx])
             
-            # Choose a random room and time slot
-            room_id = random.choice(course.preferred_rooms)
+            # Choose a random room and a time slot the teacher is available for
+            room_id = self.random.choice(domains.room_ids[course_idx])
             # Simplistic assignment - in a real implementation, check for conflicts
-            time_slot_id = random.choice(list(self.time_slots.keys()))
+            time_slot_id = self.random.choice(self.model.available_slot_ids(teacher_id))
             
             timetable[course_id] = {
                 'teacher_id': teacher_id,
@@ -58,127 +154,377 @@ class GeneticAlgorithm:
         
         return timetable
     
-    def _calculate_fitness(self, timetable: Dict[str, Any]) -> float:
-        """Calculate fitness of a timetable based on constraints."""
-        # Initialize penalties
-        teacher_conflict_penalty = 0
-        room_conflict_penalty = 0
-        mentor_group_penalty = 0
-        
-        # Check for teacher conflicts
-        teacher_timeslots = {}
-        for course_id, assignment in timetable.items():
-            teacher_id = assignment['teacher_id']
-            time_slot_id = assignment['time_slot_id']
-            
-            if teacher_id not in teacher_timeslots:
-                teacher_timeslots[teacher_id] = set()
-            
-            if time_slot_id in teacher_timeslots[teacher_id]:
-                teacher_conflict_penalty += 100  # High penalty for hard constraint
-            else:
-                teacher_timeslots[teacher_id].add(time_slot_id)
-        
-        # Check for room conflicts
-        room_timeslots = {}
-        for course_id, assignment in timetable.items():
-            room_id = assignment['room_id']
-            time_slot_id = assignment['time_slot_id']
-            
-            if room_id not in room_timeslots:
-                room_timeslots[room_id] = set()
-            
-            if time_slot_id in room_timeslots[room_id]:
-                room_conflict_penalty += 100  # High penalty for hard constraint
-            else:
-                room_timeslots[room_id].add(time_slot_id)
-        
-        # Check mentor group size (simplified)
-        # Each mentor should have exactly 4 students
-        mentor_students = {}
-        for teacher_id, teacher in self.teachers.items():
-            if teacher.is_mentor:
-                mentor_students[teacher_id] = 0
-        
-        # Count students per mentor
-        for group_id, group in self.student_groups.items():
-            for course_id, assignment in timetable.items():
-                if course_id in group.courses:
-                    teacher_id = assignment['teacher_id']
-                    if teacher_id in mentor_students:
-                        mentor_students[teacher_id] += len(group.students)
-        
-        # Penalize incorrect mentor group sizes
-        for teacher_id, count in mentor_students.items():
-            if count != 4:
-                mentor_group_penalty += 50 * abs(count - 4)
-        
-        # Calculate total fitness (negative sum of penalties)
-        fitness = -(teacher_conflict_penalty + room_conflict_penalty + mentor_group_penalty)
-        
-        return fitness
+    def _evaluate_population(self, population) -> np.ndarray:
+        """Fitness vector of a whole population (array, or list of timetable dicts) in one pass."""
+        if not isinstance(population, np.ndarray):
+            population = np.stack([self.model.encode(t) for t in population])
+        return self.cache.evaluate_batch('fitness', population, self.evaluator.evaluate)
     
-    def _selection(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-        """Select two parents using tournament selection."""
-        tournament_size = self.params['tournament_size']
-        
-        # First parent
-        tournament1 = random.sample(self.population, tournament_size)
-        fitness_values1 = [self._calculate_fitness(t) for t in tournament1]
-        parent1 = tournament1[fitness_values1.index(max(fitness_values1))]
-        
-        # Second parent
-        tournament2 = random.sample(self.population, tournament_size)
-        fitness_values2 = [self._calculate_fitness(t) for t in tournament2]
-        parent2 = tournament2[fitness_values2.index(max(fitness_values2))]
-        
-        return parent1, parent2
+    def _select_parents(self, fitness_values: np.ndarray, n_pairs: int) -> np.ndarray:
+        """Indices of `n_pairs` parent pairs, drawn on this generation's fitness vector."""
+        return select_parents(fitness_values, n_pairs, self.rng,
+                              method=self.params.get('selection_method', 'tournament'),
+                              tournament_size=self.params.get('tournament_size', 3))
     
     def _crossover(self, parent1: Dict[str, Any], parent2: Dict[str, Any]) -> Dict[str, Any]:
         """Perform crossover between two parents."""
-        if random.random() > self.params['crossover_rate']:
-            return parent1.copy()
+        if self.random.random() > self.params['crossover_rate']:
+            return dict(parent1)
         
-        child = {}
+        # Gene dicts are shared, never copied: operators replace a gene instead of editing it
         courses = list(self.courses.keys())
-        crossover_point = random.randint(1, len(courses) - 1)
-        
-        for i, course_id in enumerate(courses):
-            if i < crossover_point:
-                child[course_id] = parent1[course_id].copy()
-            else:
-                child[course_id] = parent2[course_id].copy()
+        crossover_point = self.random.randint(1, len(courses) - 1)
+        child = {course_id: parent1[course_id] for course_id in courses[:crossover_point]}
+        child.update((course_id, parent2[course_id]) for course_id in courses[crossover_point:])
         
         return child
     
+    def _mutation_rates(self, population: np.ndarray, focus_draws: np.ndarray) -> np.ndarray:
+        """
+        Per-gene mutation probabilities for a (population, n_courses, 3) array. With
+        conflict_focus > 0, that fraction of individuals (chosen by `focus_draws`) spend their
+        expected number of mutations only on courses involved in hard violations.
+        """
+        mutation_rate = self.params['mutation_rate']
+        n_individuals, n_courses = population.shape[:2]
+        rates = np.full((n_individuals, n_courses), mutation_rate)
+        focused = focus_draws < self.params.get('conflict_focus', 0.0)
+        if not focused.any():
+            return rates
+        
+        conflicted = self.evaluator.conflicted_courses(population[focused])
+        n_conflicted = conflicted.sum(axis=1, keepdims=True)
+        focused_rates = np.where(conflicted, np.minimum(1.0, mutation_rate * n_courses / np.maximum(n_conflicted, 1)), 0.0)
+        # Individuals without any violation keep the uniform rate
+        rates[focused] = np.where(n_conflicted > 0, focused_rates, mutation_rate)
+        return rates
+    
     def _mutation(self, timetable: Dict[str, Any]) -> Dict[str, Any]:
         """Mutate a timetable."""
+        rates = None
+        if self.params.get('conflict_focus'):
+            rates = self._mutation_rates(self.model.encode(timetable)[None], np.array([self.random.random()]))[0]
         for course_id in timetable:
-            if random.random() < self.params['mutation_rate']:
-                course = self.courses[course_id]
+            course_idx = self.model.course_index[course_id]
+            if self.random.random() < (self.params['mutation_rate'] if rates is None else rates[course_idx]):
+                teachers = self.model.domains.teacher_ids[course_idx]
+                rooms = self.model.domains.room_ids[course_idx]
                 
-                # Randomly mutate one aspect (teacher, room, or time slot)
-                mutation_type = random.choice(['teacher', 'room', 'time_slot'])
+                # Randomly mutate one aspect (teacher, room, or time slot) of a fresh copy of the
+                # gene, since the original may be shared with parents and elites
+                mutation_type = self.random.choice(['teacher', 'room', 'time_slot'])
+                gene = dict(timetable[course_id])
                 
-                if mutation_type == 'teacher' and course.eligible_teachers:
-                    timetable[course_id]['teacher_id'] = random.choice(course.eligible_teachers)
-                elif mutation_type == 'room' and course.preferred_rooms:
-                    timetable[course_id]['room_id'] = random.choice(course.preferred_rooms)
+                if mutation_type == 'teacher' and teachers:
+                    gene['teacher_id'] = self.random.choice(teachers)
+                elif mutation_type == 'room' and rooms:
+                    gene['room_id'] = self.random.choice(rooms)
                 elif mutation_type == 'time_slot':
-                    timetable[course_id]['time_slot_id'] = random.choice(list(self.time_slots.keys()))
+                    gene['time_slot_id'] = self.random.choice(self.model.available_slot_ids(gene['teacher_id']))
+                
+                timetable[course_id] = gene
         
         return timetable
     
+    def _repair(self, timetable: Dict[str, Any]) -> Dict[str, Any]:
+        """Repair a timetable dict; returns a new timetable."""
+        encoded = self.model.encode(timetable)
+        self.repairer.repair(encoded)
+        return self.model.decode(encoded)
+    
+    def _deduplicate_timetables(self, children: List[Dict[str, Any]], elites: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Duplicate policy for timetable dicts; rejected children are replaced by random timetables."""
+        if self.duplicate_policy == 'keep' or not children:
+            return children
+        
+        encoded = np.stack([self.model.encode(t) for t in children])
+        original = encoded.copy()
+        existing = self.hasher.hash(np.stack([self.model.encode(t) for t in elites])) if elites else None
+        accepted = self._deduplicate(encoded, existing)
+        remutated = (encoded != original).any(axis=(1, 2))
+        
+        timetables = []
+        for i, timetable in enumerate(children):
+            if not accepted[i]:
+                timetables.append(self._generate_random_timetable())
+            elif remutated[i]:
+                timetables.append(self.model.decode(encoded[i]))
+            else:
+                timetables.append(timetable)
+        return timetables
+    
+    def _crossover_population(self, population: np.ndarray, parents: np.ndarray, children: np.ndarray) -> None:
+        """
+        Cross every (parent1, parent2) pair at once, writing the children into `children`.
+        Supports 'one_point' (default), 'two_point' and 'uniform' crossover_type.
+        """
+        n_children, n_courses = len(parents), self.model.n_courses
+        crossover_type = self.params.get('crossover_type', 'one_point')
+        positions = np.arange(n_courses)
+        u = self.rng.random((n_children, 3))
+        
+        # Genes taken from parent1; the rest come from parent2
+        if crossover_type == 'one_point':
+            points = 1 + (u[:, 1] * (n_courses - 1)).astype(np.int64)
+            from_parent1 = positions[None, :] < points[:, None]
+        elif crossover_type == 'two_point':
+            points = np.sort(1 + (u[:, 1:] * (n_courses - 1)).astype(np.int64), axis=1)
+            from_parent1 = (positions[None, :] < points[:, :1]) | (positions[None, :] >= points[:, 1:])
+        elif crossover_type == 'uniform':
+            from_parent1 = self.rng.random((n_children, n_courses)) < 0.5
+        else:
+            raise ValueError(f"Unknown crossover type: {crossover_type}")
+        
+        # Pairs that skip crossover copy parent1 unchanged
+        from_parent1[u[:, 0] > self.params['crossover_rate']] = True
+        
+        np.take(population, parents[:, 1], axis=0, out=children)
+        np.copyto(children, population[parents[:, 0]], where=from_parent1[:, :, None])
+    
+    def _mutate_population(self, children: np.ndarray) -> None:
+        """
+        Mutate encoded timetables in place. Each assigned gene mutates with probability
+        mutation_rate, changing its teacher, room or slot to a value from the course's domain.
+        """
+        domains = self.model.domains
+        n_children, n_courses = children.shape[:2]
+        u = self.rng.random((3, n_children, n_courses))
+        rates = self.params['mutation_rate']
+        if self.params.get('conflict_focus'):
+            rates = self._mutation_rates(children, self.rng.random(n_children))
+        
+        mutate = (u[0] < rates) & (children[:, :, TEACHER] != UNASSIGNED)
+        mutation_type = (u[1] * 3).astype(np.int64)
+        courses = np.broadcast_to(np.arange(n_courses), (n_children, n_courses))
+        
+        teacher_genes = mutate & (mutation_type == TEACHER)
+        children[:, :, TEACHER][teacher_genes] = domains.draw_teachers(courses[teacher_genes], u[2][teacher_genes])
+        room_genes = mutate & (mutation_type == ROOM)
+        children[:, :, ROOM][room_genes] = domains.draw_rooms(courses[room_genes], u[2][room_genes])
+        slot_genes = mutate & (mutation_type == SLOT)
+        children[:, :, SLOT][slot_genes] = domains.draw_slots(children[:, :, TEACHER][slot_genes], u[2][slot_genes])
+    
+    def _point_mutate(self, children: np.ndarray) -> None:
+        """Redraw the teacher, room or slot of one random course of every timetable, in place."""
+        domains = self.model.domains
+        n_children, n_courses = children.shape[:2]
+        rows = np.arange(n_children)
+        courses = self.rng.integers(0, n_courses, n_children)
+        mutation_type = self.rng.integers(0, 3, n_children)
+        u = self.rng.random(n_children)
+        assigned = children[rows, courses, TEACHER] != UNASSIGNED
+        
+        genes = assigned & (mutation_type == TEACHER)
+        children[rows[genes], courses[genes], TEACHER] = domains.draw_teachers(courses[genes], u[genes])
+        genes = assigned & (mutation_type == ROOM)
+        children[rows[genes], courses[genes], ROOM] = domains.draw_rooms(courses[genes], u[genes])
+        genes = assigned & (mutation_type == SLOT)
+        children[rows[genes], courses[genes], SLOT] = domains.draw_slots(children[rows[genes], courses[genes], TEACHER], u[genes])
+    
+    def _deduplicate(self, children: np.ndarray, existing: np.ndarray) -> np.ndarray:
+        """
+        Apply the duplicate policy to freshly bred children (in place) and return the mask of
+        those that may be inserted: not a clone of an `existing` hash or of an earlier child.
+        """
+        if self.duplicate_policy == 'keep':
+            return np.ones(len(children), dtype=bool)
+        
+        duplicate = duplicate_mask(self.hasher.hash(children), existing)
+        if self.duplicate_policy == 'remutate':
+            for _ in range(self.params.get('remutate_attempts', 3)):
+                if not duplicate.any():
+                    break
+                clones = children[duplicate]
+                self._point_mutate(clones)
+                children[duplicate] = clones
+                duplicate = duplicate_mask(self.hasher.hash(children), existing)
+        return ~duplicate
+    
+    def _record_diversity(self, population: np.ndarray) -> Dict[str, float]:
+        """Append the diversity of an encoded population to diversity_history."""
+        metrics = diversity_metrics(population, self.hasher.hash(population), self.rng,
+                                    self.params.get('diversity_sample_pairs', 64))
+        self.diversity_history.append(metrics)
+        return metrics
+    
+    def _update_best_array(self, fitness_values: np.ndarray) -> None:
+        """Record the population's best individual if it beats the best so far."""
+        max_fitness_idx = int(np.argmax(fitness_values))
+        if fitness_values[max_fitness_idx] > self.best_fitness:
+            self.best_fitness = int(fitness_values[max_fitness_idx])
+            self.best_assignment[:] = self.population[max_fitness_idx]
+    
+    def _breed_array(self, fitness_values: np.ndarray) -> np.ndarray:
+        """
+        Fill the offspring buffer from the current population: elites first, then children
+        produced by selection, crossover and mutation. Returns the children block.
+        """
+        population = self.population
+        offspring = self._offspring
+        elitism_count = self.params['elitism_count']
+        
+        # Elitism: copy the best solutions straight into the offspring buffer
+        sorted_indices = np.argsort(fitness_values)[::-1]  # Descending order
+        np.take(population, sorted_indices[:elitism_count], axis=0, out=offspring[:elitism_count])
+        
+        # Fill the rest of the offspring buffer through selection, crossover, and mutation
+        parents = self._select_parents(fitness_values, len(population) - elitism_count)
+        children = offspring[elitism_count:]
+        self._crossover_population(population, parents, children)
+        self._mutate_population(children)
+        if self.repairer is not None:
+            self.repairer.repair_population(children)
+        
+        # Clones that survive the duplicate policy are replaced by random individuals
+        rejected = ~self._deduplicate(children, self.hasher.hash(offspring[:elitism_count]))
+        if rejected.any():
+            children[rejected] = self.model.domains.sample(self.rng, int(rejected.sum()))
+        return children
+    
+    def _swap_buffers(self) -> None:
+        """The offspring become the population; the old population is next generation's buffer."""
+        self.population, self._offspring = self._offspring, self.population
+    
+    def _evolve_generation_array(self) -> None:
+        """Evaluate the population and replace it with the next generation."""
+        if self.replacement != 'generational':
+            self._evolve_steady_state()
+            return
+        
+        self._record_diversity(self.population)
+        fitness_values = self._evaluate_population(self.population)
+        self._update_best_array(fitness_values)
+        self._breed_array(fitness_values)
+        self._swap_buffers()
+    
+    def _init_steady_state(self) -> None:
+        """Score the population once and index it by fitness for worst-first replacement."""
+        self._fitness = self._evaluate_population(self.population).astype(np.int64)
+        self._hashes = self.hasher.hash(self.population)
+        self._update_best_array(self._fitness)
+        
+        # Min-heap of (fitness, version, index); entries whose version is outdated are skipped
+        self._versions = np.zeros(len(self.population), dtype=np.int64)
+        self._worst_heap = [(int(fitness), 0, i) for i, fitness in enumerate(self._fitness)]
+        heapq.heapify(self._worst_heap)
+    
+    def _replacement_index(self) -> int:
+        """Index of the individual the next child replaces."""
+        if self.replacement == 'worst':
+            while True:
+                _, version, idx = heapq.heappop(self._worst_heap)
+                if version == self._versions[idx]:
+                    return idx
+        
+        # Reverse tournament: the least fit contestant loses its place
+        contestants = draw_contestants(self.rng, len(self._fitness), 1, self.params.get('tournament_size', 3))[0]
+        return int(contestants[np.argmin(self._fitness[contestants])])
+    
+    def _steady_state_step(self, refine: Callable[[np.ndarray], None] = None) -> None:
+        """
+        Breed `offspring_per_step` children, optionally refine them in place, score only
+        them and write each over the individual chosen by the replacement strategy.
+        """
+        n_children = min(self.params.get('offspring_per_step', 2), len(self.population))
+        children = self._offspring[:n_children]
+        parents = self._select_parents(self._fitness, n_children)
+        self._crossover_population(self.population, parents, children)
+        self._mutate_population(children)
+        if self.repairer is not None:
+            self.repairer.repair_population(children)
+        if refine is not None:
+            for child in children:
+                refine(child)
+        
+        # Clones of current individuals are not inserted
+        children = children[self._deduplicate(children, self._hashes)]
+        if not len(children):
+            return
+        
+        hashes = self.hasher.hash(children)
+        for child, fitness, genome_hash in zip(children, self._evaluate_population(children).tolist(), hashes):
+            idx = self._replacement_index()
+            self.population[idx] = child
+            self._fitness[idx] = fitness
+            self._hashes[idx] = genome_hash
+            self._versions[idx] += 1
+            if self.replacement == 'worst':
+                heapq.heappush(self._worst_heap, (fitness, int(self._versions[idx]), idx))
+            
+            if fitness > self.best_fitness:
+                self.best_fitness = fitness
+                self.best_assignment[:] = child
+    
+    def _evolve_steady_state(self, refine: Callable[[np.ndarray], None] = None) -> None:
+        """
+        Steady-state equivalent of one generation: as many steps as it takes to produce
+        the number of children a generational GA would.
+        """
+        if self._fitness is None:
+            self._init_steady_state()
+        self._record_diversity(self.population)
+        
+        n_children = max(1, self.params['population_size'] - self.params['elitism_count'])
+        per_step = max(1, self.params.get('offspring_per_step', 2))
+        for _ in range(-(-n_children // per_step)):
+            self._steady_state_step(refine)
+    
+    def _run_array(self) -> Dict[str, Any]:
+        """Run the genetic algorithm on the array representation."""
+        self.termination.start()
+        for generation in range(self.params['generations']):
+            self._evolve_generation_array()
+            
+            # Print progress
+            if generation % 100 == 0:
+                print(f"Generation {generation}: Best Fitness = {self.best_fitness}, "
+                      f"Unique = {self.diversity_history[-1]['unique_ratio']:.2f}")
+            
+            if self.termination.update(generation + 1, self.best_fitness):
+                break
+        
+        self._record_termination()
+        self.close()
+        self.best_solution = self.model.decode(self.best_assignment)
+        return self.best_solution
+    
+    def _run_islands(self) -> Dict[str, Any]:
+        """Run the GA as an island model, one process per island."""
+        islands = IslandModel(self.data, self.params, self.model)
+        self.best_fitness, self.best_assignment = islands.run()
+        self.termination = islands.termination
+        self._record_termination()
+        self.best_solution = self.model.decode(self.best_assignment)
+        return self.best_solution
+    
+    def _record_termination(self) -> None:
+        """Keep why and when the run stopped with the result."""
+        self.termination_reason = self.termination.reason
+        self.run_stats = dict(self.termination.summary(), best_fitness=self.best_fitness, cache=self.cache.stats())
+    
+    def close(self) -> None:
+        """Release evaluation workers, if any."""
+        if isinstance(self.evaluator, ParallelEvaluator):
+            self.evaluator.close()
+    
     def run(self) -> Dict[str, Any]:
         """Run the genetic algorithm."""
+        if self.params.get('islands', 1) > 1:
+            return self._run_islands()
+        if self.representation == 'array':
+            return self._run_array()
+        
+        self.termination.start()
         for generation in range(self.params['generations']):
             # Evaluate population
-            fitness_values = [self._calculate_fitness(t) for t in self.population]
+            encoded = np.stack([self.model.encode(t) for t in self.population])
+            fitness_values = self._evaluate_population(encoded)
+            self._record_diversity(encoded)
             
             # Update best solution
-            max_fitness_idx = fitness_values.index(max(fitness_values))
+            max_fitness_idx = int(np.argmax(fitness_values))
             if fitness_values[max_fitness_idx] > self.best_fitness:
-                self.best_fitness = fitness_values[max_fitness_idx]
+                self.best_fitness = int(fitness_values[max_fitness_idx])
                 self.best_solution = self.population[max_fitness_idx].copy()
             
             # Create new population
@@ -191,16 +537,26 @@ class GeneticAlgorithm:
                 new_population.append(self.population[sorted_indices[i]].copy())
             
             # Generate new solutions through selection, crossover, and mutation
-            while len(new_population) < self.params['population_size']:
-                parent1, parent2 = self._selection()
-                child = self._crossover(parent1, parent2)
+            parents = self._select_parents(fitness_values, max(0, self.params['population_size'] - len(new_population)))
+            children = []
+            for parent1, parent2 in parents:
+                child = self._crossover(self.population[parent1], self.population[parent2])
                 child = self._mutation(child)
-                new_population.append(child)
+                if self.repairer is not None:
+                    child = self._repair(child)
+                children.append(child)
+            new_population.extend(self._deduplicate_timetables(children, new_population[:elitism_count]))
             
             self.population = new_population
             
             # Print progress
             if generation % 100 == 0:
-                print(f"Generation {generation}: Best Fitness = {self.best_fitness}")
+                print(f"Generation {generation}: Best Fitness = {self.best_fitness}, "
+                      f"Unique = {self.diversity_history[-1]['unique_ratio']:.2f}")
+            
+            if self.termination.update(generation + 1, self.best_fitness):
+                break
         
+        self._record_termination()
+        self.close()
         return self.best_solution
@@ -3,18 +3,23 @@ Hybrid Algorithm implementation that combines Genetic Algorithm and Simulated An
 Based on Section 8 of the research paper.
 """
 
-from typing import Dict, Any, List
-import random
-import math
+from typing import Dict, Any, Union
 import numpy as np
 from tqdm import tqdm
 from .genetic_algorithms import GeneticAlgorithm
 from .simulated_annealing import SimulatedAnnealing
+from .problem_model import ProblemModel
+from .fitness_cache import FitnessCache
+from .island_model import IslandModel
 
 class HybridAlgorithm:
-    def __init__(self, data: Dict[str, Any], params: Dict[str, Any] = None):
+    def __init__(self, data: Dict[str, Any], params: Dict[str, Any] = None,
+                 model: ProblemModel = None):
         self.data = data
         
+        # Compile the integer-indexed model once and share it with the GA and SA components
+        self.model = model or ProblemModel(data)
+        
         # Use default parameters if none provided
         self.params = params or {}
         
@@ -42,13 +47,22 @@ class HybridAlgorithm:
             'local_search_iterations': 50,
             'local_search_probability': 0.3,
             'sa_iterations_per_generation': 10,
-            'population_replacement_strategy': 'worst',
+            'population_replacement_strategy': 'generational',
             'convergence_threshold': 0.001,
             'max_stagnation_generations': 20
         })
         
+        # One fitness/cost cache for the GA and every SA refinement
+        self.cache = FitnessCache(self.params.get('fitness_cache_size', 10000))
+        
+        # The hybrid's replacement strategy and repair setting drive the GA unless the GA params set
+        # their own. Steady state ('worst' or 'tournament') is opt-in and switches the GA to arrays.
+        for key in ('population_replacement_strategy', 'repair'):
+            if key in self.hybrid_params:
+                self.ga_params = dict({key: self.hybrid_params[key]}, **self.ga_params)
+        
         # Initialize GA component
-        self.ga = GeneticAlgorithm(data, self.ga_params)
+        self.ga = GeneticAlgorithm(data, self.ga_params, model=self.model, cache=self.cache)
         
         # Will initialize SA component when needed
         self.sa = None
@@ -56,44 +70,48 @@ class HybridAlgorithm:
         # Tracking for convergence
         self.best_fitness_history = []
         self.stagnation_count = 0
+        
+        # Best GA fitness, cost after the final SA refinement and cache counters, filled by run()
+        self.run_stats: Dict[str, Any] = {}
     
     def _apply_sa_to_solution(self, solution: Dict[str, Any]) -> Dict[str, Any]:
         """
         Apply Simulated Annealing to refine a solution.
         This is a key part of the hybrid approach described in Section 8.
         """
-        # Create temporary SA instance with the solution as initial state
-        sa = SimulatedAnnealing(self.data, self.sa_params)
-        sa.current_solution = solution.copy()
-        sa.best_solution = solution.copy()
-        sa.current_cost = sa._calculate_cost(solution)
-        sa.best_cost = sa.current_cost
+        return self._anneal(solution).best_solution
+    
+    def _apply_sa_to_assignment(self, assignment: np.ndarray) -> None:
+        """Refine an encoded timetable (a population buffer row) with SA, in place."""
+        assignment[:] = self._anneal(assignment)._best_assignment
+    
+    def _anneal(self, start: Union[Dict[str, Any], np.ndarray]) -> SimulatedAnnealing:
+        """Run a short SA from `start` (a timetable dict or an encoded array) and return the SA."""
+        # One SA instance is reused; each restart rebinds its incremental cost state
+        if self.sa is None:
+            # Seeded from the GA unless the SA params set their own seed
+            sa_params = dict({'seed': self.ga_params.get('seed')}, **self.sa_params)
+            self.sa = SimulatedAnnealing(self.data, sa_params, model=self.model, cache=self.cache)
+        sa = self.sa
+        sa._reset(start)
         
         # Run SA for a limited number of iterations
         temperature = self.sa_params.get('initial_temperature', 1000)
         cooling_rate = self.sa_params.get('cooling_rate', 0.99)
         
         for _ in range(self.hybrid_params.get('sa_iterations_per_generation', 10)):
-            # Generate a neighbor
-            neighbor = sa._generate_neighbor(sa.current_solution)
-            
-            # Calculate the cost of the neighbor
-            neighbor_cost = sa._calculate_cost(neighbor)
-            
-            # Decide whether to accept the neighbor
-            if sa._acceptance_probability(sa.current_cost, neighbor_cost, temperature) > random.random():
-                sa.current_solution = neighbor
-                sa.current_cost = neighbor_cost
-                
-                # Update best solution if needed
-                if neighbor_cost < sa.best_cost:
-                    sa.best_solution = neighbor.copy()
-                    sa.best_cost = neighbor_cost
+            # Move one course in place, scored from the incremental cost state
+            sa._step(temperature)
             
             # Cool down
             temperature *= cooling_rate
         
-        return sa.best_solution
+        return sa
+    
+    def _record_run(self) -> None:
+        """Summarize the finished run in run_stats."""
+        self.run_stats = {'best_fitness': self.ga.best_fitness, 'final_cost': self.sa.best_cost,
+                          'cache': self.cache.stats()}
     
     def _check_convergence(self) -> bool:
         """
@@ -104,8 +122,12 @@ class HybridAlgorithm:
             # Calculate the change in fitness over the last 10 generations
             fitness_change = abs(self.best_fitness_history[-1] - self.best_fitness_history[-10]) / abs(self.best_fitness_history[-10]) if self.best_fitness_history[-10] != 0 else 0
             
+            # A population that has collapsed onto a few genomes is stagnant whatever its best fitness
+            collapsed = (bool(self.ga.diversity_history) and
+                         self.ga.diversity_history[-1]['unique_ratio'] < self.hybrid_params.get('min_unique_ratio', 0.0))
+            
             # If the change is below the threshold
-            if fitness_change < self.hybrid_params.get('convergence_threshold', 0.001):
+            if fitness_change < self.hybrid_params.get('convergence_threshold', 0.001) or collapsed:
                 self.stagnation_count += 1
             else:
                 self.stagnation_count = 0
@@ -120,20 +142,27 @@ class HybridAlgorithm:
         Run the hybrid algorithm.
         Following Section 8 of the paper.
         """
+        if self.ga_params.get('islands', 1) > 1:
+            return self._run_islands()
+        
         # Initialize GA population
         self.ga.population = self.ga._initialize_population()
+        if self.ga.representation == 'array':
+            return self._run_array()
         
         # Create progress bar
         pbar = tqdm(total=self.ga_params['generations'], desc="Running Hybrid Algorithm")
         
         for generation in range(self.ga_params['generations']):
             # Evaluate population
-            fitness_values = [self.ga._calculate_fitness(t) for t in self.ga.population]
+            encoded = np.stack([self.model.encode(t) for t in self.ga.population])
+            fitness_values = self.ga._evaluate_population(encoded)
+            self.ga._record_diversity(encoded)
             
             # Update best solution
-            max_fitness_idx = fitness_values.index(max(fitness_values))
+            max_fitness_idx = int(np.argmax(fitness_values))
             if fitness_values[max_fitness_idx] > self.ga.best_fitness:
-                self.ga.best_fitness = fitness_values[max_fitness_idx]
+                self.ga.best_fitness = int(fitness_values[max_fitness_idx])
                 self.ga.best_solution = self.ga.population[max_fitness_idx].copy()
             
             # Record best fitness for convergence check
@@ -149,22 +178,28 @@ class HybridAlgorithm:
                 elite_solution = self.ga.population[sorted_indices[i]].copy()
                 
                 # Apply SA to some elite solutions
-                if random.random() < self.hybrid_params.get('local_search_probability', 0.3):
+                if self.ga.random.random() < self.hybrid_params.get('local_search_probability', 0.3):
                     elite_solution = self._apply_sa_to_solution(elite_solution)
                 
                 new_population.append(elite_solution)
             
             # Generate new solutions through selection, crossover, and mutation
-            while len(new_population) < self.ga_params['population_size']:
-                parent1, parent2 = self.ga._selection()
-                child = self.ga._crossover(parent1, parent2)
+            parents = self.ga._select_parents(fitness_values, max(0, self.ga_params['population_size'] - len(new_population)))
+            children = []
+            for parent1, parent2 in parents:
+                child = self.ga._crossover(self.ga.population[parent1], self.ga.population[parent2])
                 child = self.ga._mutation(child)
+                if self.ga.repairer is not None:
+                    child = self.ga._repair(child)
                 
                 # Apply SA to some children
-                if random.random() < self.hybrid_params.get('local_search_probability', 0.3):
+                if self.ga.random.random() < self.hybrid_params.get('local_search_probability', 0.3):
                     child = self._apply_sa_to_solution(child)
                 
-                new_population.append(child)
+                children.append(child)
+            
+            # Clones of elites or of earlier children are handled by the GA's duplicate policy
+            new_population.extend(self.ga._deduplicate_timetables(children, new_population))
             
             self.ga.population = new_population
             
@@ -181,9 +216,89 @@ class HybridAlgorithm:
                 break
         
         pbar.close()
+        self.ga.close()
         
         # Apply final SA refinement to the best solution
         print("Applying final refinement with Simulated Annealing...")
         final_solution = self._apply_sa_to_solution(self.ga.best_solution)
+        self._record_run()
+        
+        return final_solution
+    
+    def _local_search(self, assignment: np.ndarray) -> None:
+        """Refine an encoded timetable with SA with probability local_search_probability."""
+        if self.ga.random.random() < self.hybrid_params.get('local_search_probability', 0.3):
+            self._apply_sa_to_assignment(assignment)
+    
+    def _evolve_generation_array(self) -> None:
+        """One GA generation on the array representation, with SA applied to some elites and children."""
+        ga = self.ga
+        if ga.replacement != 'generational':
+            # Steady state: SA refines some children before they are scored and inserted
+            ga._evolve_steady_state(refine=self._local_search)
+            self.best_fitness_history.append(ga.best_fitness)
+            return
+        
+        # Evaluate population and update best solution
+        ga._record_diversity(ga.population)
+        fitness_values = ga._evaluate_population(ga.population)
+        ga._update_best_array(fitness_values)
+        
+        # Record best fitness for convergence check
+        self.best_fitness_history.append(ga.best_fitness)
+        
+        # Elitism, selection, crossover and mutation into the offspring buffer, then SA on some
+        # of the elites and children
+        ga._breed_array(fitness_values)
+        for individual in ga._offspring:
+            self._local_search(individual)
+        
+        ga._swap_buffers()
+    
+    def _run_islands(self) -> Dict[str, Any]:
+        """Run GA + SA on `islands` sub-populations in separate processes, then refine the global best."""
+        islands = IslandModel(self.data, self.ga_params, self.model, solver='hybrid',
+                              hybrid_params=dict(self.params, sa_params=self.sa_params,
+                                                 hybrid_params=self.hybrid_params))
+        self.ga.best_fitness, self.ga.best_assignment = islands.run()
+        self.best_fitness_history = islands.best_fitness_history
+        
+        # Apply final SA refinement to the best solution
+        print("Applying final refinement with Simulated Annealing...")
+        self.ga.best_solution = self.model.decode(self.ga.best_assignment)
+        final_solution = self._apply_sa_to_solution(self.ga.best_solution)
+        self._record_run()
+        return final_solution
+    
+    def _run_array(self) -> Dict[str, Any]:
+        """Run the hybrid algorithm on the GA's array representation."""
+        ga = self.ga
+        
+        # Create progress bar
+        pbar = tqdm(total=self.ga_params['generations'], desc="Running Hybrid Algorithm")
+        
+        for generation in range(self.ga_params['generations']):
+            self._evolve_generation_array()
+            
+            # Update progress bar
+            pbar.update(1)
+            
+            # Print progress periodically
+            if generation % 100 == 0 or generation == self.ga_params['generations'] - 1:
+                pbar.set_description(f"Generation {generation}: Best Fitness = {ga.best_fitness}")
+            
+            # Check for convergence
+            if self._check_convergence():
+                print(f"Algorithm converged after {generation} generations")
+                break
+        
+        pbar.close()
+        ga.close()
+        
+        # Apply final SA refinement to the best solution
+        print("Applying final refinement with Simulated Annealing...")
+        ga.best_solution = self.model.decode(ga.best_assignment)
+        final_solution = self._apply_sa_to_solution(ga.best_solution)
+        self._record_run()
         
         return final_solution
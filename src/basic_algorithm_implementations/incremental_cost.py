@@ -0,0 +1,309 @@
+"""
+Incremental simulated-annealing cost.
+
+IncrementalCost holds one encoded timetable together with everything its SA
+cost depends on: Occupancy tables for teacher, room and student clashes,
+the number of unavailable slots in use and, for every mentor, how many of
+the mentor's courses each student attends. Moving a course touches only its
+old and new teacher, room and slot, its conflict-graph neighbours and its
+students, so the cost of a move is known without rescoring the timetable.
+A Move remembers the placement it replaced, so a rejected move is undone in
+the same time it took to apply.
+
+The soft constraints are kept up to date the same way. Back-to-back sessions
+use each teacher's sorted slot ranks per day: a session added or removed only
+changes the adjacency with its two neighbours in that order. Teaching-load
+spread comes from running sums of the teachers' weekly hours and squared hours,
+and preference misses are a per-(teacher, slot) lookup like unavailability.
+
+Optionally it also tracks which courses are in a hard violation, for
+conflict-focused moves: a move re-checks only the courses booked on the same
+teacher or room at overlapping times and the conflict-graph neighbours
+scheduled at overlapping times.
+"""
+
+import bisect
+import math
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+import numpy as np
+from .problem_model import ProblemModel, TEACHER, SLOT, UNASSIGNED
+from .occupancy import Occupancy
+
+# Students each mentor should have
+MENTOR_GROUP_SIZE = 4
+
+HARD_WEIGHT = 100
+BACK_TO_BACK_WEIGHT = 50
+EQUITABLE_LOAD_WEIGHT = 40
+PREFERENCE_WEIGHT = 10
+
+# Past this fraction of changed courses, rebind() reloads instead of moving courses one by one
+# (one move costs roughly a tenth of a reload, less with conflict tracking)
+REBIND_MOVE_FRACTION = 0.1
+
+
+def load_spread(n_teachers: int, total: int, total_squares: int) -> int:
+    """
+    int(10 * standard deviation) of the teachers' weekly hours, from the sum and sum of
+    squares of the integer loads, computed exactly: n^2 * variance = n * sum(l^2) - sum(l)^2.
+    """
+    if n_teachers == 0:
+        return 0
+    return math.isqrt(100 * (n_teachers * total_squares - total * total)) // n_teachers
+
+
+class Move:
+    """New (teacher, room, slot) for one course; apply() records the old placement for undo()."""
+
+    __slots__ = ('course_idx', 'placement', 'previous')
+
+    def __init__(self, course_idx: int, teacher_idx: int, room_idx: int, slot_idx: int):
+        self.course_idx = course_idx
+        self.placement = (teacher_idx, room_idx, slot_idx)
+        self.previous = None
+
+
+class IncrementalCost:
+    """
+    SA cost of an encoded (n_courses, 3) timetable, updated as courses move.
+
+    cost = 100 * (teacher + room + student clashes + unavailable slots
+                  + sum over mentors of |distinct students - 4|)
+           + 50 * back-to-back sessions + 40 * equitable load
+    """
+
+    def __init__(self, model: ProblemModel, assignment: np.ndarray, track_conflicts: bool = False):
+        self.model = model
+        self._forbidden = model.availability.forbidden_matrix
+        self._preference_misses = model.availability.preference_misses
+        self._mentor_row = np.full(model.n_teachers, -1, dtype=np.int64)
+        self._mentor_row[model.mentor_indices] = np.arange(len(model.mentor_indices))
+        self._hours = model.course_hours.tolist()
+
+        # Slot order within each day, and the slot at every rank of a day
+        index = model.timeslot_index
+        self._day = index.day.tolist()
+        self._rank = index.rank.tolist()
+        self._adjacent = index.adjacent.tolist()
+        self._n_days = max(self._day) + 1 if self._day else 0
+        self._slot_at_rank: List[List[int]] = [[] for _ in range(self._n_days)]
+        for slot_idx in np.lexsort((index.rank, index.day)).tolist():
+            self._slot_at_rank[self._day[slot_idx]].append(slot_idx)
+
+        self.track_conflicts = track_conflicts
+        if track_conflicts:
+            self._overlaps = index.overlaps
+            self._overlap_lists = index.overlap_lists
+        self._load(assignment)
+
+    def _load(self, assignment: np.ndarray) -> None:
+        """Build every table that depends on the timetable in one pass over `assignment`."""
+        model = self.model
+        self.occupancy = Occupancy.from_assignment(model, assignment)
+        placed = self.occupancy.assignment
+        assigned = np.flatnonzero(placed[:, TEACHER] != UNASSIGNED)
+        self.unavailable = int(self._forbidden[placed[assigned, TEACHER], placed[assigned, SLOT]].sum())
+        self.preference_misses = int(self._preference_misses[placed[assigned, TEACHER], placed[assigned, SLOT]].sum())
+
+        # Per mentor, how many of its courses each student attends
+        self._attendance = np.zeros((len(model.mentor_indices), model.n_students), dtype=np.int32)
+        for course_idx in assigned.tolist():
+            row = self._mentor_row[placed[course_idx, TEACHER]]
+            if row >= 0:
+                self._attendance[row, model.students_of_course(course_idx)] += 1
+        self._mentor_students = (self._attendance > 0).sum(axis=1).astype(np.int64)
+        self.mentor_deviation = int(np.abs(self._mentor_students - MENTOR_GROUP_SIZE).sum())
+
+        # Each teacher's sessions as sorted slot ranks per day
+        self._day_ranks: List[List[List[int]]] = [[[] for _ in range(self._n_days)] for _ in range(model.n_teachers)]
+        self.back_to_back = 0
+        for course_idx in assigned.tolist():
+            self._session(placed[course_idx, TEACHER], placed[course_idx, SLOT], 1)
+
+        # Weekly hours per teacher and their running sums
+        loads = np.bincount(placed[assigned, TEACHER], weights=model.course_hours[assigned],
+                            minlength=model.n_teachers).astype(np.int64)
+        self._loads = loads.tolist()
+        self._load_total = int(loads.sum())
+        self._load_squares = int((loads * loads).sum())
+
+        # Courses in a hard violation (teacher, room or student clash, unavailable slot), kept as
+        # a list with each course's position so membership changes and random picks are O(1)
+        self.conflicted: List[int] = []
+        self._conflicted_position: Dict[int, int] = {}
+        if self.track_conflicts:
+            self._teacher_bookings: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+            self._room_bookings: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+            for course_idx in assigned.tolist():
+                teacher_idx, room_idx, slot_idx = placed[course_idx].tolist()
+                self._teacher_bookings[teacher_idx, slot_idx].add(course_idx)
+                self._room_bookings[room_idx, slot_idx].add(course_idx)
+            # Neighbours each course clashes with, from both ends of every clashing edge
+            edges = model.conflicts.edges[model.conflicts.clashing_edges(placed[:, SLOT], self._overlaps)]
+            self._student_clashes = np.bincount(edges.reshape(-1), minlength=model.n_courses).astype(np.int64)
+            for course_idx in assigned.tolist():
+                self._set_conflicted(course_idx, self._is_conflicted(course_idx))
+
+    def rebind(self, assignment: np.ndarray) -> None:
+        """
+        Switch to another timetable: move just the courses that differ when they are few,
+        otherwise reload the timetable tables (the per-model tables are kept either way).
+        """
+        changed = np.flatnonzero((self.occupancy.assignment != assignment).any(axis=1))
+        if len(changed) > REBIND_MOVE_FRACTION * self.model.n_courses:
+            self._load(assignment)
+            return
+        for course_idx, (teacher_idx, room_idx, slot_idx) in zip(changed.tolist(), assignment[changed].tolist()):
+            self._remove(course_idx)
+            if teacher_idx != UNASSIGNED:
+                self._place(course_idx, teacher_idx, room_idx, slot_idx)
+
+    @property
+    def equitable_load(self) -> int:
+        return load_spread(self.model.n_teachers, self._load_total, self._load_squares)
+
+    @property
+    def assignment(self) -> np.ndarray:
+        """The current encoded timetable (owned by the occupancy tables; do not modify)."""
+        return self.occupancy.assignment
+
+    @property
+    def cost(self) -> int:
+        occupancy = self.occupancy
+        hard = (occupancy.teacher_conflicts + occupancy.room_conflicts + occupancy.student_conflicts +
+                self.unavailable + self.mentor_deviation)
+        return int(HARD_WEIGHT * hard + BACK_TO_BACK_WEIGHT * self.back_to_back + EQUITABLE_LOAD_WEIGHT * self.equitable_load +
+                   PREFERENCE_WEIGHT * self.preference_misses)
+
+    def _is_conflicted(self, course_idx: int) -> bool:
+        """Whether a course is involved in a hard violation, as in FitnessEvaluator.conflicted_courses."""
+        teacher_idx, room_idx, slot_idx = self.occupancy.assignment[course_idx].tolist()
+        if teacher_idx == UNASSIGNED:
+            return False
+        occupancy = self.occupancy
+        return bool(occupancy.teacher_blocked[teacher_idx, slot_idx] > 1 or occupancy.room_blocked[room_idx, slot_idx] > 1
+                    or self._forbidden[teacher_idx, slot_idx] or self._student_clashes[course_idx] > 0)
+
+    def _set_conflicted(self, course_idx: int, conflicted: bool) -> None:
+        position = self._conflicted_position.get(course_idx)
+        if conflicted and position is None:
+            self._conflicted_position[course_idx] = len(self.conflicted)
+            self.conflicted.append(course_idx)
+        elif not conflicted and position is not None:
+            last = self.conflicted.pop()
+            if last != course_idx:
+                self.conflicted[position] = last
+                self._conflicted_position[last] = position
+            del self._conflicted_position[course_idx]
+
+    def _refresh_conflicts(self, course_idx: int, teacher_idx: int, room_idx: int, slot_idx: int, step: int) -> None:
+        """
+        After a course was placed in (step=1) or removed from (step=-1) (teacher, room, slot),
+        update student clash counts and re-check the courses whose violations may have changed.
+        """
+        neighbors, _ = self.model.conflicts.neighbors_of(course_idx)
+        neighbor_slots = self.occupancy.assignment[neighbors, SLOT]
+        clashing = neighbors[(neighbor_slots >= 0) & self._overlaps[slot_idx, neighbor_slots]]
+        self._student_clashes[clashing] += step
+        self._student_clashes[course_idx] = len(clashing) if step > 0 else 0
+
+        affected = set(clashing.tolist())
+        affected.add(course_idx)
+        for overlapping in self._overlap_lists[slot_idx].tolist():
+            affected.update(self._teacher_bookings.get((teacher_idx, overlapping), ()))
+            affected.update(self._room_bookings.get((room_idx, overlapping), ()))
+        for affected_idx in affected:
+            self._set_conflicted(affected_idx, self._is_conflicted(affected_idx))
+
+    def _mentor_attendance(self, course_idx: int, teacher_idx: int, step: int) -> None:
+        """Add (step=1) or remove (step=-1) a course's students from its teacher's mentor group."""
+        row = self._mentor_row[teacher_idx]
+        if row < 0:
+            return
+        students = self.model.students_of_course(course_idx)
+        if not len(students):
+            return
+        attendance = self._attendance[row]
+        before = self._mentor_students[row]
+        attendance[students] += step
+        # Students whose count crossed zero join or leave the group
+        changed = int((attendance[students] == (1 if step > 0 else 0)).sum())
+        after = before + changed if step > 0 else before - changed
+        self._mentor_students[row] = after
+        self.mentor_deviation += int(abs(after - MENTOR_GROUP_SIZE) - abs(before - MENTOR_GROUP_SIZE))
+
+    def _session(self, teacher_idx: int, slot_idx: int, step: int) -> None:
+        """Add (step=1) or remove (step=-1) one session of a teacher, updating back-to-back pairs."""
+        day = self._day[slot_idx]
+        ranks = self._day_ranks[teacher_idx][day]
+        rank = self._rank[slot_idx]
+        position = bisect.bisect_left(ranks, rank)
+        after = position if step > 0 else position + 1
+
+        # The session sits between its day-order neighbours, which stop being consecutive
+        slots = self._slot_at_rank[day]
+        previous_slot = slots[ranks[position - 1]] if position > 0 else None
+        next_slot = slots[ranks[after]] if after < len(ranks) else None
+        change = 0
+        if previous_slot is not None:
+            change += self._adjacent[previous_slot][slot_idx]
+        if next_slot is not None:
+            change += self._adjacent[slot_idx][next_slot]
+            if previous_slot is not None:
+                change -= self._adjacent[previous_slot][next_slot]
+
+        if step > 0:
+            ranks.insert(position, rank)
+        else:
+            del ranks[position]
+        self.back_to_back += step * change
+
+    def _teaching_hours(self, course_idx: int, teacher_idx: int, step: int) -> None:
+        """Add or remove a course's weekly hours from its teacher's load."""
+        load = self._loads[teacher_idx]
+        hours = step * self._hours[course_idx]
+        self._loads[teacher_idx] = load + hours
+        self._load_total += hours
+        self._load_squares += (load + hours) ** 2 - load ** 2
+
+    def _place(self, course_idx: int, teacher_idx: int, room_idx: int, slot_idx: int) -> None:
+        self.occupancy.assign(course_idx, teacher_idx, room_idx, slot_idx)
+        self.unavailable += int(self._forbidden[teacher_idx, slot_idx])
+        self.preference_misses += int(self._preference_misses[teacher_idx, slot_idx])
+        self._mentor_attendance(course_idx, teacher_idx, 1)
+        self._session(teacher_idx, slot_idx, 1)
+        self._teaching_hours(course_idx, teacher_idx, 1)
+        if self.track_conflicts:
+            self._teacher_bookings[teacher_idx, slot_idx].add(course_idx)
+            self._room_bookings[room_idx, slot_idx].add(course_idx)
+            self._refresh_conflicts(course_idx, teacher_idx, room_idx, slot_idx, 1)
+
+    def _remove(self, course_idx: int) -> None:
+        teacher_idx, room_idx, slot_idx = self.occupancy.assignment[course_idx].tolist()
+        if teacher_idx == UNASSIGNED:
+            return
+        self.occupancy.unassign(course_idx)
+        self.unavailable -= int(self._forbidden[teacher_idx, slot_idx])
+        self.preference_misses -= int(self._preference_misses[teacher_idx, slot_idx])
+        self._mentor_attendance(course_idx, teacher_idx, -1)
+        self._session(teacher_idx, slot_idx, -1)
+        self._teaching_hours(course_idx, teacher_idx, -1)
+        if self.track_conflicts:
+            self._teacher_bookings[teacher_idx, slot_idx].discard(course_idx)
+            self._room_bookings[room_idx, slot_idx].discard(course_idx)
+            self._refresh_conflicts(course_idx, teacher_idx, room_idx, slot_idx, -1)
+
+    def apply(self, move: Move) -> int:
+        """Make the move and return the change in cost."""
+        before = self.cost
+        move.previous = tuple(self.occupancy.assignment[move.course_idx].tolist())
+        self._remove(move.course_idx)
+        self._place(move.course_idx, *move.placement)
+        return self.cost - before
+
+    def undo(self, move: Move) -> None:
+        """Put the course back where it was before apply(move)."""
+        self._remove(move.course_idx)
+        if move.previous[TEACHER] != UNASSIGNED:
+            self._place(move.course_idx, *move.previous)
@@ -0,0 +1,170 @@
+"""
+Island-model GA across worker processes.
+
+The population is split into N islands, each evolved by its own process on
+the array representation. Every `migration_interval` generations each
+island sends copies of its top `migration_size` individuals to its
+neighbours: the next island in a ring, or every other island when fully
+connected. Immigrants replace the worst individuals of the receiving island.
+The parent process tracks the global best.
+"""
+
+from multiprocessing import Pipe, Process
+from typing import Dict, Any, List, Tuple
+import numpy as np
+from .problem_model import ProblemModel
+from .termination import TerminationCriteria
+
+
+def migration_sources(n_islands: int, topology: str) -> List[List[int]]:
+    """For every island, the islands it receives migrants from."""
+    if topology == 'ring':
+        return [[(i - 1) % n_islands] for i in range(n_islands)]
+    if topology == 'fully_connected':
+        return [[j for j in range(n_islands) if j != i] for i in range(n_islands)]
+    raise ValueError(f"Unknown island topology: {topology}")
+
+
+def _top_individuals(ga, count: int) -> np.ndarray:
+    """Copies of the `count` fittest individuals of a GA's population."""
+    fitness_values = ga._evaluate_population(ga.population)
+    return ga.population[np.argsort(fitness_values)[::-1][:count]].copy()
+
+
+def _replace_worst(ga, immigrants: np.ndarray) -> None:
+    """Overwrite the worst individuals (never the elites) with immigrants."""
+    count = min(len(immigrants), len(ga.population) - ga.params['elitism_count'])
+    if count <= 0:
+        return
+    fitness_values = ga._evaluate_population(ga.population)
+    ga.population[np.argsort(fitness_values)[:count]] = immigrants[:count]
+    ga._fitness = None  # re-index a steady-state population on its next step
+
+
+def _island_worker(conn, data: Dict[str, Any], params: Dict[str, Any],
+                   model: ProblemModel, solver: str) -> None:
+    """
+    Evolve one island on request. Each message is (generations, immigrants) and is
+    answered with (best_fitness, best_assignment, emigrants); None stops the worker.
+    """
+    if solver == 'hybrid':
+        from .hybrid_algorithm import HybridAlgorithm
+        hybrid = HybridAlgorithm(data, params['hybrid'], model=model)
+        ga = hybrid.ga
+        step = hybrid._evolve_generation_array
+    else:
+        from .genetic_algorithms import GeneticAlgorithm
+        ga = GeneticAlgorithm(data, params['ga'], model=model)
+        step = ga._evolve_generation_array
+    migration_size = params['migration_size']
+
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        generations, immigrants = message
+        if immigrants is not None and len(immigrants):
+            _replace_worst(ga, immigrants)
+        for _ in range(generations):
+            step()
+        conn.send((ga.best_fitness, ga.best_assignment, _top_individuals(ga, migration_size)))
+
+    ga.close()
+    conn.close()
+
+
+class IslandModel:
+    """
+    Runs a GA (or the hybrid GA + SA) as `islands` sub-populations in separate processes.
+
+    Island settings are read from the GA params:
+        islands: number of islands/processes
+        migration_interval: generations between migrations (default 10)
+        migration_size: top-k individuals each island sends (default 2)
+        topology: 'ring' (default) or 'fully_connected'
+    `population_size` is the total, split evenly across islands. time_budget, target_fitness
+    and max_stall_generations are checked on the global best at every migration.
+    """
+
+    def __init__(self, data: Dict[str, Any], ga_params: Dict[str, Any], model: ProblemModel,
+                 solver: str = 'ga', hybrid_params: Dict[str, Any] = None):
+        self.data = data
+        self.model = model
+        self.solver = solver
+        self.n_islands = ga_params['islands']
+        self.generations = ga_params['generations']
+        self.migration_interval = max(1, ga_params.get('migration_interval', 10))
+        self.migration_size = ga_params.get('migration_size', 2)
+        self.sources = migration_sources(self.n_islands, ga_params.get('topology', 'ring'))
+
+        self.seed = ga_params.get('seed')
+        self.hybrid_params = hybrid_params or {}
+
+        # Each island is an ordinary single-process, array-representation GA
+        island_size = max(ga_params['elitism_count'] + 2, ga_params['population_size'] // self.n_islands)
+        self.island_ga_params = dict(ga_params, population_size=island_size, representation='array',
+                                     islands=1, workers=1)
+
+        self.best_fitness = float('-inf')
+        self.best_assignment = None
+        self.best_fitness_history: List[float] = []
+        self.termination = TerminationCriteria(ga_params)
+
+    def _island_params(self, island_id: int) -> Dict[str, Any]:
+        """Worker parameters, with a distinct seed per island when a seed is set."""
+        seed = None if self.seed is None else self.seed + island_id
+        ga_params = dict(self.island_ga_params, seed=seed)
+        params = {'ga': ga_params, 'migration_size': self.migration_size}
+        if self.solver == 'hybrid':
+            params['hybrid'] = dict(self.hybrid_params, ga_params=ga_params)
+        return params
+
+    def _route(self, emigrants: List[np.ndarray]) -> List[np.ndarray]:
+        """Immigrants for each island according to the topology."""
+        return [np.concatenate([emigrants[j] for j in sources]) for sources in self.sources]
+
+    def run(self) -> Tuple[float, np.ndarray]:
+        """Evolve all islands for `generations` and return (best_fitness, best_assignment)."""
+        self.termination.start()
+        connections, processes = [], []
+        for island_id in range(self.n_islands):
+            parent_conn, child_conn = Pipe()
+            process = Process(target=_island_worker, daemon=True,
+                              args=(child_conn, self.data, self._island_params(island_id), self.model, self.solver))
+            process.start()
+            child_conn.close()
+            connections.append(parent_conn)
+            processes.append(process)
+
+        try:
+            immigrants = [None] * self.n_islands
+            remaining = self.generations
+            while remaining > 0:
+                generations = min(self.migration_interval, remaining)
+                for conn, incoming in zip(connections, immigrants):
+                    conn.send((generations, incoming))
+                results = [conn.recv() for conn in connections]
+                remaining -= generations
+
+                # Update global best solution
+                for fitness, assignment, _ in results:
+                    if fitness > self.best_fitness:
+                        self.best_fitness = fitness
+                        self.best_assignment = assignment.copy()
+                self.best_fitness_history.append(self.best_fitness)
+                print(f"Generation {self.generations - remaining}: Best Fitness = {self.best_fitness}")
+                if self.termination.update(self.generations - remaining, self.best_fitness):
+                    break
+
+                # Migrate top individuals along the topology
+                immigrants = self._route([emigrants for _, _, emigrants in results])
+        finally:
+            for conn in connections:
+                try:
+                    conn.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+            for process in processes:
+                process.join()
+
+        return self.best_fitness, self.best_assignment
@@ -66,6 +66,11 @@ def main():
         # Execute the algorithm
         result = algorithm.run()
         
+        # Why and when the run stopped, for solvers that record it
+        run_stats = getattr(algorithm, 'run_stats', None)
+        if run_stats:
+            logger.info(f"Run summary: {run_stats}")
+        
         # Save the result
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_path = args.output or f"data/output/timetable_{timestamp}.json"
@@ -146,6 +151,9 @@ def main():
             raise ValueError(f"Unsupported algorithm: {args.algorithm}")
 
         result = algorithm.run()
+        run_stats = getattr(algorithm, 'run_stats', None)
+        if run_stats:
+            logger.info(f"Run summary: {run_stats}")
 
         # Step 5: Save the result to a file or print it out
         output_path = args.output or "data/output/timetable_output.json"
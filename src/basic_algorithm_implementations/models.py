@@ -1,6 +1,14 @@
 # src/models.py
+import sys
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from typing import List, Dict, Set, Optional, Any
+from typing import List, Dict, Set, Optional, Any, Tuple, Iterable, Iterator
+import numpy as np
+
+def time_to_minutes(value: str) -> int:
+    """Convert an 'HH:MM' time string to minutes after midnight."""
+    hours, minutes = value.split(':')
+    return int(hours) * 60 + int(minutes)
 
 @dataclass
 class Teacher:
@@ -38,6 +46,7 @@ class Course:
     preferred_rooms: List[str]
     eligible_teachers: List[str]
     student_groups: List[str]
+    required_facilities: List[str] = field(default_factory=list)
 
 @dataclass
 class Room:
@@ -57,6 +66,16 @@ class TimeSlot:
     end_time: str
     type: str
 
+    @staticmethod
+    def _time_to_minutes(value: str) -> int:
+        return time_to_minutes(value)
+
+    def overlaps_with(self, other: 'TimeSlot') -> bool:
+        """Whether two slots share any time on the same day."""
+        return (self.day == other.day and
+                time_to_minutes(self.start_time) < time_to_minutes(other.end_time) and
+                time_to_minutes(other.start_time) < time_to_minutes(self.end_time))
+
 @dataclass
 class StudentGroup:
     id: str
@@ -69,3 +88,198 @@ class Constraint:
     type: str
     description: str
     weight: int
+
+
+# Compact representations for large institutional exports.
+# The classes below are frozen and slotted (no per-instance __dict__), hold
+# tuples of interned ID strings instead of lists, and students/registrations
+# are stored column-wise in StudentTable rather than as one object each.
+
+class _FrozenSlots:
+    """Pickle/copy support for frozen dataclasses that declare __slots__."""
+    __slots__ = ()
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+@dataclass(frozen=True)
+class CompactTeacher(_FrozenSlots):
+    __slots__ = ('id', 'name', 'department', 'specialization', 'max_hours_per_day',
+                 'max_hours_per_week', 'preferences', 'unavailability', 'is_mentor', 'max_mentees')
+    id: str
+    name: str
+    department: str
+    specialization: Tuple[str, ...]
+    max_hours_per_day: int
+    max_hours_per_week: int
+    preferences: Dict[str, List[str]]
+    unavailability: List[Dict[str, Any]]
+    is_mentor: bool
+    max_mentees: int
+
+@dataclass(frozen=True)
+class CompactStudent(_FrozenSlots):
+    __slots__ = ('id', 'name', 'batch', 'semester', 'registered_courses',
+                 'needs_mentor', 'special_requirements')
+    id: str
+    name: str
+    batch: str
+    semester: int
+    registered_courses: Tuple[str, ...]
+    needs_mentor: bool
+    special_requirements: Tuple[str, ...]
+
+@dataclass(frozen=True)
+class CompactCourse(_FrozenSlots):
+    __slots__ = ('id', 'code', 'name', 'credits', 'hours_per_week', 'sessions_per_week',
+                 'session_duration', 'requires_lab', 'preferred_rooms', 'eligible_teachers',
+                 'student_groups', 'required_facilities')
+    id: str
+    code: str
+    name: str
+    credits: int
+    hours_per_week: int
+    sessions_per_week: int
+    session_duration: int
+    requires_lab: bool
+    preferred_rooms: Tuple[str, ...]
+    eligible_teachers: Tuple[str, ...]
+    student_groups: Tuple[str, ...]
+    required_facilities: Tuple[str, ...]
+
+@dataclass(frozen=True)
+class CompactRoom(_FrozenSlots):
+    __slots__ = ('id', 'name', 'type', 'capacity', 'facilities', 'building', 'floor')
+    id: str
+    name: str
+    type: str
+    capacity: int
+    facilities: Tuple[str, ...]
+    building: str
+    floor: int
+
+@dataclass(frozen=True)
+class CompactTimeSlot(_FrozenSlots):
+    __slots__ = ('id', 'day', 'start_time', 'end_time', 'type')
+    id: str
+    day: str
+    start_time: str
+    end_time: str
+    type: str
+
+    _time_to_minutes = staticmethod(time_to_minutes)
+    overlaps_with = TimeSlot.overlaps_with
+
+@dataclass(frozen=True)
+class CompactStudentGroup(_FrozenSlots):
+    __slots__ = ('id', 'name', 'students', 'courses')
+    id: str
+    name: str
+    students: Tuple[str, ...]
+    courses: Tuple[str, ...]
+
+class RegistrationTable:
+    """
+    Student course registrations as parallel arrays, sorted by student.
+    Row i registers student `student[i]` for course `course_ids[course[i]]`;
+    `indptr` gives each student's row range (CSR layout).
+    """
+    __slots__ = ('student', 'course', 'course_ids', 'indptr')
+
+    def __init__(self, student: np.ndarray, course: np.ndarray, course_ids: List[str], indptr: np.ndarray):
+        self.student = student
+        self.course = course
+        self.course_ids = course_ids
+        self.indptr = indptr
+
+    def __len__(self) -> int:
+        return len(self.student)
+
+    def courses_of(self, student_idx: int) -> Tuple[str, ...]:
+        """Registered course IDs of one student."""
+        codes = self.course[self.indptr[student_idx]:self.indptr[student_idx + 1]]
+        return tuple(self.course_ids[c] for c in codes)
+
+class StudentTable(Mapping):
+    """
+    Column-oriented student storage.
+
+    Behaves as a read-only mapping of student ID to CompactStudent, so code that
+    looks students up by ID keeps working, but the data itself lives in parallel
+    arrays: one entry per student plus a RegistrationTable for the courses.
+    Student objects are only materialised on access.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]]):
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.batch_names: List[str] = []
+        self.special_requirements: Dict[int, Tuple[str, ...]] = {}
+
+        batch_codes = []
+        semesters = []
+        needs_mentor = []
+        reg_student = []
+        reg_course = []
+        course_codes: Dict[str, int] = {}
+        course_ids: List[str] = []
+        batch_index: Dict[str, int] = {}
+
+        for idx, s in enumerate(records):
+            self.ids.append(sys.intern(s['id']))
+            self.names.append(s['name'])
+
+            batch = s['batch']
+            if batch not in batch_index:
+                batch_index[batch] = len(self.batch_names)
+                self.batch_names.append(sys.intern(batch))
+            batch_codes.append(batch_index[batch])
+            semesters.append(s['semester'])
+            needs_mentor.append(s['needs_mentor'])
+
+            for course_id in s['registered_courses']:
+                if course_id not in course_codes:
+                    course_codes[course_id] = len(course_ids)
+                    course_ids.append(sys.intern(course_id))
+                reg_student.append(idx)
+                reg_course.append(course_codes[course_id])
+
+            # Most students have none, so only non-empty entries are stored
+            if s.get('special_requirements'):
+                self.special_requirements[idx] = tuple(s['special_requirements'])
+
+        self.index = {student_id: idx for idx, student_id in enumerate(self.ids)}
+        self.batch = np.array(batch_codes, dtype=np.int32)
+        self.semester = np.array(semesters, dtype=np.int16)
+        self.needs_mentor = np.array(needs_mentor, dtype=bool)
+
+        student = np.array(reg_student, dtype=np.int32)
+        indptr = np.zeros(len(self.ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(student, minlength=len(self.ids)), out=indptr[1:])
+        self.registrations = RegistrationTable(student, np.array(reg_course, dtype=np.int32),
+                                               course_ids, indptr)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids)
+
+    def __contains__(self, student_id) -> bool:
+        return student_id in self.index
+
+    def __getitem__(self, student_id: str) -> CompactStudent:
+        idx = self.index[student_id]
+        return CompactStudent(
+            id=self.ids[idx],
+            name=self.names[idx],
+            batch=self.batch_names[self.batch[idx]],
+            semester=int(self.semester[idx]),
+            registered_courses=self.registrations.courses_of(idx),
+            needs_mentor=bool(self.needs_mentor[idx]),
+            special_requirements=self.special_requirements.get(idx, ())
+        )
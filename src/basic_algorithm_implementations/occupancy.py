@@ -0,0 +1,162 @@
+"""
+Reusable occupancy tables for teachers, rooms and student groups per slot.
+
+Occupancy keeps, for every resource and slot, how many bookings it has and how
+many bookings block it (bookings in that slot or in any slot overlapping it).
+Assigning or unassigning a course touches only its own resources, and a
+feasibility test is a handful of array lookups plus a scan of the course's
+conflict-graph neighbours, independent of how many courses are already placed.
+"""
+
+from typing import Dict
+import numpy as np
+from .problem_model import ProblemModel, TEACHER, ROOM, SLOT, UNASSIGNED
+
+
+class Occupancy:
+    """
+    Incremental teacher/room/group occupancy with running conflict counts.
+
+    Conflict counts follow the solvers' counting: an extra booking of a resource
+    in the same slot is one clash, and so is each pair of its bookings in distinct
+    overlapping slots. Student conflicts count clashing conflict-graph edges;
+    with students=False that count is not kept (it stays 0), which saves a
+    conflict-graph scan per booking. Group tables are kept either way.
+    """
+
+    def __init__(self, model: ProblemModel, students: bool = True):
+        self.model = model
+        self.students = students
+        n_slots = model.n_slots
+        self._overlaps = model.timeslot_index.overlaps
+        # Row s adds one booking to every slot overlapping s; a dense row add beats a fancy-indexed one
+        self._overlap_rows = self._overlaps.astype(np.int32)
+
+        self.teacher_counts = np.zeros((model.n_teachers, n_slots), dtype=np.int32)
+        self.room_counts = np.zeros((model.n_rooms, n_slots), dtype=np.int32)
+        self.group_counts = np.zeros((model.n_groups, n_slots), dtype=np.int32)
+
+        # Bookings in any slot overlapping each slot (non-zero means the slot is taken)
+        self.teacher_blocked = np.zeros((model.n_teachers, n_slots), dtype=np.int32)
+        self.room_blocked = np.zeros((model.n_rooms, n_slots), dtype=np.int32)
+        self.group_blocked = np.zeros((model.n_groups, n_slots), dtype=np.int32)
+
+        self.assignment = np.full((model.n_courses, 3), UNASSIGNED, dtype=np.int32)
+        self.teacher_conflicts = 0
+        self.room_conflicts = 0
+        self.student_conflicts = 0
+
+    @classmethod
+    def from_assignment(cls, model: ProblemModel, assignment: np.ndarray, students: bool = True) -> 'Occupancy':
+        """Build the tables for an encoded (n_courses, 3) assignment in one vectorized pass."""
+        return cls(model, students).load(assignment)
+
+    def load(self, assignment: np.ndarray) -> 'Occupancy':
+        """Refill the existing tables for another encoded assignment, replacing what they held."""
+        model = self.model
+        assigned = np.flatnonzero(assignment[:, TEACHER] != UNASSIGNED)
+        placed = assignment[assigned]
+        teachers, rooms, slots = placed[:, TEACHER], placed[:, ROOM], placed[:, SLOT]
+        self.assignment.fill(UNASSIGNED)
+        self.assignment[assigned] = placed
+
+        for counts in (self.teacher_counts, self.room_counts, self.group_counts):
+            counts.fill(0)
+        np.add.at(self.teacher_counts, (teachers, slots), 1)
+        np.add.at(self.room_counts, (rooms, slots), 1)
+        group_course = np.repeat(np.arange(model.n_courses), np.diff(model.course_groups_indptr))
+        in_group = assignment[group_course, TEACHER] != UNASSIGNED
+        np.add.at(self.group_counts, (model.course_groups[in_group], assignment[group_course[in_group], SLOT]), 1)
+
+        np.matmul(self.teacher_counts, self._overlap_rows, out=self.teacher_blocked)
+        np.matmul(self.room_counts, self._overlap_rows, out=self.room_blocked)
+        np.matmul(self.group_counts, self._overlap_rows, out=self.group_blocked)
+
+        index = model.timeslot_index
+        self.teacher_conflicts = index.count_clashes(teachers, slots, model.n_teachers)
+        self.room_conflicts = index.count_clashes(rooms, slots, model.n_rooms)
+        self.student_conflicts = (model.conflicts.count_clashes(self.assignment[:, SLOT], self._overlaps)
+                                  if self.students else 0)
+        return self
+
+    @staticmethod
+    def _added_clashes(counts: np.ndarray, blocked: np.ndarray, resource: int, slot: int) -> int:
+        """Clashes a new booking of `resource` in `slot` would create."""
+        same_slot = counts[resource, slot]
+        return int(blocked[resource, slot] - same_slot) + (1 if same_slot else 0)
+
+    def _book(self, counts: np.ndarray, blocked: np.ndarray, resource: int, slot: int, step: int) -> None:
+        counts[resource, slot] += step
+        row = blocked[resource]
+        if step > 0:
+            np.add(row, self._overlap_rows[slot], out=row)
+        else:
+            np.subtract(row, self._overlap_rows[slot], out=row)
+
+    def _student_clashes(self, course_idx: int, slot_idx: int) -> int:
+        return self.model.conflicts.clashes_of(course_idx, slot_idx, self.assignment[:, SLOT], self._overlaps)
+
+    def assign(self, course_idx: int, teacher_idx: int, room_idx: int, slot_idx: int) -> None:
+        """Place a course; it must currently be unassigned."""
+        self.teacher_conflicts += self._added_clashes(self.teacher_counts, self.teacher_blocked, teacher_idx, slot_idx)
+        self.room_conflicts += self._added_clashes(self.room_counts, self.room_blocked, room_idx, slot_idx)
+        if self.students:
+            self.student_conflicts += self._student_clashes(course_idx, slot_idx)
+
+        self._book(self.teacher_counts, self.teacher_blocked, teacher_idx, slot_idx, 1)
+        self._book(self.room_counts, self.room_blocked, room_idx, slot_idx, 1)
+        for group_idx in self.model.groups_of_course(course_idx):
+            self._book(self.group_counts, self.group_blocked, group_idx, slot_idx, 1)
+
+        self.assignment[course_idx] = (teacher_idx, room_idx, slot_idx)
+
+    def unassign(self, course_idx: int) -> None:
+        """Remove a course's booking (no-op if it is not placed)."""
+        teacher_idx, room_idx, slot_idx = self.assignment[course_idx].tolist()
+        if teacher_idx == UNASSIGNED:
+            return
+
+        self.assignment[course_idx] = UNASSIGNED
+        self._book(self.teacher_counts, self.teacher_blocked, teacher_idx, slot_idx, -1)
+        self._book(self.room_counts, self.room_blocked, room_idx, slot_idx, -1)
+        for group_idx in self.model.groups_of_course(course_idx):
+            self._book(self.group_counts, self.group_blocked, group_idx, slot_idx, -1)
+
+        self.teacher_conflicts -= self._added_clashes(self.teacher_counts, self.teacher_blocked, teacher_idx, slot_idx)
+        self.room_conflicts -= self._added_clashes(self.room_counts, self.room_blocked, room_idx, slot_idx)
+        if self.students:
+            self.student_conflicts -= self._student_clashes(course_idx, slot_idx)
+
+    def free_candidates(self, course_idx: int, candidates: np.ndarray, students: bool = True) -> np.ndarray:
+        """
+        Boolean mask of the (teacher, room, slot) rows of `candidates` that are free for a course.
+        With students=False only teacher and room availability is checked.
+        """
+        slots = candidates[:, SLOT]
+        free = (self.teacher_blocked[candidates[:, TEACHER], slots] == 0) & (self.room_blocked[candidates[:, ROOM], slots] == 0)
+        if not students:
+            return free
+        return free & self.student_free_slots(course_idx)[slots]
+
+    def student_free_slots(self, course_idx: int) -> np.ndarray:
+        """Boolean mask of the slots where none of a course's groups or conflict-graph neighbours is booked."""
+        taken = np.zeros(self.model.n_slots, dtype=bool)
+        groups = self.model.groups_of_course(course_idx)
+        if len(groups):
+            taken |= self.group_blocked[groups].any(axis=0)
+
+        neighbors, _ = self.model.conflicts.neighbors_of(course_idx)
+        neighbor_slots = self.assignment[neighbors, SLOT]
+        neighbor_slots = neighbor_slots[neighbor_slots != UNASSIGNED]
+        if len(neighbor_slots):
+            taken |= self._overlaps[neighbor_slots].any(axis=0)
+        return ~taken
+
+    @property
+    def conflict_counts(self) -> Dict[str, int]:
+        """Current clash totals by kind."""
+        return {
+            'teacher_overlap': self.teacher_conflicts,
+            'room_overlap': self.room_conflicts,
+            'student_group_overlap': self.student_conflicts
+        }
@@ -0,0 +1,135 @@
+"""
+Parallel population evaluation on a persistent process pool.
+
+The ProblemModel is sent to every worker exactly once, through the pool
+initializer. By default each batch is written once into a shared-memory
+population block; workers read their slice of it and write the scores into a
+shared fitness vector, so only slice bounds cross the process boundary.
+Without shared memory, compact int32 chunks are pickled to the workers and
+fitness vectors come back. With one worker, or when a pool cannot be
+started, evaluation runs in-process.
+"""
+
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Tuple
+import numpy as np
+from .problem_model import ProblemModel
+from .fitness import FitnessEvaluator
+from .shared_buffers import SharedPopulationBuffer, attach
+
+# Per-process evaluator, built by the pool initializer
+_worker_evaluator = None
+
+
+def _init_worker(model: ProblemModel) -> None:
+    global _worker_evaluator
+    _worker_evaluator = FitnessEvaluator(model)
+
+
+def _evaluate_chunk(population: np.ndarray) -> np.ndarray:
+    return _worker_evaluator.evaluate(population)
+
+
+def _evaluate_slice(task: Tuple[Tuple[str, str], int, int, int]) -> None:
+    """Score rows [start, stop) of the shared population block into the shared fitness vector."""
+    names, n_courses, start, stop = task
+    population, fitness = attach(names, n_courses, stop)
+    fitness[start:stop] = _worker_evaluator.evaluate(population[start:stop])
+
+
+class ParallelEvaluator:
+    """
+    Drop-in replacement for FitnessEvaluator that spreads batches over worker processes.
+
+    Args:
+        model: problem model, pickled once per worker
+        workers: number of worker processes (None = all CPUs, <= 1 = serial)
+        chunk_size: individuals per task; batches no larger than this are evaluated in-process
+        shared_memory: pass batches through shared-memory segments instead of pickling them
+    """
+
+    def __init__(self, model: ProblemModel, workers: int = None, chunk_size: int = 32,
+                 shared_memory: bool = True):
+        self.model = model
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.chunk_size = max(1, chunk_size)
+        self.shared_memory = shared_memory
+        self._serial = FitnessEvaluator(model)
+        self._pool = None
+        self._buffer = None
+
+    @property
+    def parallel(self) -> bool:
+        return self.workers > 1
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self.model,))
+        return self._pool
+
+    def _get_buffer(self, size: int) -> SharedPopulationBuffer:
+        """Shared buffer holding at least `size` individuals, replaced by a larger one when needed."""
+        if self._buffer is None or self._buffer.capacity < size:
+            self._close_buffer()
+            self._buffer = SharedPopulationBuffer(size, self.model.n_courses)
+        return self._buffer
+
+    def _close_buffer(self) -> None:
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+
+    def _evaluate_shared(self, population: np.ndarray) -> np.ndarray:
+        """Copy the batch into shared memory once and let the workers score it in place."""
+        size = len(population)
+        buffer = self._get_buffer(size)
+        buffer.population[:size] = population
+        tasks = [(buffer.names, self.model.n_courses, start, min(start + self.chunk_size, size))
+                 for start in range(0, size, self.chunk_size)]
+        for _ in self._get_pool().map(_evaluate_slice, tasks):
+            pass
+        return buffer.fitness[:size].copy()
+
+    def _fall_back(self, error: Exception) -> None:
+        warnings.warn(f"Parallel evaluation unavailable ({error}); evaluating serially")
+        self.close()
+        self.workers = 1
+
+    def evaluate(self, population: np.ndarray) -> np.ndarray:
+        """Fitness of every individual in a (population, n_courses, 3) array."""
+        if not self.parallel or len(population) <= self.chunk_size:
+            return self._serial.evaluate(population)
+
+        try:
+            if self.shared_memory:
+                return self._evaluate_shared(population)
+            chunks = [population[i:i + self.chunk_size] for i in range(0, len(population), self.chunk_size)]
+            return np.concatenate(list(self._get_pool().map(_evaluate_chunk, chunks)))
+        except (OSError, BrokenProcessPool, NotImplementedError) as error:
+            self._fall_back(error)
+            return self._serial.evaluate(population)
+        except BaseException:
+            # Never leave shared segments or workers behind, e.g. on KeyboardInterrupt
+            self.close()
+            raise
+
+    def conflicted_courses(self, population: np.ndarray, students: bool = True) -> np.ndarray:
+        """Per-course hard-violation mask, computed in-process."""
+        return self._serial.conflicted_courses(population, students)
+
+    def close(self) -> None:
+        """Shut the worker pool down and free shared memory; both are recreated on the next parallel evaluation."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self._close_buffer()
+
+    def __enter__(self) -> 'ParallelEvaluator':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
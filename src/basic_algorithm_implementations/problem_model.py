@@ -0,0 +1,225 @@
+"""
+Compiled, integer-indexed view of the timetable problem.
+
+The solvers receive string-keyed dicts from utils.parse_data. ProblemModel is
+built from that data once and maps every teacher, room, time slot, course and
+student group ID to a dense integer, so the hot loops can work on NumPy arrays
+and CSR adjacency lists instead of repeated dict lookups.
+"""
+
+from typing import Dict, Any, List, Tuple, Iterable
+import numpy as np
+from .time_slot_index import TimeSlotIndex
+from .teacher_availability import TeacherAvailability
+from .course_domains import CourseDomains
+from .conflict_graph import CourseConflictGraph
+
+# Columns of an encoded assignment array of shape (n_courses, 3)
+TEACHER, ROOM, SLOT = 0, 1, 2
+
+# Marker for a course that has no assignment in an encoded timetable
+UNASSIGNED = -1
+
+
+def _build_index(ids: Iterable[str]) -> Dict[str, int]:
+    """Map each ID to its position."""
+    return {item_id: idx for idx, item_id in enumerate(ids)}
+
+
+def _register(ids: List[str], index: Dict[str, int], item_id: str) -> int:
+    """Return the index of an ID, appending it if it is only referenced."""
+    if item_id not in index:
+        index[item_id] = len(ids)
+        ids.append(item_id)
+    return index[item_id]
+
+
+def _csr(rows: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack a list of integer lists into CSR (indptr, indices) arrays."""
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    for i, row in enumerate(rows):
+        indptr[i + 1] = indptr[i] + len(row)
+    indices = np.fromiter((x for row in rows for x in row), dtype=np.int32, count=int(indptr[-1]))
+    return indptr, indices
+
+
+class ProblemModel:
+    """
+    Integer-indexed problem data shared by all solvers.
+
+    IDs defined in the input come first in each index. IDs that are only
+    referenced (e.g. a preferred room missing from the room list) are appended
+    after them, so every timetable the solvers produce today still round-trips
+    through encode/decode.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+
+        teachers = data['teachers']
+        courses = data['courses']
+        rooms = data['rooms']
+        time_slots = data['time_slots']
+        student_groups = data['student_groups']
+        students = data.get('students', {})
+
+        # Dense ID <-> index maps
+        self.teacher_ids = list(teachers.keys())
+        self.room_ids = list(rooms.keys())
+        self.slot_ids = list(time_slots.keys())
+        self.course_ids = list(courses.keys())
+        self.group_ids = list(student_groups.keys())
+        self.student_ids = list(students.keys())
+
+        self.teacher_index = _build_index(self.teacher_ids)
+        self.room_index = _build_index(self.room_ids)
+        self.slot_index = _build_index(self.slot_ids)
+        self.course_index = _build_index(self.course_ids)
+        self.group_index = _build_index(self.group_ids)
+        self.student_index = _build_index(self.student_ids)
+
+        self.n_defined_teachers = len(self.teacher_ids)
+        self.n_defined_rooms = len(self.room_ids)
+
+        # Course adjacency lists (references to unknown teachers/rooms are registered)
+        course_teachers = []
+        course_rooms = []
+        course_groups = []
+        for course in courses.values():
+            course_teachers.append([_register(self.teacher_ids, self.teacher_index, t)
+                                    for t in course.eligible_teachers])
+            course_rooms.append([_register(self.room_ids, self.room_index, r)
+                                 for r in course.preferred_rooms])
+            course_groups.append([self.group_index[g] for g in course.student_groups
+                                  if g in self.group_index])
+
+        self.course_teachers_indptr, self.course_teachers = _csr(course_teachers)
+        self.course_rooms_indptr, self.course_rooms = _csr(course_rooms)
+        self.course_groups_indptr, self.course_groups = _csr(course_groups)
+
+        # Student group adjacency lists
+        group_students = []
+        group_courses = []
+        for group in student_groups.values():
+            group_students.append([_register(self.student_ids, self.student_index, s)
+                                   for s in group.students])
+            group_courses.append([self.course_index[c] for c in group.courses
+                                  if c in self.course_index])
+
+        self.group_students_indptr, self.group_students = _csr(group_students)
+        self.group_courses_indptr, self.group_courses = _csr(group_courses)
+
+        self.n_teachers = len(self.teacher_ids)
+        self.n_rooms = len(self.room_ids)
+        self.n_slots = len(self.slot_ids)
+        self.n_courses = len(self.course_ids)
+        self.n_groups = len(self.group_ids)
+        self.n_students = len(self.student_ids)
+
+        # Minutes, overlap/back-to-back matrices and per-day ordering of the slots
+        self.timeslot_index = TimeSlotIndex(time_slots, self.slot_ids)
+
+        # Unavailability and preferences as per-teacher slot bitmasks. Slot choices
+        # are drawn from the available slots; a fully unavailable teacher keeps all of them.
+        self.availability = TeacherAvailability(teachers, self.teacher_ids, self.timeslot_index)
+        self.teacher_slots = []
+        for t in range(self.n_teachers):
+            allowed = self.availability.allowed_slots(t)
+            self.teacher_slots.append(allowed if len(allowed) else np.arange(self.n_slots, dtype=np.int32))
+        self.teacher_slot_ids = [[self.slot_ids[s] for s in slots] for slots in self.teacher_slots]
+
+        # Teacher attributes
+        self.teacher_is_mentor = np.zeros(self.n_teachers, dtype=bool)
+        for idx, teacher in enumerate(teachers.values()):
+            self.teacher_is_mentor[idx] = teacher.is_mentor
+        self.mentor_indices = np.flatnonzero(self.teacher_is_mentor).astype(np.int32)
+
+        # Room attributes (-1 capacity for rooms that are referenced but not defined)
+        self.room_capacity = np.full(self.n_rooms, -1, dtype=np.int32)
+        self.room_is_lab = np.zeros(self.n_rooms, dtype=bool)
+        self.room_facilities = [frozenset()] * self.n_rooms
+        for idx, room in enumerate(rooms.values()):
+            self.room_capacity[idx] = room.capacity
+            self.room_is_lab[idx] = 'lab' in room.type.lower()
+            self.room_facilities[idx] = frozenset(room.facilities)
+
+        # Course attributes
+        self.course_hours = np.zeros(self.n_courses, dtype=np.int32)
+        self.course_requires_lab = np.zeros(self.n_courses, dtype=bool)
+        for idx, course in enumerate(courses.values()):
+            self.course_hours[idx] = course.hours_per_week
+            self.course_requires_lab[idx] = course.requires_lab
+
+        # Group sizes and, per course, the number of students whose group lists it.
+        # The GA mentor term credits a teacher with these students for every course taught.
+        self.group_size = np.diff(self.group_students_indptr).astype(np.int32)
+        self.course_mentor_load = np.zeros(self.n_courses, dtype=np.int64)
+        for g in range(self.n_groups):
+            self.course_mentor_load[np.unique(self.courses_of_group(g))] += self.group_size[g]
+
+        # Distinct students attending each course through its student groups
+        self.course_students_indptr, self.course_students = _csr([
+            np.unique(np.concatenate([self.students_of_group(g) for g in self.groups_of_course(c)]
+                                     or [np.zeros(0, dtype=np.int32)])).tolist()
+            for c in range(self.n_courses)
+        ])
+
+        # Course-course conflicts through shared groups and registered students
+        self.conflicts = CourseConflictGraph(self, students)
+
+        # Pruned teacher/room/slot candidates per course
+        self.domains = CourseDomains(self, courses)
+
+    def eligible_teachers(self, course_idx: int) -> np.ndarray:
+        """Teacher indices eligible to teach a course."""
+        return self.course_teachers[self.course_teachers_indptr[course_idx]:self.course_teachers_indptr[course_idx + 1]]
+
+    def preferred_rooms(self, course_idx: int) -> np.ndarray:
+        """Room indices preferred by a course."""
+        return self.course_rooms[self.course_rooms_indptr[course_idx]:self.course_rooms_indptr[course_idx + 1]]
+
+    def groups_of_course(self, course_idx: int) -> np.ndarray:
+        """Student group indices attending a course."""
+        return self.course_groups[self.course_groups_indptr[course_idx]:self.course_groups_indptr[course_idx + 1]]
+
+    def students_of_group(self, group_idx: int) -> np.ndarray:
+        """Student indices belonging to a group."""
+        return self.group_students[self.group_students_indptr[group_idx]:self.group_students_indptr[group_idx + 1]]
+
+    def courses_of_group(self, group_idx: int) -> np.ndarray:
+        """Course indices listed by a group."""
+        return self.group_courses[self.group_courses_indptr[group_idx]:self.group_courses_indptr[group_idx + 1]]
+
+    def students_of_course(self, course_idx: int) -> np.ndarray:
+        """Distinct student indices attending a course."""
+        return self.course_students[self.course_students_indptr[course_idx]:self.course_students_indptr[course_idx + 1]]
+
+    def available_slot_ids(self, teacher_id: str) -> List[str]:
+        """Slot IDs a teacher can be scheduled in."""
+        return self.teacher_slot_ids[self.teacher_index[teacher_id]]
+
+    def encode(self, timetable: Dict[str, Any]) -> np.ndarray:
+        """
+        Encode a course_id -> assignment dict as an (n_courses, 3) int32 array.
+        Courses missing from the timetable are marked UNASSIGNED.
+        """
+        assignment = np.full((self.n_courses, 3), UNASSIGNED, dtype=np.int32)
+        for course_id, entry in timetable.items():
+            row = assignment[self.course_index[course_id]]
+            row[TEACHER] = self.teacher_index[entry['teacher_id']]
+            row[ROOM] = self.room_index[entry['room_id']]
+            row[SLOT] = self.slot_index[entry['time_slot_id']]
+        return assignment
+
+    def decode(self, assignment: np.ndarray) -> Dict[str, Any]:
+        """Decode an (n_courses, 3) array back into the course_id -> assignment dict format."""
+        timetable = {}
+        for course_idx, (teacher_idx, room_idx, slot_idx) in enumerate(assignment.tolist()):
+            if teacher_idx == UNASSIGNED:
+                continue
+            timetable[self.course_ids[course_idx]] = {
+                'teacher_id': self.teacher_ids[teacher_idx],
+                'room_id': self.room_ids[room_idx],
+                'time_slot_id': self.slot_ids[slot_idx]
+            }
+        return timetable
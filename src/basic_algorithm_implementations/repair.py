@@ -0,0 +1,91 @@
+"""
+Repair operator for encoded timetables.
+
+Every course whose teacher or room is double-booked, or whose teacher is
+unavailable, is taken out of the timetable. The courses are then put back one
+at a time, most constrained first: where they were if that is free by now,
+else at the nearest free (teacher, room, slot) of their domain (same teacher
+and room if possible, then the closest slot in time). Placements that also
+avoid student clashes are preferred. The occupancy tables are filled once
+from the courses that stay put, in a reused buffer, and each feasibility test
+is O(1) plus the course's conflict-graph degree, so the work grows with the
+number of conflicting courses rather than with the size of the timetable.
+"""
+
+import numpy as np
+from .problem_model import ProblemModel, TEACHER, ROOM, SLOT, UNASSIGNED
+from .occupancy import Occupancy
+from .fitness import FitnessEvaluator
+
+
+class RepairOperator:
+    """Moves conflicting courses of encoded (n_courses, 3) timetables to free candidates, in place."""
+
+    def __init__(self, model: ProblemModel, evaluator: FitnessEvaluator = None):
+        self.model = model
+        self.evaluator = evaluator or FitnessEvaluator(model)
+        index = model.timeslot_index
+        day = index.day.astype(np.int64)
+        start = index.start.astype(np.int64)
+        # Minutes between every two slots' days and start times
+        self._time_distance = np.abs(day[:, None] - day[None, :]) * 24 * 60 + np.abs(start[:, None] - start[None, :])
+        # Above any time distance, so one integer key can rank teacher, then room, then time
+        self._time_span = (int(day.max(initial=0)) + 1) * 24 * 60
+        self._forbidden = model.availability.forbidden_matrix
+        # Refilled for every timetable repaired; repair only looks at teacher/room clashes
+        self._occupancy = Occupancy(model, students=False)
+
+    def _nearest(self, candidates: np.ndarray, teacher: int, room: int, slot: int) -> int:
+        """Row of `candidates` closest to the current placement (teacher, then room, then time)."""
+        time_distance = self._time_distance[slot, candidates[:, SLOT]]
+        key = ((candidates[:, TEACHER] != teacher) * 2 + (candidates[:, ROOM] != room)) * self._time_span + time_distance
+        return int(np.argmin(key))
+
+    def repair(self, assignment: np.ndarray, conflicted: np.ndarray = None) -> int:
+        """
+        Repair one timetable in place and return the number of courses moved.
+        `conflicted` is its per-course teacher/room/unavailability violation mask,
+        computed if not given.
+        """
+        if conflicted is None:
+            conflicted = self.evaluator.conflicted_courses(assignment[None], students=False)[0]
+        courses = np.flatnonzero(conflicted)
+        if not len(courses):
+            return 0
+
+        # Most constrained courses first
+        courses = courses[np.argsort(self.model.domains.domain_size[courses], kind='stable')]
+        staying = assignment.copy()
+        staying[courses] = UNASSIGNED
+        occupancy = self._occupancy.load(staying)
+        moved = 0
+        for course_idx in courses.tolist():
+            teacher_idx, room_idx, slot_idx = assignment[course_idx].tolist()
+
+            # The courses placed so far may leave this one's own placement free
+            if (not self._forbidden[teacher_idx, slot_idx] and occupancy.teacher_blocked[teacher_idx, slot_idx] == 0
+                    and occupancy.room_blocked[room_idx, slot_idx] == 0):
+                occupancy.assign(course_idx, teacher_idx, room_idx, slot_idx)
+                continue
+
+            # Prefer placements free for the course's students too, else any free teacher and room
+            candidates = self.model.domains.candidates[course_idx]
+            open_mask = occupancy.free_candidates(course_idx, candidates, students=False)
+            free = np.flatnonzero(open_mask & occupancy.student_free_slots(course_idx)[candidates[:, SLOT]])
+            if not len(free):
+                free = np.flatnonzero(open_mask)
+            if not len(free):
+                occupancy.assign(course_idx, teacher_idx, room_idx, slot_idx)
+                continue
+
+            best = free[self._nearest(candidates[free], teacher_idx, room_idx, slot_idx)]
+            occupancy.assign(course_idx, *candidates[best].tolist())
+            moved += 1
+
+        assignment[courses] = occupancy.assignment[courses]
+        return moved
+
+    def repair_population(self, population: np.ndarray) -> int:
+        """Repair every individual of a (population, n_courses, 3) array in place."""
+        conflicted = self.evaluator.conflicted_courses(population, students=False)
+        return sum(self.repair(individual, mask) for individual, mask in zip(population, conflicted))
@@ -0,0 +1,93 @@
+"""
+Parent selection on a precomputed fitness vector.
+
+Selection never re-scores individuals; it works on indices into the
+fitness array the GA computed for the current generation. Tournaments for
+a whole generation are drawn in one vectorized call, with distinct
+contestants in each tournament, and fitness-proportionate (roulette) and
+rank selection sample from an alias table in O(1) per draw.
+"""
+
+import numpy as np
+
+SELECTION_METHODS = ('tournament', 'rank', 'roulette')
+
+
+class AliasTable:
+    """Walker/Vose alias table for O(1) sampling from a fixed discrete distribution."""
+
+    def __init__(self, weights: np.ndarray):
+        n = len(weights)
+        weights = np.asarray(weights, dtype=np.float64)
+        total = weights.sum()
+        scaled = weights * n / total if total > 0 else np.ones(n)
+
+        self.prob = np.ones(n, dtype=np.float64)
+        self.alias = np.arange(n, dtype=np.int64)
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Leftovers are 1 up to rounding error
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def sample(self, rng: np.random.Generator, size) -> np.ndarray:
+        """Draw indices distributed according to the table's weights."""
+        column = rng.integers(0, len(self.prob), size=size)
+        keep = rng.random(size) < self.prob[column]
+        return np.where(keep, column, self.alias[column])
+
+
+def draw_contestants(rng: np.random.Generator, n: int, rows: int, size: int) -> np.ndarray:
+    """
+    (rows, size) indices below `n`, distinct within each row; `size` is clipped to `n`.
+    Rows with a repeated index are redrawn, unless repeats are likely, in which case
+    each row is the first `size` entries of a random permutation.
+    """
+    size = min(size, n)
+    if size * size > n:
+        return np.argpartition(rng.random((rows, n)), size - 1, axis=1)[:, :size]
+
+    contestants = rng.integers(0, n, size=(rows, size))
+    while True:
+        ordered = np.sort(contestants, axis=1)
+        repeated = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+        if not repeated.any():
+            return contestants
+        contestants[repeated] = rng.integers(0, n, size=(int(repeated.sum()), size))
+
+
+def selection_weights(fitness_values: np.ndarray, method: str) -> np.ndarray:
+    """
+    Sampling weights for rank or roulette selection.
+
+    Rank: the worst individual has weight 1 and the best weight n.
+    Roulette: fitness shifted so the worst individual has weight 1 (GA
+    fitness is a non-positive penalty, so raw values cannot be used).
+    """
+    if method == 'rank':
+        weights = np.empty(len(fitness_values), dtype=np.float64)
+        weights[np.argsort(fitness_values, kind='stable')] = np.arange(1, len(fitness_values) + 1)
+        return weights
+    if method == 'roulette':
+        return fitness_values - fitness_values.min() + 1.0
+    raise ValueError(f"Unknown selection method: {method}")
+
+
+def select_parents(fitness_values: np.ndarray, n_pairs: int, rng: np.random.Generator,
+                   method: str = 'tournament', tournament_size: int = 3) -> np.ndarray:
+    """Indices of `n_pairs` parent pairs as an (n_pairs, 2) array."""
+    fitness_values = np.asarray(fitness_values)
+    if method == 'tournament':
+        # One row of distinct contestants per parent; the fittest of each row wins
+        contestants = draw_contestants(rng, len(fitness_values), 2 * n_pairs, tournament_size)
+        winners = contestants[np.arange(2 * n_pairs), np.argmax(fitness_values[contestants], axis=1)]
+        return winners.reshape(n_pairs, 2)
+    if method not in SELECTION_METHODS:
+        raise ValueError(f"Unknown selection method: {method}")
+    return AliasTable(selection_weights(fitness_values, method)).sample(rng, (n_pairs, 2))
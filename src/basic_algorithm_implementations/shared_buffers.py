@@ -0,0 +1,80 @@
+"""
+Population and fitness arrays in shared memory.
+
+The parent process owns two `multiprocessing.shared_memory` segments: an
+int32 (capacity, n_courses, 3) population block and an int64 fitness vector.
+Workers attach to them by name, read the rows of their slice and write the
+scores of those rows in place, so a task is just (segment names, start, stop).
+The parent unlinks both segments on close(), when the buffer is garbage
+collected, or at interpreter exit, whichever comes first.
+"""
+
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Tuple
+import numpy as np
+
+POPULATION_DTYPE = np.int32
+FITNESS_DTYPE = np.int64
+
+
+def _release(segments: List[SharedMemory]) -> None:
+    """Close and unlink segments, tolerating ones already gone."""
+    for segment in segments:
+        try:
+            segment.close()
+        except BufferError:
+            pass  # arrays still map it at interpreter exit; unlinking below frees it anyway
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedPopulationBuffer:
+    """Shared population block and fitness vector for up to `capacity` individuals."""
+
+    def __init__(self, capacity: int, n_courses: int):
+        self.capacity = capacity
+        self.n_courses = n_courses
+        population_bytes = capacity * n_courses * 3 * np.dtype(POPULATION_DTYPE).itemsize
+        self._segments = [SharedMemory(create=True, size=max(1, population_bytes))]
+        try:
+            self._segments.append(SharedMemory(create=True, size=max(1, capacity * np.dtype(FITNESS_DTYPE).itemsize)))
+        except BaseException:
+            _release(self._segments)
+            raise
+        self._finalizer = weakref.finalize(self, _release, list(self._segments))
+
+        self.population = np.ndarray((capacity, n_courses, 3), dtype=POPULATION_DTYPE, buffer=self._segments[0].buf)
+        self.fitness = np.ndarray(capacity, dtype=FITNESS_DTYPE, buffer=self._segments[1].buf)
+
+    @property
+    def names(self) -> Tuple[str, str]:
+        """(population segment, fitness segment) names for workers to attach to."""
+        return self._segments[0].name, self._segments[1].name
+
+    def close(self) -> None:
+        """Drop the array views, then close and unlink both segments."""
+        self.population = None
+        self.fitness = None
+        self._finalizer()
+
+
+# Segments a worker process has attached to, by name
+_attached: Dict[str, SharedMemory] = {}
+
+
+def attach(names: Tuple[str, str], n_courses: int, stop: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Worker side: the first `stop` rows of a parent's population block and fitness vector.
+    Segments of buffers the parent has since replaced are closed.
+    """
+    for name in [name for name in _attached if name not in names]:
+        _attached.pop(name).close()
+    for name in names:
+        if name not in _attached:
+            _attached[name] = SharedMemory(name=name)
+    population = np.ndarray((stop, n_courses, 3), dtype=POPULATION_DTYPE, buffer=_attached[names[0]].buf)
+    fitness = np.ndarray(stop, dtype=FITNESS_DTYPE, buffer=_attached[names[1]].buf)
+    return population, fitness
@@ -5,11 +5,18 @@ Based on Section 5 of the research paper.
 
 import random
 import math
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
+import numpy as np
 from tqdm import tqdm
+from .problem_model import ProblemModel, TEACHER, ROOM, SLOT, UNASSIGNED
+from .fitness_cache import FitnessCache
+from .fitness import FitnessEvaluator
+from .construction import ConstructiveInitializer
+from .incremental_cost import IncrementalCost, Move, load_spread
 
 class SimulatedAnnealing:
-    def __init__(self, data: Dict[str, Any], params: Dict[str, Any] = None):
+    def __init__(self, data: Dict[str, Any], params: Dict[str, Any] = None,
+                 model: ProblemModel = None, cache: FitnessCache = None):
         self.data = data
         self.params = params or {
             'initial_temperature': 1000,  # As per Section 8.5.1.2
@@ -27,38 +34,98 @@ class SimulatedAnnealing:
         self.hard_constraints = data['hard_constraints']
         self.soft_constraints = data['soft_constraints']
         
+        # Integer-indexed view of the data, shared with other solvers when provided
+        self.model = model or ProblemModel(data)
+        
+        # Finds the courses involved in hard violations of arbitrary timetables; the annealing
+        # state tracks its own for conflict-focused moves
+        self.evaluator = FitnessEvaluator(self.model)
+        
+        # Full costs keyed by assignment digest under 'sa_cost', shared with other solvers when provided
+        self.cache = cache if cache is not None else FitnessCache(self.params.get('fitness_cache_size', 10000))
+        
+        # Initial solutions, move proposals and acceptance draws; reproducible when params['seed'] is set
+        self.random = random.Random(self.params.get('seed'))
+        
+        # Check every incremental move cost against a full recompute (slow; for debugging)
+        self.debug_delta_cost = self.params.get('debug_delta_cost', False)
+        
+        # Move choices as indices, in the same order as the domain ID lists
+        model = self.model
+        self._teacher_choices = [[model.teacher_index[t] for t in ids] for ids in model.domains.teacher_ids]
+        self._room_choices = [[model.room_index[r] for r in ids] for ids in model.domains.room_ids]
+        self._slot_choices = [slots.tolist() for slots in model.teacher_slots]
+        
         # Initialize solution
-        self.current_solution = self._generate_initial_solution()
-        self.best_solution = self.current_solution.copy()
-        self.current_cost = self._calculate_cost(self.current_solution)
+        self._reset(self._generate_initial_solution())
+    
+    def _reset(self, solution: Union[Dict[str, Any], np.ndarray]) -> None:
+        """
+        Start annealing from `solution`, a timetable dict or an encoded (n_courses, 3) array.
+        The current solution lives only in the incremental cost state, which moves edit in
+        place and a later reset rebinds; the best one is copied when it improves.
+        """
+        if isinstance(solution, np.ndarray):
+            assignment = solution
+            # Courses a move may pick: the placed ones, in course order as decode() lists them
+            self._movable = np.flatnonzero(assignment[:, TEACHER] != UNASSIGNED).tolist()
+        else:
+            assignment = self.model.encode(solution)
+            # Courses a move may pick, in the solution's order
+            self._movable = [self.model.course_index[c] for c in solution if c in self.model.course_index]
+        if hasattr(self, 'state'):
+            self.state.rebind(assignment)
+        else:
+            self.state = IncrementalCost(self.model, assignment,
+                                         track_conflicts=self.params.get('conflict_focus', 0.0) > 0)
+        self.current_cost = self.state.cost
+        if self.debug_delta_cost:
+            self._check_cost(self.current_cost)
+        self._remember_cost(self.state.assignment, self.current_cost)
         self.best_cost = self.current_cost
+        self._best_assignment = self.state.assignment.copy()
+    
+    @property
+    def current_solution(self) -> Dict[str, Any]:
+        return self.model.decode(self.state.assignment)
+    
+    @property
+    def best_solution(self) -> Dict[str, Any]:
+        return self.model.decode(self._best_assignment)
     
     def _generate_initial_solution(self) -> Dict[str, Any]:
         """
         Generate an initial random solution.
         Following Section 5.2 of the paper.
+        With params['initialization'] = 'constructive' the solution is built hardest course first.
         """
+        if self.params.get('initialization', 'random') == 'constructive':
+            rng = np.random.default_rng(self.random.getrandbits(64))
+            return self.model.decode(ConstructiveInitializer(self.model).build(rng))
+        
         solution = {}
         
-        # For each course, randomly assign a teacher, room, and time slot
-        for course_id, course in self.courses.items():
-            eligible_teachers = course.eligible_teachers
+        # For each course, randomly assign a teacher, room, and time slot from its pruned domain
+        domains = self.model.domains
+        for course_idx, course_id in enumerate(self.model.course_ids):
+            eligible_teachers = domains.teacher_ids[course_idx]
             if not eligible_teachers:
                 continue  # Skip if no eligible teachers
                 
-            teacher_id = random.choice(eligible_teachers)
+            teacher_id = self.random.choice(eligible_teachers)
             
-            # Choose a random room from preferred rooms
-            if not course.preferred_rooms:
+            # Choose a random room from the feasible preferred rooms
+            rooms = domains.room_ids[course_idx]
+            if not rooms:
                 continue  # Skip if no preferred rooms
                 
-            room_id = random.choice(course.preferred_rooms)
+            room_id = self.random.choice(rooms)
             
-            # Choose a random time slot
+            # Choose a random time slot the teacher is available for
             if not self.time_slots:
                 continue  # Skip if no time slots available
                 
-            time_slot_id = random.choice(list(self.time_slots.keys()))
+            time_slot_id = self.random.choice(self.model.available_slot_ids(teacher_id))
             
             solution[course_id] = {
                 'teacher_id': teacher_id,
@@ -73,83 +140,88 @@ class SimulatedAnnealing:
         Calculate the cost (penalty) of a solution.
         Following Section 5.3 of the paper.
         """
+        return self.cache.get_or_compute('sa_cost', self.model.encode(solution), self._assignment_cost)
+    
+    def _remember_cost(self, encoded: np.ndarray, cost: int) -> None:
+        """Cache a full cost the incremental state already knows, so _calculate_cost of that timetable is a lookup."""
+        self.cache.put(('sa_cost', self.cache.digest(encoded)), cost)
+    
+    def _assignment_cost(self, encoded: np.ndarray) -> int:
+        """Cost of an encoded (n_courses, 3) assignment."""
         # Initialize penalties for constraint violations
         violations = {
             "teacher_overlap": 0,
             "room_overlap": 0,
+            "student_group_overlap": 0,
+            "teacher_unavailability": 0,
             "mentor_group_size": 0,
             "back_to_back_sessions": 0,
-            "equitable_teaching_load": 0
+            "equitable_teaching_load": 0,
+            "teacher_preference": 0
         }
         
-        # Check for teacher overlaps (hard constraint)
-        teacher_timeslots = {}
-        for course_id, assignment in solution.items():
-            teacher_id = assignment['teacher_id']
-            time_slot_id = assignment['time_slot_id']
-            
-            if teacher_id not in teacher_timeslots:
-                teacher_timeslots[teacher_id] = set()
-            
-            if time_slot_id in teacher_timeslots[teacher_id]:
-                violations["teacher_overlap"] += 1
-            else:
-                teacher_timeslots[teacher_id].add(time_slot_id)
+        model = self.model
+        assigned_courses = np.flatnonzero(encoded[:, TEACHER] >= 0)
+        assignment = encoded[assigned_courses]
         
-        # Check for room overlaps (hard constraint)
-        room_timeslots = {}
-        for course_id, assignment in solution.items():
-            room_id = assignment['room_id']
-            time_slot_id = assignment['time_slot_id']
-            
-            if room_id not in room_timeslots:
-                room_timeslots[room_id] = set()
-            
-            if time_slot_id in room_timeslots[room_id]:
-                violations["room_overlap"] += 1
-            else:
-                room_timeslots[room_id].add(time_slot_id)
+        # Check for teacher and room overlaps (hard constraints)
+        violations["teacher_overlap"] = model.timeslot_index.count_clashes(assignment[:, TEACHER], assignment[:, SLOT], model.n_teachers)
+        violations["room_overlap"] = model.timeslot_index.count_clashes(assignment[:, ROOM], assignment[:, SLOT], model.n_rooms)
+        
+        # Check courses sharing students at overlapping times (hard constraint)
+        violations["student_group_overlap"] = model.conflicts.count_clashes(encoded[:, SLOT], model.timeslot_index.overlaps)
+        
+        # Check teachers scheduled in slots they marked as unavailable (hard constraint)
+        violations["teacher_unavailability"] = int(model.availability.forbidden_matrix[assignment[:, TEACHER], assignment[:, SLOT]].sum())
         
         # Check mentor group size (hard constraint in the paper)
-        mentor_students = {}
-        for teacher_id, teacher in self.teachers.items():
-            if teacher.is_mentor:
-                mentor_students[teacher_id] = set()
-        
-        # Collect students for each mentor based on course assignments
-        for course_id, assignment in solution.items():
-            teacher_id = assignment['teacher_id']
-            if teacher_id in mentor_students:
-                course = self.courses.get(course_id)
-                if course:
-                    for group_id in course.student_groups:
-                        group = self.student_groups.get(group_id)
-                        if group:
-                            mentor_students[teacher_id].update(group.students)
-        
-        # Penalize incorrect mentor group sizes
-        for teacher_id, students in mentor_students.items():
-            if len(students) != 4:  # The paper specifies exactly 4 students per mentor
-                violations["mentor_group_size"] += abs(len(students) - 4)
+        for teacher_idx in model.mentor_indices:
+            taught = assigned_courses[assignment[:, TEACHER] == teacher_idx]
+            if len(taught):
+                students = np.unique(np.concatenate([model.students_of_course(c) for c in taught]))
+                n_students = len(students)
+            else:
+                n_students = 0
+            
+            # The paper specifies exactly 4 students per mentor
+            violations["mentor_group_size"] += abs(n_students - 4)
+        
+        # Check for back-to-back sessions (soft constraint): each teacher's sessions in day order,
+        # counting consecutive ones where one ends as the next starts
+        index = model.timeslot_index
+        order = np.lexsort((index.rank[assignment[:, SLOT]], index.day[assignment[:, SLOT]], assignment[:, TEACHER]))
+        teachers, slots = assignment[order, TEACHER], assignment[order, SLOT]
+        violations["back_to_back_sessions"] = int((index.adjacent[slots[:-1], slots[1:]] & (teachers[:-1] == teachers[1:])).sum())
+        
+        # Check for equitable teaching load (soft constraint): 10x the standard deviation of weekly hours
+        loads = np.bincount(assignment[:, TEACHER], weights=model.course_hours[assigned_courses],
+                            minlength=model.n_teachers).astype(np.int64)
+        violations["equitable_teaching_load"] = load_spread(model.n_teachers, int(loads.sum()), int((loads * loads).sum()))
+        
+        # Check teacher time preferences (soft constraint): sessions outside preferred windows or days
+        violations["teacher_preference"] = int(model.availability.preference_misses[assignment[:, TEACHER], assignment[:, SLOT]].sum())
         
         # Compute penalties for hard constraints
         hard_penalty = (
             100 * violations["teacher_overlap"] + 
             100 * violations["room_overlap"] + 
+            100 * violations["student_group_overlap"] + 
+            100 * violations["teacher_unavailability"] + 
             100 * violations["mentor_group_size"]
         )
         
         # Compute penalties for soft constraints
         soft_penalty = (
             50 * violations["back_to_back_sessions"] + 
-            40 * violations["equitable_teaching_load"]
+            40 * violations["equitable_teaching_load"] + 
+            10 * violations["teacher_preference"]
         )
         
         # Calculate total cost (sum of penalties)
         # Unlike fitness, cost is positive and should be minimized
         cost = hard_penalty + soft_penalty
         
-        return cost
+        return int(cost)
     
     def _generate_neighbor(self, solution: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -157,28 +229,80 @@ class SimulatedAnnealing:
         Following Section 5.4 of the paper.
         """
         neighbor = solution.copy()
+        movable = [self.model.course_index[c] for c in solution if c in self.model.course_index]
+        encoded = self.model.encode(solution)
+        conflicted = np.flatnonzero(self.evaluator.conflicted_courses(encoded[None])[0]).tolist()
+        move = self._propose_move(encoded, movable, conflicted)
+        if move is not None:
+            teacher_idx, room_idx, slot_idx = move.placement
+            neighbor[self.model.course_ids[move.course_idx]] = {
+                'teacher_id': self.model.teacher_ids[teacher_idx],
+                'room_id': self.model.room_ids[room_idx],
+                'time_slot_id': self.model.slot_ids[slot_idx]
+            }
+        return neighbor
+    
+    def _propose_move(self, assignment: np.ndarray, movable: List[int], conflicted: List[int]) -> Move:
+        """
+        Pick one of the `movable` courses of an encoded timetable and a new placement for it,
+        leaving the timetable unchanged. `conflicted` lists the courses in a hard violation.
+        Returns None if there is nothing to change.
+        """
+        if not self.courses or not movable:
+            return None  # No courses to modify
         
-        if not self.courses:
-            return neighbor  # No courses to modify
-        
-        # Randomly select a course to modify
-        course_id = random.choice(list(neighbor.keys()))
-        course = self.courses.get(course_id)
+        # Select a course to modify: with probability conflict_focus one involved in a hard
+        # violation (min-conflicts), otherwise any course
+        course_idx = None
+        if self.random.random() < self.params.get('conflict_focus', 0.0) and conflicted:
+            course_idx = self.random.choice(conflicted)
+        if course_idx is None:
+            course_idx = self.random.choice(movable)
         
-        if not course:
-            return neighbor  # Course not found
+        teacher_idx, room_idx, slot_idx = assignment[course_idx].tolist()
+        teachers = self._teacher_choices[course_idx]
+        rooms = self._room_choices[course_idx]
         
         # Choose what to modify: teacher, room, or time slot
-        modification = random.choice(['teacher', 'room', 'time_slot'])
+        modification = self.random.choice(['teacher', 'room', 'time_slot'])
         
-        if modification == 'teacher' and course.eligible_teachers:
-            neighbor[course_id]['teacher_id'] = random.choice(course.eligible_teachers)
-        elif modification == 'room' and course.preferred_rooms:
-            neighbor[course_id]['room_id'] = random.choice(course.preferred_rooms)
+        if modification == 'teacher' and teachers:
+            teacher_idx = self.random.choice(teachers)
+        elif modification == 'room' and rooms:
+            room_idx = self.random.choice(rooms)
         elif modification == 'time_slot' and self.time_slots:
-            neighbor[course_id]['time_slot_id'] = random.choice(list(self.time_slots.keys()))
+            slot_idx = self.random.choice(self._slot_choices[teacher_idx])
         
-        return neighbor
+        return Move(course_idx, teacher_idx, room_idx, slot_idx)
+    
+    def _check_cost(self, cost: int) -> None:
+        """Compare an incrementally maintained cost with a full recompute of the current state."""
+        expected = self._assignment_cost(self.state.assignment)
+        if cost != expected:
+            raise AssertionError(f"Incremental cost {cost} != full cost {expected}")
+    
+    def _step(self, temperature: float) -> None:
+        """
+        Apply one move to the current state, scored incrementally, and keep it by the
+        Metropolis rule or undo it.
+        """
+        move = self._propose_move(self.state.assignment, self._movable, self.state.conflicted)
+        if move is None:
+            return
+        neighbor_cost = self.current_cost + self.state.apply(move)
+        if self.debug_delta_cost:
+            self._check_cost(neighbor_cost)
+        
+        # Decide whether to accept the neighbor
+        if self._acceptance_probability(self.current_cost, neighbor_cost, temperature) > self.random.random():
+            self.current_cost = neighbor_cost
+            
+            # Update best solution if needed
+            if neighbor_cost < self.best_cost:
+                self._best_assignment[:] = self.state.assignment
+                self.best_cost = neighbor_cost
+        else:
+            self.state.undo(move)
     
     def _acceptance_probability(self, current_cost: float, new_cost: float, temperature: float) -> float:
         """
@@ -192,11 +316,17 @@ class SimulatedAnnealing:
         # and as the cost difference increases
         return math.exp((current_cost - new_cost) / temperature)
     
-    def run(self) -> Dict[str, Any]:
+    def run(self, initial: Optional[Union[Dict[str, Any], np.ndarray]] = None) -> Dict[str, Any]:
         """
         Run the simulated annealing algorithm.
         Following Section 5.8 of the paper.
+        
+        Args:
+            initial: Timetable dict or encoded array to start from instead of the current one
         """
+        if initial is not None:
+            self._reset(initial)
+        
         temperature = self.params['initial_temperature']
         
         # Create progress bar
@@ -208,21 +338,8 @@ class SimulatedAnnealing:
         
         iteration = 0
         while temperature > self.params['final_temperature'] and iteration < self.params['max_iterations']:
-            # Generate a neighbor
-            neighbor = self._generate_neighbor(self.current_solution)
-            
-            # Calculate the cost of the neighbor
-            neighbor_cost = self._calculate_cost(neighbor)
-            
-            # Decide whether to accept the neighbor
-            if self._acceptance_probability(self.current_cost, neighbor_cost, temperature) > random.random():
-                self.current_solution = neighbor
-                self.current_cost = neighbor_cost
-                
-                # Update best solution if needed
-                if neighbor_cost < self.best_cost:
-                    self.best_solution = neighbor.copy()
-                    self.best_cost = neighbor_cost
+            # Move one course in place, scored from the incremental cost state
+            self._step(temperature)
             
             # Cool down
             temperature *= self.params['cooling_rate']
@@ -236,4 +353,5 @@ class SimulatedAnnealing:
                 pbar.set_description(f"Iteration {iteration}: Temperature = {temperature:.2f}, Best Cost = {self.best_cost}")
         
         pbar.close()
+        self._remember_cost(self._best_assignment, self.best_cost)
         return self.best_solution
@@ -0,0 +1,109 @@
+"""
+Teacher unavailability and preferences compiled into per-teacher slot bitmasks.
+
+Bit s of a mask refers to slot s of the model's TimeSlotIndex. Masks are
+plain Python ints, so membership is a shift-and-and and preference scoring
+is a popcount. Matrix copies are kept for vectorized lookups: the forbidden
+masks as booleans, and per (teacher, slot) how many of the teacher's
+preferences a session there misses.
+"""
+
+from typing import Dict, Any, List, Tuple
+import numpy as np
+from .models import time_to_minutes
+from .time_slot_index import TimeSlotIndex
+
+
+def parse_time_window(window: str) -> Tuple[int, int]:
+    """Parse an 'HH:MM-HH:MM' window into (start, end) minutes."""
+    start, end = window.split('-')
+    return time_to_minutes(start.strip()), time_to_minutes(end.strip())
+
+
+def popcount(mask: int) -> int:
+    """Number of set bits in a mask."""
+    return bin(mask).count('1')
+
+
+def mask_to_matrix(masks: List[int], n_slots: int) -> np.ndarray:
+    """Expand per-row bitmasks into a (rows, n_slots) boolean matrix."""
+    matrix = np.zeros((len(masks), n_slots), dtype=bool)
+    for row, mask in enumerate(masks):
+        for slot in range(n_slots):
+            if mask >> slot & 1:
+                matrix[row, slot] = True
+    return matrix
+
+
+class TeacherAvailability:
+    """
+    Per-teacher slot bitmasks:
+        forbidden: slots overlapping an unavailability window on its day
+        preferred: slots falling entirely inside a preferred time window (any day)
+        preferred_day: slots on one of the teacher's preferred days
+    Teachers that are referenced but not defined get empty masks, and a teacher
+    without preferred windows (or days) has no window (or day) preference to miss.
+    """
+
+    def __init__(self, teachers: Dict[str, Any], teacher_ids: List[str], index: TimeSlotIndex):
+        n_slots = len(index)
+        self.n_slots = n_slots
+        day_lookup = {day: d for d, day in enumerate(index.days)}
+
+        self.forbidden: List[int] = []
+        self.preferred: List[int] = []
+        self.preferred_day: List[int] = []
+
+        for teacher_id in teacher_ids:
+            teacher = teachers.get(teacher_id)
+            forbidden = preferred = preferred_day = 0
+
+            if teacher is not None:
+                for entry in teacher.unavailability or []:
+                    day = day_lookup.get(entry.get('day'))
+                    if day is None:
+                        continue
+                    for window in entry.get('time_slots', []):
+                        start, end = parse_time_window(window)
+                        hits = (index.day == day) & (index.start < end) & (start < index.end)
+                        forbidden |= self._to_mask(hits)
+
+                preferences = teacher.preferences or {}
+                for window in preferences.get('preferred_time_slots', []):
+                    start, end = parse_time_window(window)
+                    hits = (index.start >= start) & (index.end <= end)
+                    preferred |= self._to_mask(hits)
+                for day_name in preferences.get('preferred_days', []):
+                    if day_name in day_lookup:
+                        preferred_day |= self._to_mask(index.day == day_lookup[day_name])
+
+            self.forbidden.append(forbidden)
+            self.preferred.append(preferred)
+            self.preferred_day.append(preferred_day)
+
+        self.forbidden_matrix = mask_to_matrix(self.forbidden, n_slots)
+
+        # 0, 1 or 2: outside the preferred windows, and off the preferred days
+        every_slot = (1 << n_slots) - 1
+        self.preference_misses = (
+            mask_to_matrix([every_slot & ~mask if mask else 0 for mask in self.preferred], n_slots).astype(np.int32) +
+            mask_to_matrix([every_slot & ~mask if mask else 0 for mask in self.preferred_day], n_slots))
+
+    @staticmethod
+    def _to_mask(hits: np.ndarray) -> int:
+        mask = 0
+        for slot in np.flatnonzero(hits):
+            mask |= 1 << int(slot)
+        return mask
+
+    def allowed_slots(self, teacher_idx: int) -> np.ndarray:
+        """Slot indices the teacher is available for."""
+        return np.flatnonzero(~self.forbidden_matrix[teacher_idx]).astype(np.int32)
+
+    def preference_score(self, teacher_idx: int, assigned_mask: int) -> Tuple[int, int]:
+        """
+        Score a teacher's assigned slots (given as a bitmask).
+        Returns (slots in a preferred window, slots on a preferred day).
+        """
+        return (popcount(assigned_mask & self.preferred[teacher_idx]),
+                popcount(assigned_mask & self.preferred_day[teacher_idx]))
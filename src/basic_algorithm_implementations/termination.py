@@ -0,0 +1,67 @@
+"""
+Early-termination criteria for generational solvers.
+
+A run stops at the first of: the generation limit, a wall-clock budget,
+reaching a target fitness, or a number of generations without improving the
+best fitness. The reason is kept so callers can report why a run ended.
+"""
+
+import time
+from typing import Dict, Any, Optional
+
+# Fitness is minus the weighted violation count, so 0 cannot be improved on
+PERFECT_FITNESS = 0
+
+
+class TerminationCriteria:
+    """
+    Read from solver params:
+        generations: generation limit
+        time_budget: wall-clock seconds (default: none)
+        target_fitness: stop once the best fitness reaches it (default 0, a perfect timetable)
+        max_stall_generations: stop after this many generations without improvement (default: none)
+    """
+
+    def __init__(self, params: Dict[str, Any]):
+        self.generations = params['generations']
+        self.time_budget = params.get('time_budget')
+        self.target_fitness = params.get('target_fitness', PERFECT_FITNESS)
+        self.max_stall_generations = params.get('max_stall_generations')
+        self.start()
+
+    def start(self) -> None:
+        """Reset the clock and the stall counter."""
+        self.started_at = time.perf_counter()
+        self.best_fitness = float('-inf')
+        self.stall_generations = 0
+        self.generations_run = 0
+        self.reason = None
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def update(self, generations_run: int, best_fitness: float) -> Optional[str]:
+        """
+        Record progress after `generations_run` generations in total and return the
+        reason to stop ('target_fitness', 'time_budget', 'stalled', 'generations') or None.
+        """
+        self.stall_generations += generations_run - self.generations_run
+        if best_fitness > self.best_fitness:
+            self.best_fitness = best_fitness
+            self.stall_generations = 0
+        self.generations_run = generations_run
+
+        if self.target_fitness is not None and best_fitness >= self.target_fitness:
+            self.reason = 'target_fitness'
+        elif self.time_budget is not None and self.elapsed >= self.time_budget:
+            self.reason = 'time_budget'
+        elif self.max_stall_generations is not None and self.stall_generations >= self.max_stall_generations:
+            self.reason = 'stalled'
+        elif generations_run >= self.generations:
+            self.reason = 'generations'
+        return self.reason
+
+    def summary(self) -> Dict[str, Any]:
+        """Termination reason, generations run and elapsed seconds."""
+        return {'reason': self.reason, 'generations': self.generations_run, 'elapsed': self.elapsed}
@@ -0,0 +1,90 @@
+"""
+Precomputed time-slot interval index.
+
+Start and end times are parsed to minutes exactly once. Overlap and
+back-to-back relations between slots are stored as boolean matrices, so every
+check in the solvers and in the constraint report is an O(1) array lookup.
+"""
+
+from typing import Dict, Any, List
+import numpy as np
+from .models import time_to_minutes
+
+# Canonical day order; unknown day names are ordered after these by first appearance
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+class TimeSlotIndex:
+    """
+    Interval data for a fixed list of time slots.
+
+    Attributes:
+        start, end: slot start/end in minutes after midnight
+        day: day index of each slot (into `days`)
+        overlaps: (S, S) bool, True when two slots share time on the same day (diagonal included)
+        adjacent: (S, S) bool, True when one slot ends exactly when the other starts on the same day
+        day_order: per day, slot indices sorted by start time
+        rank: position of each slot within its day's ordering
+        overlap_lists: per slot, the indices of every slot it overlaps (itself included)
+    """
+
+    def __init__(self, time_slots: Dict[str, Any], slot_ids: List[str] = None):
+        self.slot_ids = list(slot_ids if slot_ids is not None else time_slots.keys())
+        n_slots = len(self.slot_ids)
+
+        day_names = []
+        for slot_id in self.slot_ids:
+            day = time_slots[slot_id].day
+            if day not in day_names:
+                day_names.append(day)
+        known = [d for d in WEEKDAYS if d in day_names]
+        self.days = known + [d for d in day_names if d not in known]
+        day_lookup = {day: idx for idx, day in enumerate(self.days)}
+
+        self.start = np.zeros(n_slots, dtype=np.int32)
+        self.end = np.zeros(n_slots, dtype=np.int32)
+        self.day = np.zeros(n_slots, dtype=np.int32)
+        for idx, slot_id in enumerate(self.slot_ids):
+            slot = time_slots[slot_id]
+            self.start[idx] = time_to_minutes(slot.start_time)
+            self.end[idx] = time_to_minutes(slot.end_time)
+            self.day[idx] = day_lookup[slot.day]
+
+        same_day = self.day[:, None] == self.day[None, :]
+        self.overlaps = same_day & (self.start[:, None] < self.end[None, :]) & (self.start[None, :] < self.end[:, None])
+        np.fill_diagonal(self.overlaps, True)
+        self.adjacent = same_day & ((self.end[:, None] == self.start[None, :]) |
+                                    (self.start[:, None] == self.end[None, :]))
+
+        # Distinct slots that partially or fully overlap (s < t); empty for a plain grid
+        self.overlap_pairs = np.argwhere(np.triu(self.overlaps, k=1)).astype(np.int32)
+        self._overlap_upper = np.triu(self.overlaps, k=1).astype(np.int64)
+
+        self.day_order = []
+        self.rank = np.zeros(n_slots, dtype=np.int32)
+        for d in range(len(self.days)):
+            slots = np.flatnonzero(self.day == d)
+            ordered = slots[np.lexsort((self.end[slots], self.start[slots]))].astype(np.int32)
+            self.day_order.append(ordered)
+            self.rank[ordered] = np.arange(len(ordered), dtype=np.int32)
+
+        self.overlap_lists = [np.flatnonzero(row).astype(np.int32) for row in self.overlaps]
+
+    def __len__(self) -> int:
+        return len(self.slot_ids)
+
+    def count_clashes(self, resource_idx: np.ndarray, slot_idx: np.ndarray, n_resources: int) -> int:
+        """
+        Count clashes among assignments of resources (teachers, rooms, ...) to slots.
+
+        Repeated (resource, slot) pairs count once per extra booking, as the solvers
+        always have; a resource booked in two distinct slots that overlap in time
+        counts once per such pair.
+        """
+        keys = resource_idx.astype(np.int64) * len(self.slot_ids) + slot_idx
+        clashes = len(keys) - len(np.unique(keys))
+        if len(self.overlap_pairs) and len(keys):
+            occupied = np.bincount(keys, minlength=n_resources * len(self.slot_ids))
+            occupied = occupied.reshape(n_resources, len(self.slot_ids))
+            clashes += int((occupied * (occupied @ self._overlap_upper.T)).sum())
+        return clashes
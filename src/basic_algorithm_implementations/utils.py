@@ -4,35 +4,162 @@ Utility functions for the timetable generation system.
 
 import json
 import random
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from typing import Dict, Any, List, Tuple
 import matplotlib.colors as mcolors
 from .models import Teacher, Student, Course, Room, TimeSlot, StudentGroup, Constraint
+from .problem_model import ProblemModel, SLOT
+from .teacher_availability import popcount
+from .models import (CompactTeacher, CompactCourse, CompactRoom, CompactTimeSlot,
+                     CompactStudentGroup, StudentTable)
 
-def load_json_data(file_path: str) -> Dict[str, Any]:
+def load_json_data(file_path: str, compact: bool = False) -> Dict[str, Any]:
     """
     Load JSON data from file and parse into appropriate data structures.
     """
     with open(file_path, 'r') as f:
         data = json.load(f)
     
-    return parse_data(data)
+    return parse_data(data, compact=compact)
 
-def parse_data(data: Dict[str, Any]) -> Dict[str, Any]:
+def parse_data(data: Dict[str, Any], compact: bool = False) -> Dict[str, Any]:
     """
     Parse JSON data into data model objects.
+    With compact=True, entities are built as the frozen, slotted Compact* models
+    with interned IDs and students are stored column-wise in a StudentTable.
     """
     resources = data.get('resources', {})
     
-    # Parse teachers
+    if compact:
+        teachers, students, courses, rooms, time_slots, student_groups = _parse_compact_resources(resources)
+    else:
+        # Parse teachers
+        teachers = {}
+        for t in resources.get('teachers', []):
+            teachers[t['id']] = Teacher(
+                id=t['id'],
+                name=t['name'],
+                department=t['department'],
+                specialization=t['specialization'],
+                max_hours_per_day=t['max_hours_per_day'],
+                max_hours_per_week=t['max_hours_per_week'],
+                preferences=t['preferences'],
+                unavailability=t['unavailability'],
+                is_mentor=t['is_mentor'],
+                max_mentees=t.get('max_mentees', 4)
+            )
+    
+        # Parse students
+        students = {}
+        for s in resources.get('students', []):
+            students[s['id']] = Student(
+                id=s['id'],
+                name=s['name'],
+                batch=s['batch'],
+                semester=s['semester'],
+                registered_courses=s['registered_courses'],
+                needs_mentor=s['needs_mentor'],
+                special_requirements=s.get('special_requirements', [])
+            )
+    
+        # Parse courses
+        courses = {}
+        for c in resources.get('courses', []):
+            courses[c['id']] = Course(
+                id=c['id'],
+                code=c['code'],
+                name=c['name'],
+                credits=c['credits'],
+                hours_per_week=c['hours_per_week'],
+                sessions_per_week=c['sessions_per_week'],
+                session_duration=c['session_duration'],
+                requires_lab=c['requires_lab'],
+                preferred_rooms=c['preferred_rooms'],
+                eligible_teachers=c['eligible_teachers'],
+                student_groups=c['student_groups'],
+                required_facilities=c.get('required_facilities', [])
+            )
+    
+        # Parse rooms
+        rooms = {}
+        for r in resources.get('rooms', []):
+            rooms[r['id']] = Room(
+                id=r['id'],
+                name=r['name'],
+                type=r['type'],
+                capacity=r['capacity'],
+                facilities=r['facilities'],
+                building=r['building'],
+                floor=r['floor']
+            )
+    
+        # Parse time slots
+        time_slots = {}
+        for ts in resources.get('time_slots', []):
+            time_slots[ts['id']] = TimeSlot(
+                id=ts['id'],
+                day=ts['day'],
+                start_time=ts['start_time'],
+                end_time=ts['end_time'],
+                type=ts['type']
+            )
+    
+        # Parse student groups
+        student_groups = {}
+        for sg in resources.get('student_groups', []):
+            student_groups[sg['id']] = StudentGroup(
+                id=sg['id'],
+                name=sg['name'],
+                students=sg['students'],
+                courses=sg['courses']
+            )
+    
+    # Parse constraints
+    hard_constraints = []
+    soft_constraints = []
+    
+    for c in data.get('constraints', {}).get('hard_constraints', []):
+        hard_constraints.append(Constraint(
+            type=c['type'],
+            description=c['description'],
+            weight=c['weight']
+        ))
+    
+    for c in data.get('constraints', {}).get('soft_constraints', []):
+        soft_constraints.append(Constraint(
+            type=c['type'],
+            description=c['description'],
+            weight=c['weight']
+        ))
+    
+    return {
+        'teachers': teachers,
+        'students': students,
+        'courses': courses,
+        'rooms': rooms,
+        'time_slots': time_slots,
+        'student_groups': student_groups,
+        'hard_constraints': hard_constraints,
+        'soft_constraints': soft_constraints,
+        'algorithm_parameters': data.get('algorithm_parameters', {})
+    }
+
+def _parse_compact_resources(resources: Dict[str, Any]) -> Tuple[Dict[str, Any], ...]:
+    """
+    Parse resources into the compact model variants.
+    IDs are interned so the same string object is shared by every reference to it.
+    """
+    intern = sys.intern
+    
     teachers = {}
     for t in resources.get('teachers', []):
-        teachers[t['id']] = Teacher(
-            id=t['id'],
+        teachers[intern(t['id'])] = CompactTeacher(
+            id=intern(t['id']),
             name=t['name'],
-            department=t['department'],
-            specialization=t['specialization'],
+            department=intern(t['department']),
+            specialization=tuple(t['specialization']),
             max_hours_per_day=t['max_hours_per_day'],
             max_hours_per_week=t['max_hours_per_week'],
             preferences=t['preferences'],
@@ -41,24 +168,12 @@ def parse_data(data: Dict[str, Any]) -> Dict[str, Any]:
             max_mentees=t.get('max_mentees', 4)
         )
     
-    # Parse students
-    students = {}
-    for s in resources.get('students', []):
-        students[s['id']] = Student(
-            id=s['id'],
-            name=s['name'],
-            batch=s['batch'],
-            semester=s['semester'],
-            registered_courses=s['registered_courses'],
-            needs_mentor=s['needs_mentor'],
-            special_requirements=s.get('special_requirements', [])
-        )
+    students = StudentTable(resources.get('students', []))
     
-    # Parse courses
     courses = {}
     for c in resources.get('courses', []):
-        courses[c['id']] = Course(
-            id=c['id'],
+        courses[intern(c['id'])] = CompactCourse(
+            id=intern(c['id']),
             code=c['code'],
             name=c['name'],
             credits=c['credits'],
@@ -66,74 +181,44 @@ def parse_data(data: Dict[str, Any]) -> Dict[str, Any]:
             sessions_per_week=c['sessions_per_week'],
             session_duration=c['session_duration'],
             requires_lab=c['requires_lab'],
-            preferred_rooms=c['preferred_rooms'],
-            eligible_teachers=c['eligible_teachers'],
-            student_groups=c['student_groups']
+            preferred_rooms=tuple(intern(r) for r in c['preferred_rooms']),
+            eligible_teachers=tuple(intern(t) for t in c['eligible_teachers']),
+            student_groups=tuple(intern(g) for g in c['student_groups']),
+            required_facilities=tuple(intern(f) for f in c.get('required_facilities', []))
         )
     
-    # Parse rooms
     rooms = {}
     for r in resources.get('rooms', []):
-        rooms[r['id']] = Room(
-            id=r['id'],
+        rooms[intern(r['id'])] = CompactRoom(
+            id=intern(r['id']),
             name=r['name'],
-            type=r['type'],
+            type=intern(r['type']),
             capacity=r['capacity'],
-            facilities=r['facilities'],
-            building=r['building'],
+            facilities=tuple(intern(f) for f in r['facilities']),
+            building=intern(r['building']),
             floor=r['floor']
         )
     
-    # Parse time slots
     time_slots = {}
     for ts in resources.get('time_slots', []):
-        time_slots[ts['id']] = TimeSlot(
-            id=ts['id'],
-            day=ts['day'],
-            start_time=ts['start_time'],
-            end_time=ts['end_time'],
-            type=ts['type']
+        time_slots[intern(ts['id'])] = CompactTimeSlot(
+            id=intern(ts['id']),
+            day=intern(ts['day']),
+            start_time=intern(ts['start_time']),
+            end_time=intern(ts['end_time']),
+            type=intern(ts['type'])
         )
     
-    # Parse student groups
     student_groups = {}
     for sg in resources.get('student_groups', []):
-        student_groups[sg['id']] = StudentGroup(
-            id=sg['id'],
+        student_groups[intern(sg['id'])] = CompactStudentGroup(
+            id=intern(sg['id']),
             name=sg['name'],
-            students=sg['students'],
-            courses=sg['courses']
+            students=tuple(intern(s) for s in sg['students']),
+            courses=tuple(intern(c) for c in sg['courses'])
         )
     
-    # Parse constraints
-    hard_constraints = []
-    soft_constraints = []
-    
-    for c in data.get('constraints', {}).get('hard_constraints', []):
-        hard_constraints.append(Constraint(
-            type=c['type'],
-            description=c['description'],
-            weight=c['weight']
-        ))
-    
-    for c in data.get('constraints', {}).get('soft_constraints', []):
-        soft_constraints.append(Constraint(
-            type=c['type'],
-            description=c['description'],
-            weight=c['weight']
-        ))
-    
-    return {
-        'teachers': teachers,
-        'students': students,
-        'courses': courses,
-        'rooms': rooms,
-        'time_slots': time_slots,
-        'student_groups': student_groups,
-        'hard_constraints': hard_constraints,
-        'soft_constraints': soft_constraints,
-        'algorithm_parameters': data.get('algorithm_parameters', {})
-    }
+    return teachers, students, courses, rooms, time_slots, student_groups
 
 def save_timetable(timetable: Dict[str, Any], file_path: str) -> None:
     """
@@ -232,17 +317,28 @@ def visualize_timetable(timetable: Dict[str, Any], data: Dict[str, Any] = None)
     plt.savefig("timetable_visualization.png")
     plt.show()
 
-def calculate_constraint_violations(timetable: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, int]:
+def calculate_constraint_violations(timetable: Dict[str, Any], data: Dict[str, Any],
+                                    model: ProblemModel = None) -> Dict[str, int]:
     """
     Calculate violations of constraints in a timetable.
     Returns a dictionary with constraint types as keys and violation counts as values.
+    Pass a compiled ProblemModel to reuse its indexes; one is built from data otherwise.
     """
+    model = model or ProblemModel(data)
+    index = model.timeslot_index
+    availability = model.availability
+    slot_position = model.slot_index
+    teacher_position = model.teacher_index
+    
     violations = {
         "teacher_overlap": 0,
         "room_overlap": 0,
+        "student_group_overlap": 0,
+        "teacher_unavailability": 0,
         "mentor_group_size": 0,
         "back_to_back_sessions": 0,
-        "equitable_teaching_load": 0
+        "equitable_teaching_load": 0,
+        "non_preferred_slots": 0
     }
     
     # Check for teacher overlaps (no teacher scheduled for multiple classes at once)
@@ -254,16 +350,13 @@ def calculate_constraint_violations(timetable: Dict[str, Any], data: Dict[str, A
         if teacher_id not in teacher_assignments:
             teacher_assignments[teacher_id] = []
         
-        teacher_assignments[teacher_id].append(time_slot_id)
+        teacher_assignments[teacher_id].append(slot_position[time_slot_id])
     
     # Count overlapping time slots for each teacher
-    for teacher_id, time_slots in teacher_assignments.items():
-        for i, ts1_id in enumerate(time_slots):
-            ts1 = data['time_slots'][ts1_id]
-            for ts2_id in time_slots[i+1:]:
-                ts2 = data['time_slots'][ts2_id]
-                if ts1.overlaps_with(ts2):
-                    violations["teacher_overlap"] += 1
+    for teacher_id, slots in teacher_assignments.items():
+        slots = np.array(slots)
+        pair_overlaps = index.overlaps[np.ix_(slots, slots)]
+        violations["teacher_overlap"] += int(np.triu(pair_overlaps, k=1).sum())
     
     # Check for room overlaps (no room used for multiple classes at once)
     room_assignments = {}
@@ -274,16 +367,31 @@ def calculate_constraint_violations(timetable: Dict[str, Any], data: Dict[str, A
         if room_id not in room_assignments:
             room_assignments[room_id] = []
         
-        room_assignments[room_id].append(time_slot_id)
+        room_assignments[room_id].append(slot_position[time_slot_id])
     
     # Count overlapping time slots for each room
-    for room_id, time_slots in room_assignments.items():
-        for i, ts1_id in enumerate(time_slots):
-            ts1 = data['time_slots'][ts1_id]
-            for ts2_id in time_slots[i+1:]:
-                ts2 = data['time_slots'][ts2_id]
-                if ts1.overlaps_with(ts2):
-                    violations["room_overlap"] += 1
+    for room_id, slots in room_assignments.items():
+        slots = np.array(slots)
+        pair_overlaps = index.overlaps[np.ix_(slots, slots)]
+        violations["room_overlap"] += int(np.triu(pair_overlaps, k=1).sum())
+    
+    # Check courses that share students or groups at overlapping times
+    course_slots = model.encode(timetable)[:, SLOT]
+    violations["student_group_overlap"] = model.conflicts.count_clashes(course_slots, index.overlaps)
+    
+    # Check teachers scheduled while unavailable, and distinct slots outside their preferred windows
+    for teacher_id, slots in teacher_assignments.items():
+        if teacher_id not in teacher_position:
+            continue
+        teacher_idx = teacher_position[teacher_id]
+        violations["teacher_unavailability"] += int(availability.forbidden_matrix[teacher_idx, slots].sum())
+        
+        if availability.preferred[teacher_idx]:
+            assigned_mask = 0
+            for slot in slots:
+                assigned_mask |= 1 << int(slot)
+            in_window, _ = availability.preference_score(teacher_idx, assigned_mask)
+            violations["non_preferred_slots"] += popcount(assigned_mask) - in_window
     
     # Check mentor group size (each mentor should have exactly 4 students)
     mentor_students = {}
@@ -308,23 +416,13 @@ def calculate_constraint_violations(timetable: Dict[str, Any], data: Dict[str, A
             violations["mentor_group_size"] += abs(len(unique_students) - 4)
     
     # Check for back-to-back sessions (soft constraint)
-    for teacher_id, time_slots in teacher_assignments.items():
-        # Group time slots by day
-        day_slots = {}
-        for ts_id in time_slots:
-            ts = data['time_slots'][ts_id]
-            if ts.day not in day_slots:
-                day_slots[ts.day] = []
-            day_slots[ts.day].append(ts)
+    for teacher_id, slots in teacher_assignments.items():
+        # Order the teacher's slots by day and start time using the precomputed ranks
+        slots = np.array(slots)
+        slots = slots[np.lexsort((index.rank[slots], index.day[slots]))]
         
-        # Check for back-to-back sessions on each day
-        for day, slots in day_slots.items():
-            slots.sort(key=lambda ts: ts.start_time)
-            for i in range(len(slots) - 1):
-                end_time_1 = slots[i]._time_to_minutes(slots[i].end_time)
-                start_time_2 = slots[i+1]._time_to_minutes(slots[i+1].start_time)
-                if start_time_2 - end_time_1 == 0:  # Back-to-back sessions
-                    violations["back_to_back_sessions"] += 1
+        # Consecutive slots on the same day that touch are back-to-back sessions
+        violations["back_to_back_sessions"] += int(index.adjacent[slots[:-1], slots[1:]].sum())
     
     # Check for equitable teaching load (soft constraint)
     teaching_load = {teacher_id: 0 for teacher_id in data['teachers']}
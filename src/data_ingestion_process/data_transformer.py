@@ -132,7 +132,8 @@ class DataTransformer:
             "requires_lab": course_data.get("requires_lab", False),
             "preferred_rooms": course_data.get("preferred_rooms", []),
             "eligible_teachers": course_data.get("eligible_teachers", []),
-            "student_groups": course_data.get("student_groups", [])
+            "student_groups": course_data.get("student_groups", []),
+            "required_facilities": course_data.get("required_facilities", [])
         }
     
     def _transform_rooms(self, data: Dict[str, Any], transformed_data: Dict[str, Any]) -> None:
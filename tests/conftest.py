@@ -0,0 +1,97 @@
+"""
+Shared fixtures: a small seeded timetabling instance and random encoded timetables.
+
+The instance has overlapping lab slots, courses shared by several groups and
+individual registrations, so every counting path of the solvers is exercised.
+"""
+
+import json
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from basic_algorithm_implementations import utils, ProblemModel  # noqa: E402
+from basic_algorithm_implementations.problem_model import UNASSIGNED  # noqa: E402
+
+SAMPLE_INPUT = os.path.join(ROOT, 'data', 'input', 'sample_input.json')
+
+
+def make_input(seed: int, n_teachers: int = 6, n_courses: int = 24, n_rooms: int = 5,
+               n_groups: int = 4, n_students: int = 24) -> dict:
+    """Raw input in the sample_input.json format, with the sample constraints."""
+    rnd = random.Random(seed)
+    days = ['Monday', 'Tuesday', 'Wednesday']
+
+    time_slots = []
+    for day in days:
+        for hour in range(9, 15):
+            time_slots.append({'id': f'TS{len(time_slots):03d}', 'day': day, 'start_time': f'{hour:02d}:00',
+                               'end_time': f'{hour + 1:02d}:00', 'type': 'Regular'})
+        # Overlaps the 09:00 and 10:00 slots
+        time_slots.append({'id': f'TS{len(time_slots):03d}', 'day': day, 'start_time': '09:30',
+                           'end_time': '11:00', 'type': 'Lab'})
+
+    teachers = [{'id': f'T{i:03d}', 'name': f'Teacher {i}', 'department': 'CSE', 'specialization': [],
+                 'max_hours_per_day': 6, 'max_hours_per_week': 20,
+                 'preferences': {'preferred_days': rnd.sample(days, 2), 'preferred_time_slots': ['10:00-12:00']},
+                 'unavailability': [{'day': rnd.choice(days), 'time_slots': ['09:00-11:00']}],
+                 'is_mentor': rnd.random() < 0.5, 'max_mentees': 4} for i in range(n_teachers)]
+    rooms = [{'id': f'R{i:03d}', 'name': f'Room {i}', 'type': rnd.choice(['Lecture Hall', 'Laboratory']),
+              'capacity': rnd.choice([20, 40, 60]), 'facilities': ['Projector'], 'building': 'B', 'floor': 1}
+             for i in range(n_rooms)]
+    students = [{'id': f'S{i:04d}', 'name': f'Student {i}', 'batch': 'B', 'semester': 6, 'registered_courses': [],
+                 'needs_mentor': True, 'special_requirements': []} for i in range(n_students)]
+    groups = [{'id': f'G{i:03d}', 'name': f'Group {i}', 'courses': [],
+               'students': [s['id'] for s in students[i * n_students // n_groups:(i + 1) * n_students // n_groups]]}
+              for i in range(n_groups)]
+
+    courses = []
+    for i in range(n_courses):
+        course_groups = rnd.sample(groups, rnd.choice([1, 1, 2]))
+        course = {'id': f'C{i:03d}', 'code': f'X{i}', 'name': f'Course {i}', 'credits': 3,
+                  'hours_per_week': rnd.choice([2, 3, 4]), 'sessions_per_week': 2, 'session_duration': 1,
+                  'requires_lab': False, 'preferred_rooms': [r['id'] for r in rnd.sample(rooms, 3)],
+                  'eligible_teachers': [t['id'] for t in rnd.sample(teachers, 2)],
+                  'student_groups': [g['id'] for g in course_groups]}
+        for group in course_groups:
+            group['courses'].append(course['id'])
+        courses.append(course)
+    for student in students:
+        student['registered_courses'] = [c['id'] for c in rnd.sample(courses, 2)]
+
+    with open(SAMPLE_INPUT) as f:
+        constraints = json.load(f)['constraints']
+    return {'metadata': {}, 'constraints': constraints,
+            'resources': {'teachers': teachers, 'students': students, 'courses': courses, 'rooms': rooms,
+                          'time_slots': time_slots, 'student_groups': groups}}
+
+
+def random_assignments(model: ProblemModel, rng: np.random.Generator, size: int,
+                       unassigned: float = 0.1) -> np.ndarray:
+    """(size, n_courses, 3) random timetables with about `unassigned` of the courses left out."""
+    population = np.stack([rng.integers(0, model.n_teachers, (size, model.n_courses)),
+                           rng.integers(0, model.n_rooms, (size, model.n_courses)),
+                           rng.integers(0, model.n_slots, (size, model.n_courses))], axis=2).astype(np.int32)
+    population[rng.random((size, model.n_courses)) < unassigned] = UNASSIGNED
+    return population
+
+
+@pytest.fixture(scope='session')
+def data():
+    return utils.parse_data(make_input(seed=7))
+
+
+@pytest.fixture(scope='session')
+def model(data):
+    return ProblemModel(data)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(12345)
@@ -0,0 +1,72 @@
+"""Course conflict graph against the shared groups and students of every course pair."""
+
+from itertools import combinations
+
+from basic_algorithm_implementations import CourseConflictGraph, ProblemModel, utils
+
+from conftest import make_input, random_assignments
+
+
+def shared_pairs(data) -> dict:
+    """(u, v) course ID pair -> shared students, for every pair sharing a group or a student."""
+    groups_of = {course_id: set(course.student_groups) for course_id, course in data['courses'].items()}
+    students_of = {course_id: set() for course_id in data['courses']}
+    for group_id, group in data['student_groups'].items():
+        for course_id in group.courses:
+            groups_of[course_id].add(group_id)
+    for course_id, groups in groups_of.items():
+        for group_id in groups:
+            students_of[course_id].update(data['student_groups'][group_id].students)
+    for student_id, student in data['students'].items():
+        for course_id in student.registered_courses:
+            students_of[course_id].add(student_id)
+
+    return {(u, v): len(students_of[u] & students_of[v]) for u, v in combinations(data['courses'], 2)
+            if groups_of[u] & groups_of[v] or students_of[u] & students_of[v]}
+
+
+def graph_pairs(model) -> dict:
+    conflicts = model.conflicts
+    pairs = {}
+    for (u, v), weight in zip(conflicts.edges.tolist(), conflicts.edge_weights.tolist()):
+        pairs[tuple(sorted((model.course_ids[u], model.course_ids[v])))] = weight
+    return pairs
+
+
+def test_edges_and_weights_match_shared_students(data, model):
+    expected = {tuple(sorted(pair)): weight for pair, weight in shared_pairs(data).items()}
+    assert graph_pairs(model) == expected
+    assert (model.conflicts.edges[:, 0] < model.conflicts.edges[:, 1]).all()
+
+
+def test_student_table_builds_the_same_graph():
+    raw = make_input(seed=7)
+    plain, compact = ProblemModel(utils.parse_data(raw)), ProblemModel(utils.parse_data(raw, compact=True))
+    assert isinstance(compact.conflicts, CourseConflictGraph)
+    assert graph_pairs(compact) == graph_pairs(plain)
+
+
+def test_adjacency_is_symmetric(model):
+    conflicts = model.conflicts
+    for u in range(model.n_courses):
+        neighbors, weights = conflicts.neighbors_of(u)
+        assert len(neighbors) == conflicts.degree[u]
+        for v, weight in zip(neighbors.tolist(), weights.tolist()):
+            back, back_weights = conflicts.neighbors_of(v)
+            assert back_weights[back.tolist().index(u)] == weight
+
+
+def test_clash_counts_match_the_edges(model, rng):
+    conflicts, overlaps = model.conflicts, model.timeslot_index.overlaps
+    for assignment in random_assignments(model, rng, 10, unassigned=0.3):
+        slots = assignment[:, 2]
+        clashing = [(u, v) for u, v in conflicts.edges.tolist()
+                    if slots[u] >= 0 and slots[v] >= 0 and overlaps[slots[u], slots[v]]]
+        assert conflicts.count_clashes(slots, overlaps) == len(clashing)
+
+        # Per course, with the course itself moved to every slot
+        for course_idx in range(0, model.n_courses, 5):
+            neighbors, _ = conflicts.neighbors_of(course_idx)
+            for slot_idx in range(model.n_slots):
+                expected = sum(1 for n in neighbors.tolist() if slots[n] >= 0 and overlaps[slot_idx, slots[n]])
+                assert conflicts.clashes_of(course_idx, slot_idx, slots, overlaps) == expected
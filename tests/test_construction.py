@@ -0,0 +1,43 @@
+"""Constructive initialization: complete, in-domain timetables with fewer violations than random ones."""
+
+import numpy as np
+
+from basic_algorithm_implementations import ConstructiveInitializer, FitnessEvaluator, GeneticAlgorithm
+
+from test_genetic_algorithm import PARAMS
+
+
+def test_builds_complete_timetables_within_the_domains(model, rng):
+    population = ConstructiveInitializer(model).build_population(10, rng)
+    assert population.shape == (10, model.n_courses, 3)
+    for c in range(model.n_courses):
+        allowed = set(map(tuple, model.domains.candidates[c].tolist()))
+        assert {tuple(row) for row in population[:, c].tolist()} <= allowed
+
+
+def test_fewer_violations_than_random_sampling(model, rng):
+    evaluator = FitnessEvaluator(model)
+    constructed = ConstructiveInitializer(model).build_population(20, rng)
+    sampled = model.domains.sample(rng, 20)
+    assert evaluator.evaluate(constructed).mean() > evaluator.evaluate(sampled).mean()
+
+    penalties = evaluator.penalties(constructed)
+    assert (penalties['teacher_overlap'] + penalties['room_overlap'] + penalties['teacher_unavailability'] == 0).all()
+
+
+def test_same_seed_same_population(model):
+    builds = [ConstructiveInitializer(model).build_population(5, np.random.default_rng(1), workers=workers)
+              for workers in (1, 1, 2)]
+    np.testing.assert_array_equal(builds[0], builds[1])
+    np.testing.assert_array_equal(builds[0], builds[2])
+    assert len({individual.tobytes() for individual in builds[0]}) > 1
+
+
+def test_ga_builds_the_constructive_fraction(data, model):
+    params = dict(PARAMS, representation='array', initialization='constructive', constructive_fraction=0.5)
+    population = GeneticAlgorithm(data, params, model=model).population
+    penalties = FitnessEvaluator(model).penalties(population)
+    hard = penalties['teacher_overlap'] + penalties['room_overlap'] + penalties['teacher_unavailability']
+    # The random half first, then the constructed half
+    n_built = PARAMS['population_size'] // 2
+    assert (hard[-n_built:] == 0).all() and (hard[:-n_built] > 0).any()
@@ -0,0 +1,55 @@
+"""Per-course domains: every candidate passes the pruning rules, and relaxed rules are reported."""
+
+import numpy as np
+
+from basic_algorithm_implementations import ProblemModel, utils
+
+from conftest import make_input
+
+
+def lab_model() -> ProblemModel:
+    """The test instance with every third course requiring a lab."""
+    raw = make_input(seed=7)
+    for course in raw['resources']['courses'][::3]:
+        course['requires_lab'] = True
+    return ProblemModel(utils.parse_data(raw))
+
+
+def test_candidates_are_the_pruned_product():
+    model = lab_model()
+    domains = model.domains
+    for c in range(model.n_courses):
+        teachers, rooms = domains.teachers[c], domains.rooms[c]
+        assert set(teachers.tolist()) <= set(model.eligible_teachers(c).tolist())
+        assert set(rooms.tolist()) <= set(model.preferred_rooms(c).tolist())
+        relaxed = domains.relaxed.get(model.course_ids[c], [])
+        if 'capacity' not in relaxed:
+            assert (model.room_capacity[rooms] >= domains.enrolment[c]).all()
+        if model.course_requires_lab[c] and 'lab' not in relaxed:
+            assert model.room_is_lab[rooms].all()
+
+        candidates = domains.candidates[c]
+        assert not model.availability.forbidden_matrix[candidates[:, 0], candidates[:, 2]].any()
+        expected = {(t, r, s) for t in teachers.tolist() for r in rooms.tolist()
+                    for s in model.availability.allowed_slots(t).tolist()}
+        assert set(map(tuple, candidates.tolist())) == expected
+        assert len(candidates) == len(expected) == domains.domain_size[c]
+
+
+def test_rule_that_would_empty_a_domain_is_relaxed():
+    raw = make_input(seed=7)
+    for room in raw['resources']['rooms']:
+        room['capacity'] = 1
+    model = ProblemModel(utils.parse_data(raw))
+    for c in range(model.n_courses):
+        assert len(model.domains.rooms[c])
+        if model.domains.enrolment[c] > 1:
+            assert 'capacity' in model.domains.relaxed[model.course_ids[c]]
+
+
+def test_sampled_assignments_stay_in_the_domains(model, rng):
+    population = model.domains.sample(rng, 20)
+    for c in range(model.n_courses):
+        allowed = set(map(tuple, model.domains.candidates[c].tolist()))
+        assert {tuple(row) for row in population[:, c].tolist()} <= allowed
+    assert (population >= 0).all()
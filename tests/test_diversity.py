@@ -0,0 +1,68 @@
+"""Genome hashes, duplicate masks and diversity metrics, and the GA's duplicate policies."""
+
+import numpy as np
+import pytest
+
+from basic_algorithm_implementations import GeneticAlgorithm, GenomeHasher
+from basic_algorithm_implementations.diversity import diversity_metrics, duplicate_mask
+
+from conftest import random_assignments
+from test_genetic_algorithm import PARAMS
+
+
+def test_hashes_follow_genome_equality(model, rng):
+    hasher = GenomeHasher(model.n_courses)
+    population = random_assignments(model, rng, 30)
+    population[10:15] = population[:5]
+    hashes = hasher.hash(population)
+    assert hashes.dtype == np.uint64
+    assert (hashes[10:15] == hashes[:5]).all()
+    assert len(set(hashes.tolist())) == len({individual.tobytes() for individual in population}) == 25
+
+    # A single gene change changes the hash
+    changed = population[:1].copy()
+    changed[0, 3, 2] = (changed[0, 3, 2] + 1) % model.n_slots
+    assert hasher.hash(changed)[0] != hashes[0]
+
+
+def test_duplicate_mask():
+    hashes = np.array([5, 7, 5, 9, 7, 7], dtype=np.uint64)
+    assert duplicate_mask(hashes).tolist() == [False, False, True, False, True, True]
+    existing = np.array([9], dtype=np.uint64)
+    assert duplicate_mask(hashes, existing).tolist() == [False, False, True, True, True, True]
+
+
+def test_diversity_metrics(model, rng):
+    hasher = GenomeHasher(model.n_courses)
+    clones = np.repeat(random_assignments(model, rng, 1), 8, axis=0)
+    assert diversity_metrics(clones, hasher.hash(clones), rng) == {'unique_ratio': 0.125, 'mean_hamming': 0.0}
+
+    population = random_assignments(model, rng, 8)
+    metrics = diversity_metrics(population, hasher.hash(population), rng)
+    assert metrics['unique_ratio'] == 1.0 and 0.0 < metrics['mean_hamming'] <= 1.0
+
+
+@pytest.mark.parametrize('policy', ['keep', 'reject', 'remutate'])
+def test_duplicate_policies(data, model, policy):
+    ga = GeneticAlgorithm(data, dict(PARAMS, representation='array', duplicate_policy=policy), model=model)
+    children = np.repeat(ga.population[:2], 3, axis=0)
+    existing = ga.hasher.hash(ga.population[:1])
+    accepted = ga._deduplicate(children, existing)
+
+    if policy == 'keep':
+        assert accepted.all()
+        return
+    # Whatever is accepted is new and distinct
+    hashes = ga.hasher.hash(children)[accepted]
+    assert len(set(hashes.tolist())) == len(hashes) and not np.isin(hashes, existing).any()
+    if policy == 'reject':
+        assert accepted.tolist() == [False, False, False, True, False, False]
+    else:
+        assert accepted.sum() > 1
+
+
+def test_run_records_diversity(data, model):
+    ga = GeneticAlgorithm(data, dict(PARAMS, representation='array'), model=model)
+    ga.run()
+    assert len(ga.diversity_history) == PARAMS['generations']
+    assert all(0.0 < metrics['unique_ratio'] <= 1.0 for metrics in ga.diversity_history)
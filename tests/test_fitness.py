@@ -0,0 +1,107 @@
+"""Batch fitness against a plain-Python evaluation of the same rules."""
+
+from itertools import combinations
+
+import numpy as np
+
+from basic_algorithm_implementations import FitnessEvaluator
+from basic_algorithm_implementations.problem_model import UNASSIGNED
+
+from conftest import random_assignments
+
+
+def reference_fitness(data, model, assignment) -> int:
+    """Score one encoded timetable course by course, straight from the parsed input."""
+    overlaps = model.timeslot_index.overlaps
+    forbidden = model.availability.forbidden_matrix
+    placed = {model.course_ids[c]: tuple(row) for c, row in enumerate(assignment.tolist()) if row[0] != UNASSIGNED}
+
+    # Teacher and room clashes: extra bookings of a slot, plus pairs of overlapping distinct slots
+    clashes = 0
+    for column in (0, 1):
+        slots_of = {}
+        for row in placed.values():
+            slots_of.setdefault(row[column], []).append(row[2])
+        for slots in slots_of.values():
+            clashes += len(slots) - len(set(slots))
+            clashes += sum(1 for a, b in combinations(slots, 2) if a != b and overlaps[a, b])
+
+    # Courses sharing a group or a registered student, in overlapping slots
+    groups_of = {course_id: set(data['courses'][course_id].student_groups) for course_id in placed}
+    students_of = {course_id: set() for course_id in placed}
+    for group_id, group in data['student_groups'].items():
+        for course_id in group.courses:
+            if course_id in placed:
+                groups_of[course_id].add(group_id)
+                students_of[course_id].update(group.students)
+    for student_id, student in data['students'].items():
+        for course_id in student.registered_courses:
+            if course_id in placed:
+                students_of[course_id].add(student_id)
+    for u, v in combinations(placed, 2):
+        shared = groups_of[u] & groups_of[v] or students_of[u] & students_of[v]
+        if shared and overlaps[placed[u][2], placed[v][2]]:
+            clashes += 1
+
+    unavailable = sum(int(forbidden[teacher, slot]) for teacher, _, slot in placed.values())
+
+    # Sessions outside the teacher's preferred windows, and off its preferred days (when it has any)
+    index = model.timeslot_index
+    preference_misses = 0
+    for teacher, _, slot in placed.values():
+        preferences = data['teachers'][model.teacher_ids[teacher]].preferences
+        windows = [tuple(int(h) * 60 + int(m) for h, m in (t.split(':') for t in w.split('-')))
+                   for w in preferences.get('preferred_time_slots', [])]
+        if windows and not any(start <= index.start[slot] and index.end[slot] <= end for start, end in windows):
+            preference_misses += 1
+        days = preferences.get('preferred_days', [])
+        if days and index.days[index.day[slot]] not in days:
+            preference_misses += 1
+
+    # Group sizes per mentor, over the courses of each group that the mentor teaches
+    mentor_students = {t: 0 for t, teacher_id in enumerate(model.teacher_ids) if data['teachers'][teacher_id].is_mentor}
+    for group in data['student_groups'].values():
+        for course_id in set(group.courses):
+            if course_id in placed and placed[course_id][0] in mentor_students:
+                mentor_students[placed[course_id][0]] += len(group.students)
+    mentor_deviation = sum(abs(count - 4) for count in mentor_students.values())
+
+    return -(100 * (clashes + unavailable) + 50 * mentor_deviation + 10 * preference_misses)
+
+
+def test_evaluate_matches_reference(data, model, rng):
+    population = random_assignments(model, rng, 40)
+    fitness = FitnessEvaluator(model).evaluate(population)
+    assert fitness.tolist() == [reference_fitness(data, model, individual) for individual in population]
+
+
+def test_evaluate_is_independent_of_batch(model, rng):
+    population = random_assignments(model, rng, 12)
+    evaluator = FitnessEvaluator(model)
+    together = evaluator.evaluate(population)
+    alone = np.concatenate([evaluator.evaluate(individual[None]) for individual in population])
+    assert together.tolist() == alone.tolist()
+
+
+def reference_conflicted(model, assignment, students=True) -> list:
+    """Courses in a hard violation, found by checking every pair of placed courses."""
+    overlaps = model.timeslot_index.overlaps
+    conflicts = model.conflicts
+    placed = [c for c in range(model.n_courses) if assignment[c, 0] != UNASSIGNED]
+    conflicted = {c for c in placed if model.availability.forbidden_matrix[assignment[c, 0], assignment[c, 2]]}
+    for u, v in combinations(placed, 2):
+        if not overlaps[assignment[u, 2], assignment[v, 2]]:
+            continue
+        shares_students = students and v in conflicts.neighbors_of(u)[0].tolist()
+        if assignment[u, 0] == assignment[v, 0] or assignment[u, 1] == assignment[v, 1] or shares_students:
+            conflicted.update((u, v))
+    return sorted(conflicted)
+
+
+def test_conflicted_courses_match_pairwise_check(model, rng):
+    population = random_assignments(model, rng, 20, unassigned=0.2)
+    evaluator = FitnessEvaluator(model)
+    for students in (True, False):
+        masks = evaluator.conflicted_courses(population, students)
+        for mask, assignment in zip(masks, population):
+            assert np.flatnonzero(mask).tolist() == reference_conflicted(model, assignment, students)
@@ -0,0 +1,72 @@
+"""LRU eviction, hit/miss counting and sharing of the fitness cache."""
+
+import numpy as np
+
+from basic_algorithm_implementations import FitnessCache, HybridAlgorithm, SimulatedAnnealing
+
+from conftest import random_assignments
+
+SA_PARAMS = {'initial_temperature': 100, 'final_temperature': 1, 'cooling_rate': 0.9, 'max_iterations': 20, 'seed': 2}
+
+
+def test_least_recently_used_entry_is_evicted(model, rng):
+    a, b, c = random_assignments(model, rng, 3)
+    cache = FitnessCache(capacity=2)
+    cache.get_or_compute('fitness', a, lambda e: 1)
+    cache.get_or_compute('fitness', b, lambda e: 2)
+    assert cache.get_or_compute('fitness', a, lambda e: -1) == 1  # a is now the most recent
+    cache.get_or_compute('fitness', c, lambda e: 3)
+
+    assert len(cache) == 2
+    assert cache.get_or_compute('fitness', b, lambda e: -2) == -2  # b was evicted and recomputed
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 4
+
+
+def test_namespaces_are_separate(model, rng):
+    assignment = random_assignments(model, rng, 1)[0]
+    cache = FitnessCache()
+    cache.get_or_compute('fitness', assignment, lambda e: -5)
+    assert cache.get_or_compute('sa_cost', assignment, lambda e: 7) == 7
+
+
+def test_batch_scores_each_distinct_missing_individual_once(model, rng):
+    population = random_assignments(model, rng, 4)
+    population = np.concatenate([population, population[:2]])
+    cache = FitnessCache()
+    calls = []
+
+    def compute(batch):
+        calls.append(len(batch))
+        return np.arange(len(batch)) * -10
+
+    first = cache.evaluate_batch('fitness', population, compute)
+    second = cache.evaluate_batch('fitness', population, compute)
+    assert calls == [4]
+    assert first.tolist() == second.tolist() == [0, -10, -20, -30, 0, -10]
+    assert (cache.hits, cache.misses) == (8, 4)
+
+
+def test_zero_capacity_stores_nothing(model, rng):
+    cache = FitnessCache(capacity=0)
+    assignment = random_assignments(model, rng, 1)[0]
+    cache.get_or_compute('fitness', assignment, lambda e: 1)
+    assert len(cache) == 0
+
+
+def test_sa_costs_it_knows_are_lookups(data, model):
+    sa = SimulatedAnnealing(data, SA_PARAMS, model=model)
+    best = sa.run()
+    hits = sa.cache.hits
+    assert sa._calculate_cost(best) == sa.best_cost == sa._assignment_cost(model.encode(best))
+    assert sa.cache.hits == hits + 1
+
+
+def test_hybrid_shares_its_cache_and_reports_it(data, model):
+    ga_params = {'population_size': 8, 'generations': 2, 'mutation_rate': 0.2, 'crossover_rate': 0.8,
+                 'selection_method': 'tournament', 'tournament_size': 3, 'elitism_count': 2, 'seed': 4}
+    hybrid = HybridAlgorithm(data, {'ga_params': ga_params, 'sa_params': SA_PARAMS}, model=model)
+    solution = hybrid.run()
+    assert hybrid.ga.cache is hybrid.sa.cache is hybrid.cache
+    assert hybrid.sa._calculate_cost(solution) == hybrid.run_stats['final_cost']
+    assert hybrid.run_stats['cache']['misses'] > 0
@@ -0,0 +1,126 @@
+"""Seeded GA runs, and the vectorized crossover and mutation operators."""
+
+import numpy as np
+import pytest
+
+from basic_algorithm_implementations import GeneticAlgorithm
+from basic_algorithm_implementations.problem_model import UNASSIGNED
+
+PARAMS = {'population_size': 16, 'generations': 4, 'mutation_rate': 0.2, 'crossover_rate': 0.8,
+          'selection_method': 'tournament', 'tournament_size': 3, 'elitism_count': 2, 'seed': 3}
+
+
+@pytest.mark.parametrize('representation', ['dict', 'array'])
+def test_same_seed_same_run(data, model, representation):
+    params = dict(PARAMS, representation=representation)
+    runs = [GeneticAlgorithm(data, params, model=model).run() for _ in range(2)]
+    assert runs[0] == runs[1]
+
+
+def array_ga(data, model, **params) -> GeneticAlgorithm:
+    return GeneticAlgorithm(data, dict(PARAMS, representation='array', **params), model=model)
+
+
+def cross(ga, n_children=40):
+    """Children of random parent pairs of the GA's population, and those pairs."""
+    parents = np.random.default_rng(0).integers(0, len(ga.population), (n_children, 2))
+    children = np.empty((n_children,) + ga.population.shape[1:], dtype=ga.population.dtype)
+    ga._crossover_population(ga.population, parents, children)
+    return children, parents
+
+
+@pytest.mark.parametrize('crossover_type', ['one_point', 'two_point', 'uniform'])
+def test_children_take_every_course_from_a_parent(data, model, crossover_type):
+    ga = array_ga(data, model, crossover_type=crossover_type, crossover_rate=1.0)
+    children, parents = cross(ga)
+    first = (children == ga.population[parents[:, 0]]).all(axis=2)
+    second = (children == ga.population[parents[:, 1]]).all(axis=2)
+    assert (first | second).all()
+
+    if crossover_type == 'one_point':
+        # Parent1's genes up to the cut, parent2's from there on
+        for from_first, from_second in zip(first, second):
+            cut = int(np.flatnonzero(~from_second).max(initial=-1)) + 1
+            assert from_first[:cut].all()
+
+
+def test_pairs_that_skip_crossover_copy_parent1(data, model):
+    ga = array_ga(data, model, crossover_rate=0.0)
+    children, parents = cross(ga)
+    np.testing.assert_array_equal(children, ga.population[parents[:, 0]])
+
+
+def test_mutation_redraws_one_gene_from_the_course_domain(data, model):
+    ga = array_ga(data, model, mutation_rate=0.5)
+    children = ga.population.copy()
+    children[:, ::4] = UNASSIGNED
+    before = children.copy()
+    ga._mutate_population(children)
+
+    assert (children[:, ::4] == UNASSIGNED).all()
+    changed = children != before
+    assert changed.any() and (changed.sum(axis=2) <= 1).all()
+    domains = model.domains
+    for course_idx in range(1, model.n_courses, 4):
+        assert np.isin(children[:, course_idx, 0], domains.teachers[course_idx]).all()
+        assert np.isin(children[:, course_idx, 1], domains.rooms[course_idx]).all()
+    # A redrawn slot is one its teacher is available for
+    rows, courses = np.nonzero(changed[:, :, 2])
+    assert not model.availability.forbidden_matrix[children[rows, courses, 0], children[rows, courses, 2]].any()
+
+
+def test_operators_follow_the_seed(data, model):
+    results = []
+    for _ in range(2):
+        ga = array_ga(data, model)
+        children, _ = cross(ga)
+        ga._mutate_population(children)
+        results.append(children)
+    np.testing.assert_array_equal(*results)
+
+
+def valid_worst(ga):
+    """(fitness, index) at the top of the worst-first heap, skipping outdated entries."""
+    return min((fitness, idx) for fitness, version, idx in ga._worst_heap if version == ga._versions[idx])
+
+
+@pytest.mark.parametrize('strategy', ['worst', 'tournament'])
+def test_steady_state_keeps_its_index_in_step(data, model, strategy):
+    ga = array_ga(data, model, population_replacement_strategy=strategy, offspring_per_step=3)
+    ga._init_steady_state()
+    for _ in range(15):
+        if strategy == 'worst':
+            worst, idx = valid_worst(ga)
+            assert worst == ga._fitness.min() == ga._fitness[idx]
+        ga._steady_state_step()
+
+        assert ga._fitness.tolist() == ga.evaluator.evaluate(ga.population).tolist()
+        assert ga._hashes.tolist() == ga.hasher.hash(ga.population).tolist()
+        assert ga.best_fitness >= ga._fitness.max()
+        assert ga.evaluator.evaluate(ga.best_assignment[None])[0] == ga.best_fitness
+
+
+def test_worst_replacement_overwrites_the_least_fit(data, model):
+    ga = array_ga(data, model, population_replacement_strategy='worst', offspring_per_step=1)
+    ga._init_steady_state()
+    for _ in range(10):
+        before = ga.population.copy()
+        worst = np.flatnonzero(ga._fitness == ga._fitness.min())
+        ga._steady_state_step()
+        changed = np.flatnonzero((ga.population != before).any(axis=(1, 2)))
+        assert set(changed.tolist()) <= set(worst.tolist())
+
+
+def test_focused_mutation_spends_its_rate_on_conflicted_courses(data, model):
+    ga = array_ga(data, model, conflict_focus=0.5, mutation_rate=0.05)
+    population = ga.population
+    focused = np.arange(len(population)) % 2 == 0
+    rates = ga._mutation_rates(population, np.where(focused, 0.0, 1.0))
+
+    assert (rates[~focused] == 0.05).all()
+    conflicted = ga.evaluator.conflicted_courses(population[focused])
+    assert conflicted.any(axis=1).all()
+    for row, mask in zip(rates[focused], conflicted):
+        assert (row[~mask] == 0).all()
+        # The same expected number of mutations, capped at one per conflicted course
+        assert np.isclose(row.sum(), min(0.05 * model.n_courses, mask.sum()))
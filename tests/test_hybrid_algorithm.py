@@ -0,0 +1,18 @@
+"""Seeded hybrid runs."""
+
+import pytest
+
+from basic_algorithm_implementations import HybridAlgorithm
+
+GA_PARAMS = {'population_size': 12, 'generations': 3, 'mutation_rate': 0.2, 'crossover_rate': 0.8,
+             'selection_method': 'tournament', 'tournament_size': 3, 'elitism_count': 2, 'seed': 5}
+SA_PARAMS = {'initial_temperature': 100, 'final_temperature': 1, 'cooling_rate': 0.9, 'max_iterations': 20}
+HYBRID_PARAMS = {'local_search_probability': 0.5, 'sa_iterations_per_generation': 5}
+
+
+@pytest.mark.parametrize('representation', ['dict', 'array'])
+def test_same_seed_same_run(data, model, representation):
+    params = {'ga_params': dict(GA_PARAMS, representation=representation), 'sa_params': SA_PARAMS,
+              'hybrid_params': HYBRID_PARAMS}
+    runs = [HybridAlgorithm(data, params, model=model).run() for _ in range(2)]
+    assert runs[0] == runs[1]
@@ -0,0 +1,84 @@
+"""Incremental SA cost and conflict tracking against full re-evaluation."""
+
+import numpy as np
+
+from basic_algorithm_implementations import FitnessEvaluator, IncrementalCost, SimulatedAnnealing
+from basic_algorithm_implementations.incremental_cost import Move
+
+from conftest import random_assignments
+
+
+def random_move(model, rng) -> Move:
+    return Move(int(rng.integers(model.n_courses)), int(rng.integers(model.n_teachers)),
+                int(rng.integers(model.n_rooms)), int(rng.integers(model.n_slots)))
+
+
+def test_apply_and_undo_match_full_cost(data, model, rng):
+    full_cost = SimulatedAnnealing(data, model=model)._assignment_cost
+    state = IncrementalCost(model, random_assignments(model, rng, 1)[0])
+    assert state.cost == full_cost(state.assignment)
+
+    for step in range(300):
+        move = random_move(model, rng)
+        before = state.cost
+        delta = state.apply(move)
+        assert state.cost == full_cost(state.assignment) == before + delta
+        assert isinstance(state.cost, int)
+        if step % 3 == 0:
+            state.undo(move)
+            assert state.cost == before
+
+
+def test_tracked_conflicts_match_evaluator(model, rng):
+    evaluator = FitnessEvaluator(model)
+    state = IncrementalCost(model, random_assignments(model, rng, 1)[0], track_conflicts=True)
+
+    for step in range(300):
+        move = random_move(model, rng)
+        state.apply(move)
+        if step % 2 == 0:
+            state.undo(move)
+        expected = np.flatnonzero(evaluator.conflicted_courses(state.assignment[None])[0])
+        assert sorted(state.conflicted) == expected.tolist()
+
+
+def test_rebind_matches_fresh_state(model, rng):
+    first, near, far = random_assignments(model, rng, 3)
+    # A few changed rows are moved one by one, a different timetable is reloaded
+    near = first.copy()
+    near[:3] = far[:3]
+    state = IncrementalCost(model, first, track_conflicts=True)
+    for target in (near, far, first):
+        state.rebind(target)
+        fresh = IncrementalCost(model, target, track_conflicts=True)
+        np.testing.assert_array_equal(state.assignment, target)
+        assert state.cost == fresh.cost
+        assert sorted(state.conflicted) == sorted(fresh.conflicted)
+
+
+def reference_soft_terms(model, assignment) -> tuple:
+    """Back-to-back sessions and int(10 * std) of weekly teacher hours, from the placed courses."""
+    index = model.timeslot_index
+    placed = [(c, t, s) for c, (t, _, s) in enumerate(assignment.tolist()) if t >= 0]
+    back_to_back = 0
+    for teacher_idx in range(model.n_teachers):
+        for day in range(len(index.days)):
+            sessions = sorted((index.rank[s], s) for _, t, s in placed if t == teacher_idx and index.day[s] == day)
+            back_to_back += sum(int(index.adjacent[a, b]) for (_, a), (_, b) in zip(sessions, sessions[1:]))
+    loads = np.zeros(model.n_teachers)
+    for course_idx, teacher_idx, _ in placed:
+        loads[teacher_idx] += model.course_hours[course_idx]
+    return back_to_back, int(10 * np.std(loads))
+
+
+def test_soft_terms_match_reference(model, rng):
+    state = IncrementalCost(model, random_assignments(model, rng, 1)[0])
+    assert (state.back_to_back, state.equitable_load) == reference_soft_terms(model, state.assignment)
+
+    for step in range(300):
+        move = random_move(model, rng)
+        state.apply(move)
+        if step % 3 == 0:
+            state.undo(move)
+        assert (state.back_to_back, state.equitable_load) == reference_soft_terms(model, state.assignment)
+    assert state.back_to_back > 0
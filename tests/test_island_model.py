@@ -0,0 +1,55 @@
+"""Island model: migration routes, immigrant placement, and seeded multi-process runs."""
+
+import numpy as np
+import pytest
+
+from basic_algorithm_implementations import FitnessEvaluator, GeneticAlgorithm, IslandModel
+from basic_algorithm_implementations.island_model import _replace_worst, migration_sources
+
+from test_genetic_algorithm import PARAMS
+
+ISLAND_PARAMS = dict(PARAMS, population_size=24, generations=6, islands=3, migration_interval=2, migration_size=2)
+
+
+def test_migration_sources():
+    assert migration_sources(4, 'ring') == [[3], [0], [1], [2]]
+    assert migration_sources(3, 'fully_connected') == [[1, 2], [0, 2], [0, 1]]
+    with pytest.raises(ValueError):
+        migration_sources(3, 'star')
+
+
+def test_immigrants_replace_the_worst(data, model):
+    ga = GeneticAlgorithm(data, dict(PARAMS, representation='array'), model=model)
+    fitness = ga._evaluate_population(ga.population)
+    order = np.argsort(fitness)
+    kept = ga.population[order[3:]].copy()
+    immigrants = ga.population[order[-3:]].copy()
+    _replace_worst(ga, immigrants)
+    np.testing.assert_array_equal(ga.population[order[:3]], immigrants)
+    np.testing.assert_array_equal(ga.population[order[3:]], kept)
+
+    # However many arrive, the elites stay
+    top = np.sort(ga._evaluate_population(ga.population))[-PARAMS['elitism_count']:]
+    _replace_worst(ga, np.zeros((len(ga.population), model.n_courses, 3), dtype=ga.population.dtype))
+    np.testing.assert_array_equal(np.sort(ga._evaluate_population(ga.population))[-PARAMS['elitism_count']:], top)
+
+
+def test_seeded_islands_repeat_and_report_their_best(data, model):
+    runs = []
+    for _ in range(2):
+        islands = IslandModel(data, ISLAND_PARAMS, model)
+        runs.append(islands.run())
+        assert len(islands.best_fitness_history) == 3
+        assert np.all(np.diff(islands.best_fitness_history) >= 0)
+
+    (fitness, assignment), (again, assignment_again) = runs
+    assert fitness == again
+    np.testing.assert_array_equal(assignment, assignment_again)
+    assert FitnessEvaluator(model).evaluate(assignment[None])[0] == fitness
+
+
+def test_ga_runs_as_islands(data, model):
+    ga = GeneticAlgorithm(data, ISLAND_PARAMS, model=model)
+    timetable = ga.run()
+    assert ga.termination_reason == 'generations'
+    assert timetable == model.decode(ga.best_assignment)
@@ -0,0 +1,58 @@
+"""Compact entity models against the plain ones, and the encoded timetable round trip."""
+
+import pickle
+from dataclasses import asdict
+
+import numpy as np
+
+from basic_algorithm_implementations import FitnessEvaluator, ProblemModel, StudentTable, utils
+
+from conftest import make_input, random_assignments
+
+KINDS = ('teachers', 'courses', 'rooms', 'time_slots', 'student_groups')
+
+
+def as_plain(entity) -> dict:
+    """Entity fields with tuples turned back into lists, as the plain models store them."""
+    fields = {name: getattr(entity, name) for name in entity.__slots__} if hasattr(entity, '__slots__') else asdict(entity)
+    return {name: list(value) if isinstance(value, tuple) else value for name, value in fields.items()}
+
+
+def test_compact_entities_hold_the_same_data():
+    raw = make_input(seed=3)
+    plain, compact = utils.parse_data(raw), utils.parse_data(raw, compact=True)
+    for kind in KINDS:
+        assert list(compact[kind]) == list(plain[kind])
+        for entity_id, entity in compact[kind].items():
+            assert not hasattr(entity, '__dict__')
+            assert as_plain(entity) == as_plain(plain[kind][entity_id])
+
+    students = compact['students']
+    assert isinstance(students, StudentTable)
+    assert list(students) == list(plain['students'])
+    for student_id, student in plain['students'].items():
+        assert as_plain(students[student_id]) == as_plain(student)
+
+
+def test_compact_entities_pickle():
+    compact = utils.parse_data(make_input(seed=3), compact=True)
+    for kind in KINDS:
+        restored = pickle.loads(pickle.dumps(compact[kind]))
+        assert restored == compact[kind]
+
+
+def test_both_representations_compile_to_the_same_model(rng):
+    raw = make_input(seed=3)
+    plain, compact = ProblemModel(utils.parse_data(raw)), ProblemModel(utils.parse_data(raw, compact=True))
+    assert (plain.course_ids, plain.teacher_ids, plain.room_ids, plain.slot_ids) == \
+        (compact.course_ids, compact.teacher_ids, compact.room_ids, compact.slot_ids)
+    population = random_assignments(plain, rng, 10)
+    assert FitnessEvaluator(plain).evaluate(population).tolist() == FitnessEvaluator(compact).evaluate(population).tolist()
+
+
+def test_encode_decode_round_trip(model, rng):
+    for assignment in random_assignments(model, rng, 5):
+        timetable = model.decode(assignment)
+        assert len(timetable) == int((assignment[:, 0] >= 0).sum())
+        np.testing.assert_array_equal(model.encode(timetable), assignment)
+        assert model.decode(model.encode(timetable)) == timetable
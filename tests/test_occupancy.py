@@ -0,0 +1,70 @@
+"""Occupancy tables kept by assign/unassign against a rebuild from the assignment."""
+
+import numpy as np
+
+from basic_algorithm_implementations import Occupancy
+
+from conftest import random_assignments
+
+TABLES = ('teacher_counts', 'room_counts', 'group_counts', 'teacher_blocked', 'room_blocked', 'group_blocked',
+          'assignment')
+
+
+def assert_same_tables(occupancy, rebuilt):
+    for table in TABLES:
+        np.testing.assert_array_equal(getattr(occupancy, table), getattr(rebuilt, table), err_msg=table)
+    assert occupancy.conflict_counts == rebuilt.conflict_counts
+
+
+def test_incremental_updates_match_rebuild(model, rng):
+    target = random_assignments(model, rng, 1)[0]
+    occupancy = Occupancy(model)
+    for course_idx in rng.permutation(model.n_courses).tolist():
+        if target[course_idx, 0] >= 0:
+            occupancy.assign(course_idx, *target[course_idx].tolist())
+    assert_same_tables(occupancy, Occupancy.from_assignment(model, target))
+
+    for _ in range(200):
+        course_idx = int(rng.integers(model.n_courses))
+        occupancy.unassign(course_idx)
+        if rng.random() < 0.8:
+            occupancy.assign(course_idx, int(rng.integers(model.n_teachers)), int(rng.integers(model.n_rooms)),
+                             int(rng.integers(model.n_slots)))
+        assert_same_tables(occupancy, Occupancy.from_assignment(model, occupancy.assignment))
+
+
+def test_reloaded_buffer_matches_fresh_build(model, rng):
+    first, second = random_assignments(model, rng, 2)
+    occupancy = Occupancy.from_assignment(model, first)
+    assert_same_tables(occupancy.load(second), Occupancy.from_assignment(model, second))
+
+    # Without students only the student clash count is left out
+    teacher_room = Occupancy(model, students=False).load(first).load(second)
+    course_idx = int(np.flatnonzero(second[:, 0] >= 0)[0])
+    teacher_room.unassign(course_idx)
+    teacher_room.assign(course_idx, *second[course_idx].tolist())
+    expected = Occupancy.from_assignment(model, second)
+    for table in TABLES:
+        np.testing.assert_array_equal(getattr(teacher_room, table), getattr(expected, table), err_msg=table)
+    assert teacher_room.student_conflicts == 0
+    assert (teacher_room.teacher_conflicts, teacher_room.room_conflicts) == (expected.teacher_conflicts,
+                                                                            expected.room_conflicts)
+
+
+def test_free_candidates_add_no_clashes(model, rng):
+    occupancy = Occupancy.from_assignment(model, random_assignments(model, rng, 1, unassigned=0.3)[0])
+    for course_idx in range(model.n_courses):
+        occupancy.unassign(course_idx)
+        candidates = model.domains.candidates[course_idx]
+        before = occupancy.conflict_counts
+        added = []
+        for candidate in candidates.tolist():
+            occupancy.assign(course_idx, *candidate)
+            after = occupancy.conflict_counts
+            added.append({kind: after[kind] - before[kind] for kind in after})
+            occupancy.unassign(course_idx)
+
+        teacher_room = [a['teacher_overlap'] + a['room_overlap'] == 0 for a in added]
+        everyone = [sum(a.values()) == 0 for a in added]
+        assert occupancy.free_candidates(course_idx, candidates, students=False).tolist() == teacher_room
+        assert occupancy.free_candidates(course_idx, candidates).tolist() == everyone
@@ -0,0 +1,49 @@
+"""Parallel scoring, through shared memory and through pickled chunks, against the serial evaluator."""
+
+import pytest
+
+from basic_algorithm_implementations import FitnessEvaluator, GeneticAlgorithm, ParallelEvaluator
+
+from conftest import random_assignments
+from test_genetic_algorithm import PARAMS
+
+
+@pytest.mark.parametrize('shared_memory', [True, False])
+def test_parallel_matches_serial(model, rng, shared_memory):
+    expected = FitnessEvaluator(model)
+    with ParallelEvaluator(model, workers=2, chunk_size=8, shared_memory=shared_memory) as evaluator:
+        # A larger second batch makes the shared buffer grow
+        for size in (20, 45):
+            population = random_assignments(model, rng, size)
+            assert evaluator.evaluate(population).tolist() == expected.evaluate(population).tolist()
+        assert evaluator.parallel
+
+
+def test_pool_persists_until_closed(model, rng):
+    population = random_assignments(model, rng, 20)
+    with ParallelEvaluator(model, workers=2, chunk_size=8, shared_memory=False) as evaluator:
+        # Batches no larger than a chunk stay in-process
+        evaluator.evaluate(population[:8])
+        assert evaluator._pool is None
+
+        evaluator.evaluate(population)
+        pool = evaluator._pool
+        evaluator.evaluate(population)
+        assert evaluator._pool is pool
+
+        evaluator.close()
+        assert evaluator._pool is None
+        assert evaluator.evaluate(population).tolist() == FitnessEvaluator(model).evaluate(population).tolist()
+    assert evaluator._pool is None
+
+
+def test_workers_do_not_change_a_seeded_run(data, model):
+    params = dict(PARAMS, representation='array', population_size=24, chunk_size=8)
+    runs = []
+    for workers in (1, 2):
+        ga = GeneticAlgorithm(data, dict(params, workers=workers), model=model)
+        try:
+            runs.append(ga.run())
+        finally:
+            ga.close()
+    assert runs[0] == runs[1]
@@ -0,0 +1,47 @@
+"""Repair removes teacher, room and unavailability violations by moving courses within their domains."""
+
+import numpy as np
+
+from basic_algorithm_implementations import FitnessEvaluator, RepairOperator
+
+from conftest import random_assignments
+
+HARD = ('teacher_overlap', 'room_overlap', 'teacher_unavailability')
+
+
+def hard_violations(evaluator, population) -> np.ndarray:
+    penalties = evaluator.penalties(population)
+    return sum(penalties[name] for name in HARD)
+
+
+def test_repair_clears_clashes_within_the_domains(model, rng):
+    evaluator = FitnessEvaluator(model)
+    population = random_assignments(model, rng, 30)
+    before = population.copy()
+    moved = RepairOperator(model, evaluator).repair_population(population)
+
+    changed = (population != before).any(axis=2)
+    assert moved == changed.sum() > 0
+    assert (hard_violations(evaluator, before) > 0).all()
+    assert (hard_violations(evaluator, population) == 0).all()
+    for individual, course_idx in zip(*np.nonzero(changed)):
+        assert tuple(population[individual, course_idx]) in set(map(tuple, model.domains.candidates[course_idx].tolist()))
+
+
+def test_conflict_free_timetables_are_left_alone(model, rng):
+    repairer = RepairOperator(model)
+    population = random_assignments(model, rng, 10)
+    repairer.repair_population(population)
+    repaired = population.copy()
+    assert repairer.repair_population(population) == 0
+    np.testing.assert_array_equal(population, repaired)
+
+
+def test_repair_keeps_courses_that_are_free(model, rng):
+    evaluator = FitnessEvaluator(model)
+    repairer = RepairOperator(model, evaluator)
+    for assignment in random_assignments(model, rng, 10):
+        untouched = ~evaluator.conflicted_courses(assignment[None], students=False)[0]
+        before = assignment.copy()
+        repairer.repair(assignment)
+        np.testing.assert_array_equal(assignment[untouched], before[untouched])
@@ -0,0 +1,20 @@
+"""Tournament contestant draws."""
+
+import numpy as np
+import pytest
+
+from basic_algorithm_implementations.selection import draw_contestants, select_parents
+
+
+@pytest.mark.parametrize('n, size', [(100, 3), (10, 7), (5, 5), (4, 9)])
+def test_contestants_are_distinct(rng, n, size):
+    contestants = draw_contestants(rng, n, 500, size)
+    assert contestants.shape == (500, min(size, n))
+    assert ((contestants >= 0) & (contestants < n)).all()
+    assert all(len(set(row)) == len(row) for row in contestants.tolist())
+
+
+def test_full_tournament_always_picks_the_best(rng):
+    fitness = np.array([-30, -10, -50, -20])
+    parents = select_parents(fitness, 50, rng, method='tournament', tournament_size=4)
+    assert (parents == 1).all()
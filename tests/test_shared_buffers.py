@@ -0,0 +1,54 @@
+"""Shared population buffers: worker views see the parent's rows, and segments are freed on close."""
+
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from basic_algorithm_implementations import ParallelEvaluator
+from basic_algorithm_implementations.shared_buffers import SharedPopulationBuffer, attach, _attached
+
+from conftest import random_assignments
+
+
+def test_attached_views_share_the_parent_arrays(model, rng):
+    buffer = SharedPopulationBuffer(10, model.n_courses)
+    population = random_assignments(model, rng, 10)
+    buffer.population[:] = population
+    rows, fitness = attach(buffer.names, model.n_courses, 6)
+    np.testing.assert_array_equal(rows, population[:6])
+
+    fitness[2:6] = [1, 2, 3, 4]
+    assert buffer.fitness[2:6].tolist() == [1, 2, 3, 4]
+
+    # Drop the views before closing this process's attachments
+    del rows, fitness
+    for name in buffer.names:
+        _attached.pop(name).close()
+    buffer.close()
+
+
+def test_close_unlinks_the_segments(model):
+    buffer = SharedPopulationBuffer(4, model.n_courses)
+    names = buffer.names
+    buffer.close()
+    assert buffer.population is None and buffer.fitness is None
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
+
+
+def test_evaluator_grows_and_frees_its_buffer(model, rng):
+    with ParallelEvaluator(model, workers=2, chunk_size=8) as evaluator:
+        evaluator.evaluate(random_assignments(model, rng, 20))
+        small = evaluator._buffer.names
+        evaluator.evaluate(random_assignments(model, rng, 12))
+        assert evaluator._buffer.names == small and evaluator._buffer.capacity == 20
+
+        evaluator.evaluate(random_assignments(model, rng, 30))
+        assert evaluator._buffer.capacity == 30
+        names = evaluator._buffer.names
+    assert evaluator._buffer is None
+    for name in small + names:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
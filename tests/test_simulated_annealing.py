@@ -0,0 +1,60 @@
+"""Annealing in place: every step leaves the state, its cost and the best solution consistent."""
+
+import numpy as np
+import pytest
+
+from basic_algorithm_implementations import SimulatedAnnealing
+from basic_algorithm_implementations.incremental_cost import Move
+
+from conftest import random_assignments
+
+SA_PARAMS = {'initial_temperature': 1000, 'final_temperature': 1, 'cooling_rate': 0.99,
+             'max_iterations': 100, 'seed': 5}
+
+
+@pytest.mark.parametrize('temperature', [1e6, 50.0, 1e-6])
+def test_steps_keep_cost_and_best_in_step(data, model, temperature):
+    sa = SimulatedAnnealing(data, SA_PARAMS, model=model)
+    for _ in range(200):
+        sa._step(temperature)
+        assert sa.current_cost == sa.state.cost == sa._assignment_cost(sa.state.assignment)
+        assert sa.best_cost == sa._assignment_cost(sa._best_assignment) <= sa.current_cost
+
+
+def test_rejected_moves_are_undone(data, model):
+    sa = SimulatedAnnealing(data, SA_PARAMS, model=model)
+    before = sa.state.assignment.copy()
+    cost = sa.current_cost
+    # Near zero temperature a move that raises the cost is always undone
+    for _ in range(200):
+        sa._step(1e-9)
+        changed = (sa.state.assignment != before).any(axis=1)
+        assert changed.sum() <= 1
+        if changed.any():
+            assert sa.current_cost <= cost
+        else:
+            assert sa.current_cost == cost
+        before, cost = sa.state.assignment.copy(), sa.current_cost
+
+
+def test_undo_restores_the_state(data, model, rng):
+    sa = SimulatedAnnealing(data, SA_PARAMS, model=model)
+    state = sa.state
+    state.rebind(random_assignments(model, rng, 1, unassigned=0.0)[0])
+    for _ in range(100):
+        before, cost = state.assignment.copy(), state.cost
+        move = Move(int(rng.integers(model.n_courses)), int(rng.integers(model.n_teachers)),
+                    int(rng.integers(model.n_rooms)), int(rng.integers(model.n_slots)))
+        state.apply(move)
+        assert move.previous == tuple(before[move.course_idx].tolist())
+        state.undo(move)
+        np.testing.assert_array_equal(state.assignment, before)
+        assert state.cost == cost
+
+
+def test_run_returns_the_best_state(data, model):
+    sa = SimulatedAnnealing(data, SA_PARAMS, model=model)
+    start = sa.current_cost
+    best = sa.run()
+    assert sa.best_cost <= start
+    assert sa._assignment_cost(model.encode(best)) == sa.best_cost
@@ -0,0 +1,50 @@
+"""Each way a GA run can stop, and where the reason is reported."""
+
+import pytest
+
+from basic_algorithm_implementations import GeneticAlgorithm, TerminationCriteria
+
+PARAMS = {'population_size': 10, 'generations': 6, 'mutation_rate': 0.2, 'crossover_rate': 0.8,
+          'selection_method': 'tournament', 'tournament_size': 3, 'elitism_count': 2, 'seed': 1}
+
+
+def test_generation_limit():
+    criteria = TerminationCriteria({'generations': 3, 'target_fitness': None})
+    assert [criteria.update(g, -100) for g in (1, 2, 3)] == [None, None, 'generations']
+
+
+def test_target_fitness():
+    criteria = TerminationCriteria({'generations': 10, 'target_fitness': -50})
+    assert criteria.update(1, -80) is None
+    assert criteria.update(2, -50) == 'target_fitness'
+
+
+def test_time_budget():
+    criteria = TerminationCriteria({'generations': 10, 'time_budget': 0})
+    assert criteria.update(1, -100) == 'time_budget'
+
+
+def test_stall_counts_generations_since_the_last_improvement():
+    criteria = TerminationCriteria({'generations': 100, 'max_stall_generations': 3})
+    assert criteria.update(1, -100) is None
+    assert criteria.update(2, -100) is None
+    assert criteria.update(3, -90) is None
+    assert criteria.update(5, -90) is None
+    assert criteria.update(6, -90) == 'stalled'
+    assert criteria.summary()['generations'] == 6
+
+
+@pytest.mark.parametrize('representation', ['dict', 'array'])
+@pytest.mark.parametrize('params, reason', [
+    ({}, 'generations'),
+    ({'target_fitness': -10 ** 9}, 'target_fitness'),
+    ({'time_budget': 0}, 'time_budget'),
+])
+def test_run_records_the_reason(data, model, representation, params, reason):
+    ga = GeneticAlgorithm(data, dict(PARAMS, representation=representation, **params), model=model)
+    solution = ga.run()
+    assert isinstance(solution, dict)
+    assert ga.termination_reason == reason
+    assert ga.run_stats['reason'] == reason
+    assert ga.run_stats['best_fitness'] == ga.best_fitness
+    assert ga.run_stats['generations'] == (6 if reason == 'generations' else 1)
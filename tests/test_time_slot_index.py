@@ -0,0 +1,43 @@
+"""Slot overlap, adjacency and ordering, and clash counting, against pairwise checks of the slots."""
+
+from itertools import combinations
+
+import numpy as np
+
+from basic_algorithm_implementations import TimeSlotIndex
+
+
+def test_overlap_and_adjacency_match_the_slot_times(data, model):
+    index = model.timeslot_index
+    slots = [data['time_slots'][slot_id] for slot_id in index.slot_ids]
+    for s, a in enumerate(slots):
+        for t, b in enumerate(slots):
+            assert index.overlaps[s, t] == (s == t or a.overlaps_with(b)), (a, b)
+            touching = a.end_time == b.start_time or b.end_time == a.start_time
+            assert index.adjacent[s, t] == (a.day == b.day and touching), (a, b)
+
+    # The instance's lab slot overlaps the 09:00 and 10:00 slots of each day
+    assert len(index.overlap_pairs) == 2 * len(index.days)
+
+
+def test_days_and_ranks_follow_the_week_and_start_times(data):
+    shuffled = dict(sorted(data['time_slots'].items(), reverse=True))
+    index = TimeSlotIndex(shuffled)
+    assert index.days == ['Monday', 'Tuesday', 'Wednesday']
+    for day, order in enumerate(index.day_order):
+        assert (index.day[order] == day).all()
+        assert np.all(np.diff(index.start[order]) >= 0)
+        assert index.rank[order].tolist() == list(range(len(order)))
+
+
+def test_count_clashes_matches_pairwise_count(model, rng):
+    index = model.timeslot_index
+    for _ in range(20):
+        resources = rng.integers(0, 4, 30)
+        slots = rng.integers(0, model.n_slots, 30)
+        bookings = list(zip(resources.tolist(), slots.tolist()))
+        # Every extra booking of a (resource, slot), plus each pair in distinct overlapping slots
+        expected = len(bookings) - len(set(bookings))
+        expected += sum(1 for (r1, s1), (r2, s2) in combinations(bookings, 2)
+                        if r1 == r2 and s1 != s2 and index.overlaps[s1, s2])
+        assert index.count_clashes(resources, slots, 4) == expected